@@ -1,10 +1,37 @@
-from flask import Flask, render_template, request, jsonify, session
-import requests
-from bs4 import BeautifulSoup
-from googlesearch import search
+from flask import Flask, render_template, request, jsonify, session, Response, stream_with_context
+import click
 import json
 import os
+import re
+import time
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from chatbot.fuzzy_index import QuestionIndex
+from chatbot.journal import KnowledgeJournal
+from chatbot.parallel_fetch import fetch_first
+from chatbot import http_client
+from chatbot.extractor import BanglaTextParser, extract_bangla_sentences
+from chatbot.result_cache import SearchCache, MISSING
+from chatbot.fuzzy_index import normalize_question
+from chatbot.single_flight import SingleFlight, FileSingleFlight
+from chatbot.learning_queue import LearningQueue
+from chatbot.stats import LearningStats
+from chatbot import metrics
+from chatbot.safety import SafetyChecker
+from chatbot.bulk import iter_records, batched
+from chatbot.export import iter_json_items, ndjson, coalesce, gzip_chunks
+from chatbot.quota import SearchQuota
+from chatbot.snapshot import SnapshotDict
+from chatbot.mmap_index import IndexedJournal
+from chatbot.frequency import QueryStats
+from chatbot.prewarm import Prewarmer
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'bangla-chatbot-secret-2024')
@@ -12,45 +39,336 @@ app.secret_key = os.environ.get('SECRET_KEY', 'bangla-chatbot-secret-2024')
 class BengaliChatbot:
     def __init__(self):
         self.knowledge_file = 'knowledge.json'
+        
+        # অন্য ওয়ার্কারের শেখা সর্বোচ্চ কত সেকেন্ড পরে দেখা যাবে
+        self.refresh_interval = float(os.environ.get('KNOWLEDGE_REFRESH_INTERVAL', 1.0))
+        self._next_refresh = 0
+        
+        # 'journal' = স্ন্যাপশট + জার্নাল, 'mmap' = জার্নাল + mmap ইনডেক্স
+        # (স্ন্যাপশট মেমরিতে নয়), 'json' = প্রতিবার পুরো ফাইল লেখা
+        self.journal = None
+        mode = os.environ.get('KNOWLEDGE_STORAGE', 'journal')
+        if mode in ('journal', 'mmap'):
+            journal_class = IndexedJournal if mode == 'mmap' else KnowledgeJournal
+            self.journal = journal_class(
+                self.knowledge_file,
+                compact_every=int(os.environ.get('JOURNAL_COMPACT_EVERY', 1000)),
+                refresh_interval=self.refresh_interval
+            )
+        # 'json' মোডে একাধিক থ্রেড থেকে লেখা/সেভ একজন করে, আর পড়া-মেলানো-লেখা
+        # একাধিক ওয়ার্কারের মধ্যেও একজন করে (knowledge.json.lock)
+        self._write_lock = threading.RLock()
+        self.lock_file = self.knowledge_file + '.lock'
         self.knowledge = self.load_knowledge()
+        self._knowledge_mtime = self.knowledge_mtime()
+        
+        # ফাজি প্রশ্ন ইনডেক্স
+        # FUZZY_INDEX=lazy (প্রথম ফাজি খোঁজায় ব্যাকগ্রাউন্ডে তৈরি, preload-এ
+        # মাস্টারে) | eager | false; 'mmap' মোডে ডিফল্ট বন্ধ, কারণ ইনডেক্স প্রতি
+        # ওয়ার্কারের নিজের মেমরিতে থাকে
+        fuzzy = os.environ.get('FUZZY_INDEX', 'false' if mode == 'mmap' else 'lazy')
+        self.index = QuestionIndex(
+            threshold=float(os.environ.get('FUZZY_THRESHOLD', 0.8)),
+            enabled=fuzzy != 'false',
+            lazy=fuzzy == 'lazy'
+        )
+        self.index.build(self.knowledge)
+        
+        # ওয়েব খোঁজার ক্যাশ (URL, পেজ, ব্যর্থ প্রশ্ন)
+        self.cache = SearchCache()
+        
+        # দৈনিক শেখার হিসাব
+        self.stats = LearningStats('learning_stats.json')
+        self.stats.load()
+        
+        # ডিস্কে লেখা ব্যাকগ্রাউন্ডে
+        self.learner = LearningQueue()
+        
+        # একসাথে শেখানোর সময় কন্টেন্ট চেক
+        self.safety = SafetyChecker()
+        
+        # গুগল সার্চের বাজেট (ইউজার/গ্লোবাল হার, দৈনিক সীমা)
+        self.quota = SearchQuota()
+        
+        # কোন প্রশ্ন কতবার আসে (hit/miss আলাদা), ফাঁকা সময়ে শীর্ষ miss আগেই শেখা
+        self.queries = QueryStats()
+        self.queries.load()
+        self.prewarmer = Prewarmer(
+            self.queries,
+            resolve=self.prewarm,
+            is_known=self._prewarm_known,
+            allowed=self._prewarm_allowed,
+            refresh=lambda: self.sync_knowledge(force=True)
+        )
+        
+        # একই প্রশ্ন একসাথে এলে একবারই খোঁজা ('file' = সব ওয়ার্কার মিলে);
+        # কোটায় আটকানো উত্তর অন্য কলারকে দেওয়া বা ফাইলে রাখা হয় না
+        shareable = lambda result: not result.get('limited')
+        if os.environ.get('SINGLE_FLIGHT', 'thread') == 'file':
+            self.inflight = FileSingleFlight(os.environ.get('SINGLE_FLIGHT_DIR'), shareable=shareable)
+        else:
+            self.inflight = SingleFlight(shareable=shareable)
         
     def load_knowledge(self):
         """জ্ঞান লোড"""
+        if self.journal:
+            return self.journal.load({})
+        # থ্রেডগুলো লক ছাড়া পড়ে, লেখা নতুন স্ন্যাপশট বানায়
+        return SnapshotDict(self._read_knowledge_file())
+    
+    def _read_knowledge_file(self):
         try:
             if os.path.exists(self.knowledge_file):
                 with open(self.knowledge_file, 'r', encoding='utf-8') as f:
                     return json.load(f)
-        except:
-            pass
+        except Exception as e:
+            print(f"Knowledge load error: {e}")
         return {}
     
+    def knowledge_exists(self):
+        """সক্রিয় স্টোরেজে জ্ঞান সেভ হয়েছে কিনা (জার্নাল/mmap মোডে স্ন্যাপশট বা জার্নাল)"""
+        if not self.journal:
+            return os.path.exists(self.knowledge_file)
+        if os.path.exists(self.journal.snapshot_file):
+            return True
+        # জার্নাল লোডের সময়ই শুধু হেডার লাইন নিয়ে তৈরি হয়, তাই রেকর্ড আছে কিনা
+        try:
+            with open(self.journal.journal_file, 'rb') as f:
+                f.readline()
+                return bool(f.read(1))
+        except OSError:
+            return False
+    
+    def knowledge_mtime(self):
+        """ফাইলের সংস্করণ (প্রতিটি সেভ rename করে, তাই inode-ও বদলায়)"""
+        try:
+            stat = os.stat(self.knowledge_file)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+    
+    @contextmanager
+    def _file_lock(self):
+        """'json' মোড: সব ওয়ার্কারের মধ্যে একজন করে knowledge.json মেলানো ও লেখা"""
+        with self._write_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_file, 'a') as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    
+    def sync_knowledge(self, force=False):
+        """অন্য ওয়ার্কারের শেখা জ্ঞান আনা (জার্নালের শুধু নতুন অংশ পড়ে)"""
+        if self.journal:
+            changed = self.journal.refresh() if force else self.journal.maybe_refresh()
+        else:
+            changed = self._reload_if_modified(force)
+        
+        for key in changed:
+            if key in self.knowledge:
+                self.index.add(key)
+            else:
+                self.index.remove(key)
+        return len(changed)
+    
+    def _reload_if_modified(self, force=False):
+        """'json' মোড: ফাইল বদলালে তবেই পুরোটা আবার পড়া"""
+        now = time.monotonic()
+        if not force and now < self._next_refresh:
+            return []
+        self._next_refresh = now + self.refresh_interval
+        
+        mtime = self.knowledge_mtime()
+        if mtime is None or mtime == self._knowledge_mtime:
+            return []
+        self._knowledge_mtime = mtime
+        
+        fresh = self._read_knowledge_file()
+        current = self.knowledge.view()
+        changed = [k for k in current if k not in fresh]
+        changed += [k for k, v in fresh.items() if current.get(k) != v]
+        # এক অ্যাসাইনমেন্টে বদল, পাঠক মাঝের খালি ডিক্ট দেখে না
+        self.knowledge.replace(fresh)
+        return changed
+    
     def save_knowledge(self):
         """জ্ঞান সেভ"""
+        if self.journal:
+            self.journal.compact()
+            return
         try:
-            with open(self.knowledge_file, 'w', encoding='utf-8') as f:
-                json.dump(self.knowledge, f, ensure_ascii=False, indent=2)
-        except:
-            pass
+            with self._write_lock:
+                # temp + rename, যাতে এক্সপোর্ট বা অন্য ওয়ার্কার অর্ধেক লেখা ফাইল না পড়ে;
+                # স্ন্যাপশট বদলায় না, তাই লেখার সময় অন্য থ্রেড শিখলেও ফাইল ভাঙে না
+                tmp = f"{self.knowledge_file}.{os.getpid()}.tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(self.knowledge.snapshot(), f, ensure_ascii=False, indent=2)
+                os.replace(tmp, self.knowledge_file)
+        except Exception as e:
+            print(f"Knowledge save error: {e}")
+    
+    def iter_export(self):
+        """এই মুহূর্তের সব প্রশ্ন-উত্তর, ডিস্কের স্ন্যাপশট থেকে স্ট্রিম
+
+        এই অ্যাপ প্রশ্ন প্রতি শেখার লগ রাখে না (শুধু দৈনিক হিসাব), তাই
+        রেকর্ডে 'learned' (উৎস, ইউজার, সময়) থাকে না; সেটা MemoryManager এর
+        এক্সপোর্টে (JSON বা SQLite স্টোরেজ) পাওয়া যায়।
+        """
+        if self.journal:
+            items = self.journal.iter_items()
+        elif os.path.exists(self.knowledge_file):
+            # খোলা ফাইল পরের সেভে বদলায় না (rename নতুন ফাইল বানায়)
+            items = self._iter_file(self.knowledge_file)
+        else:
+            items = iter(())
+        for question, answer in items:
+            yield {'question': question, 'answer': answer}
+    
+    def _iter_file(self, path):
+        with open(path, 'rb') as f:
+            yield from iter_json_items(f)
     
-    def get_response(self, question):
-        """উত্তর দাও"""
+    def remember(self, question_key, answer, source='manual'):
+        """একটি উত্তর সাথে সাথে মনে রাখা, সেভ ব্যাকগ্রাউন্ডে"""
+        self.knowledge[question_key] = answer
+        self.index.add(question_key)
+        self.learner.submit(self.persist, question_key, answer)
+        self.stats.record({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'learned',
+            'source': source
+        })
+    
+    def persist(self, question_key, answer):
+        """একটি উত্তর ডিস্কে সেভ"""
+        with metrics.timer(metrics.STAGE_SECONDS, stage='persist'):
+            self._persist(question_key, answer)
+    
+    def _persist(self, question_key, answer):
+        if self.journal:
+            self.journal.set(question_key, answer)
+        else:
+            # অন্য ওয়ার্কারের লেখা মুছে না ফেলতে লক ধরে আগে ফাইলটা মিলিয়ে নেওয়া
+            with self._file_lock():
+                self.sync_knowledge(force=True)
+                self.knowledge[question_key] = answer
+                self.index.add(question_key)
+                self.save_knowledge()
+                self._knowledge_mtime = self.knowledge_mtime()
+    
+    def get_response(self, question, progress=None, user_id=None):
+        """উত্তর দাও (progress(stage, **data) দিলে ধাপগুলো জানানো হয়)"""
+        started = time.perf_counter()
+        self.prewarmer.ensure_started()
+        result = self._answer(question, progress, user_id)
+        source = 'negative_cache' if result.get('cached') else result.get('source')
+        metrics.RESPONSE_SECONDS.observe(time.perf_counter() - started, source=source)
+        
         question_lower = question.lower().strip()
+        self.queries.record(
+            normalize_question(question_lower),
+            question_lower,
+            hit=result.get('source') == 'memory'
+        )
+        return result
+    
+    def prewarm(self, question):
+        """প্রিওয়ার্ম: ইউজার ছাড়া খোঁজা (গ্লোবাল কোটা মেনে, একই প্রশ্ন একবারই)"""
+        question_lower = question.lower().strip()
+        result, _ = self.inflight.do(
+            normalize_question(question_lower),
+            self.search_and_learn,
+            question,
+            question_lower
+        )
+        return result
+    
+    def _prewarm_known(self, question):
+        """মেমরিতে আছে, বা সম্প্রতি খুঁজে পাওয়া যায়নি"""
+        question_lower = question.lower().strip()
+        return question_lower in self.knowledge or self.cache.is_negative(question_lower)
+    
+    def _prewarm_allowed(self):
+        """দৈনিক বাজেটের PREWARM_QUOTA_SHARE অংশ পর্যন্তই প্রিওয়ার্ম ব্যবহার করে"""
+        status = self.quota.status()
+        if not status['enabled']:
+            return False
+        if not status['limit']:
+            return True
+        share = float(os.environ.get('PREWARM_QUOTA_SHARE', 0.5))
+        return status['used'] < status['limit'] * share
+    
+    def _answer(self, question, progress=None, user_id=None):
+        question_lower = question.lower().strip()
+        with metrics.timer(metrics.STAGE_SECONDS, stage='sync'):
+            self.sync_knowledge()
+        
+        # ১. নিজের জ্ঞানে আছে কিনা চেক (একটাই লুকআপ, মাঝে অন্য থ্রেড মুছলেও KeyError নয়)
+        answer = self.knowledge.get(question_lower)
+        if answer is not None:
+            return {
+                'answer': answer,
+                'source': 'memory',
+                'learned': False
+            }
         
-        # ১. নিজের জ্ঞানে আছে কিনা চেক
-        if question_lower in self.knowledge:
+        # ২. কাছাকাছি প্রশ্ন (বানানভেদ, বিরামচিহ্ন)
+        with metrics.timer(metrics.STAGE_SECONDS, stage='fuzzy'):
+            match = self.index.lookup(question_lower)
+        answer = self.knowledge.get(match[0]) if match else None
+        if answer is not None:
+            matched_key, score = match
             return {
-                'answer': self.knowledge[question_lower],
+                'answer': answer,
                 'source': 'memory',
+                'matched': matched_key,
+                'score': round(score, 3),
                 'learned': False
             }
         
-        # ২. না থাকলে গুগল সার্চ
-        google_result = self.google_search(question)
+        # ৩. একটু আগেই খুঁজে পাওয়া যায়নি এমন প্রশ্ন
+        if self.cache.is_negative(question_lower):
+            return {
+                'answer': 'দুঃখিত, এই প্রশ্নের উত্তর আমি খুঁজে পাইনি।',
+                'source': 'none',
+                'cached': True,
+                'learned': False
+            }
+        
+        # ৪. না থাকলে গুগল সার্চ (একই প্রশ্নের বাকি রিকোয়েস্ট অপেক্ষা করবে);
+        # ইউজারের নিজের বাজেট আগেই দেখা, যাতে সীমিত ইউজার অন্যের খোঁজার ফল না পায়
+        limited = self.quota.check(user_id)
+        if limited:
+            return self._limited(limited, user_id)
+        if progress:
+            progress('searching')
+        result, shared = self.inflight.do(
+            normalize_question(question_lower),
+            self.search_and_learn,
+            question,
+            question_lower,
+            progress,
+            user_id
+        )
+        if shared:
+            return dict(result, shared=True)
+        return result
+    
+    def search_and_learn(self, question, question_lower, progress=None, user_id=None):
+        """গুগল থেকে খুঁজে শেখা"""
+        google_result = self.google_search(question, progress=progress, user_id=user_id)
+        
+        # বাজেট না থাকলে অপেক্ষা না করে শুধু মেমরির উত্তর (নেগেটিভ ক্যাশে নয়)
+        if google_result.get('limited'):
+            return self._limited(google_result['limited'], user_id)
         
         if google_result['found']:
-            # ৩. শিখে নাও (মেমরিতে সেভ)
-            self.knowledge[question_lower] = google_result['answer']
-            self.save_knowledge()
+            # শিখে নাও (মেমরিতে সেভ)
+            self.remember(question_lower, google_result['answer'], source='google')
             
             return {
                 'answer': google_result['answer'],
@@ -59,34 +377,82 @@ class BengaliChatbot:
                 'learned': True
             }
         
-        # ৪. কিছু না পেলে
+        # কিছু না পেলে (কিছুক্ষণ মনে রাখা)
+        self.cache.set_negative(question_lower)
         return {
             'answer': 'দুঃখিত, এই প্রশ্নের উত্তর আমি খুঁজে পাইনি।',
             'source': 'none',
             'learned': False
         }
     
-    def google_search(self, query):
-        """গুগল থেকে তথ্য খোঁজা"""
+    def _limited(self, limited, user_id=None):
+        """কোটায় আটকানো খোঁজার উত্তর"""
+        metrics.SEARCH_LIMITED.inc(reason=limited)
+        result = {
+            'answer': 'দুঃখিত, এই প্রশ্নের উত্তর আমার জানা নেই, আর এখন ওয়েবে খোঁজা যাচ্ছে না। একটু পরে চেষ্টা করুন বা আমাকে শিখিয়ে দিন।',
+            'source': 'none',
+            'limited': limited,
+            'learned': False
+        }
+        # সার্চ বন্ধ থাকলে আবার চেষ্টার সময় দেওয়া হয় না
+        retry_after = self.quota.retry_after(limited, user_id)
+        if retry_after is not None:
+            result['retry_after'] = round(retry_after, 1)
+        return result
+    
+    def google_search(self, query, deadline=None, progress=None, user_id=None):
+        """গুগল থেকে তথ্য খোঁজা
+
+        কোটা শুধু আসল গুগল সার্চে খরচ হয়; ক্যাশে URL থাকলে নয়। বাজেট না
+        থাকলে {'found': False, 'limited': কারণ}।
+        """
         try:
+            # পুরো প্রশ্নের জন্য একটাই সময়সীমা
+            if deadline is None:
+                deadline = float(os.environ.get('SEARCH_DEADLINE', 8))
+            started = time.monotonic()
+            
             # বাংলা কোয়েরি
             search_query = f"{query} বাংলায়"
             
             # প্রথম ৩টি রেজাল্ট নাও
-            urls = list(search(search_query, num_results=3, lang='bn'))
+            urls = self.cache.get_urls(search_query)
+            if urls is None:
+                limited = self.quota.acquire(user_id)
+                if limited:
+                    return {'found': False, 'limited': limited}
+                try:
+                    # googlesearch প্রথম খোঁজার সময় লোড হয়, স্টার্টআপে নয়
+                    from googlesearch import search
+                    with metrics.timer(metrics.STAGE_SECONDS, stage='search'):
+                        urls = list(search(search_query, num_results=3, lang='bn'))
+                finally:
+                    self.quota.release()
+                self.cache.set_urls(search_query, urls)
             
             if not urls:
                 return {'found': False}
             
-            # প্রথম ওয়েবসাইট থেকে কন্টেন্ট নাও
-            for url in urls:
-                content = self.scrape_website(url)
-                if content and len(content) > 20:  # কিছু কন্টেন্ট থাকলে
-                    return {
-                        'found': True,
-                        'answer': content[:400] + "..." if len(content) > 400 else content,
-                        'url': url
-                    }
+            def fetch(url, timeout):
+                if progress:
+                    progress('fetching', url=url, n=urls.index(url) + 1, total=len(urls))
+                return self.fetch_extract(url, timeout)
+            
+            # সব ওয়েবসাইট একসাথে, প্রথম বাংলা কন্টেন্টই জিতবে
+            url, content = fetch_first(
+                urls,
+                fetch,
+                accept=lambda c: bool(c) and len(c) > 20 and bool(re.search(r'[\u0980-\u09FF]', c)),
+                deadline=deadline - (time.monotonic() - started),
+                fallback=lambda c: bool(c) and len(c) > 20
+            )
+            
+            if content:
+                return {
+                    'found': True,
+                    'answer': content[:400] + "..." if len(content) > 400 else content,
+                    'url': url
+                }
             
             return {'found': False}
             
@@ -94,45 +460,101 @@ class BengaliChatbot:
             print(f"Google search error: {e}")
             return {'found': False}
     
-    def scrape_website(self, url):
-        """ওয়েবসাইট থেকে টেক্সট নেওয়া"""
+    def fetch_extract(self, url, timeout=10):
+        """ক্যাশ থেকে, না থাকলে ওয়েবসাইট থেকে টেক্সট"""
+        content = self.cache.get_page(url)
+        if content is MISSING:
+            content = self.scrape_website(url, timeout)
+            self.cache.set_page(url, content)
+        return content
+    
+    def scrape_website(self, url, timeout=10):
+        """ওয়েবসাইট থেকে টেক্সট নেওয়া (৫টি বাংলা বাক্য পেলেই থামে)"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (BanglaChatBot/1.0; +https://github.com)'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # সব টেক্সট নাও
-            text = soup.get_text()
-            
-            # বাংলা টেক্সট ফিল্টার
-            import re
-            sentences = text.split('.')
-            bangla_sentences = []
-            
-            for sentence in sentences:
-                # বাংলা ইউনিকোড চেক
-                if re.search(r'[\u0980-\u09FF]', sentence):
-                    clean = ' '.join(sentence.strip().split())
-                    if len(clean) > 10:
-                        bangla_sentences.append(clean)
+            parser = BanglaTextParser(max_sentences=5, min_length=10)
+            with http_client.stream(url, timeout=timeout) as (response, chunks):
+                bangla_sentences = extract_bangla_sentences(
+                    chunks,
+                    encoding=http_client.response_encoding(response.headers),
+                    parser=parser
+                )
             
             if bangla_sentences:
-                return '. '.join(bangla_sentences[:5]) + '.'
+                return ' '.join(bangla_sentences)
             
             # বাংলা না থাকলে ইংরেজি
-            return text[:300] + "..."
+            return parser.head[:300] + "..."
             
         except:
             return None
     
     def manual_learn(self, question, answer):
         """ম্যানুয়ালি শেখানো"""
-        self.knowledge[question.lower().strip()] = answer
-        self.save_knowledge()
+        self.remember(question.lower().strip(), answer)
         return True
+    
+    def learn_bulk(self, records, batch_size=None):
+        """(লাইন, রেকর্ড, ত্রুটি) থেকে ব্যাচে শেখা, প্রতিটির ফলাফল yield করে
+        
+        প্রতি ব্যাচে একবারই ডিস্কে লেখা হয়, আর মেমরিতে একটার বেশি ব্যাচ থাকে না।
+        """
+        for batch in batched(records, batch_size):
+            accepted = []
+            results = []
+            for number, record, error in batch:
+                if error is None:
+                    question, answer, error, warning = self._check_record(record)
+                if error:
+                    results.append({'line': number, 'status': 'rejected', 'reason': error})
+                    continue
+                
+                accepted.append((question, answer))
+                result = {'line': number, 'status': 'accepted', 'question': question}
+                if warning:
+                    result['warning'] = warning
+                results.append(result)
+            
+            if accepted:
+                self.persist_many(accepted)
+            yield from results
+    
+    def _check_record(self, record):
+        """(প্রশ্ন, পরিষ্কার উত্তর, ত্রুটি, সতর্কতা)"""
+        question = record.get('question')
+        answer = record.get('answer')
+        if not isinstance(question, str) or not isinstance(answer, str):
+            return None, None, 'question ও answer টেক্সট হতে হবে', None
+        
+        # বড় উত্তর আগে কেটে নেওয়া, যাতে নিষিদ্ধ শব্দ চেক বাদ না পড়ে
+        question = question.lower().strip()
+        answer = answer.strip()[:self.safety.max_answer_length]
+        check = self.safety.check_content(question, answer)
+        if not check['safe']:
+            return None, None, check['reason'], None
+        
+        answer = self.safety.sanitize_text(answer)
+        if not answer:
+            return None, None, 'পরিষ্কার করার পর উত্তর খালি', None
+        return question, answer, None, check['reason'] if check.get('warning') else None
+    
+    def persist_many(self, items, source='bulk'):
+        """অনেকগুলো উত্তর একসাথে মনে রাখা ও একবারে সেভ"""
+        with metrics.timer(metrics.STAGE_SECONDS, stage='persist'):
+            if self.journal:
+                self.journal.set_many(items)
+            else:
+                with self._file_lock():
+                    self.sync_knowledge(force=True)
+                    self.knowledge.update(items)
+                    self.save_knowledge()
+                    self._knowledge_mtime = self.knowledge_mtime()
+        
+        for question_key, _ in items:
+            self.index.add(question_key)
+        
+        now = datetime.now().isoformat()
+        for _ in items:
+            self.stats.record({'timestamp': now, 'action': 'learned', 'source': source})
 
 # চ্যাটবট তৈরি
 chatbot = BengaliChatbot()
@@ -155,13 +577,58 @@ def chat():
             return jsonify({'error': 'খালি মেসেজ'}), 400
         
         # চ্যাটবট থেকে উত্তর নাও
-        response = chatbot.get_response(user_message)
+        user_id = session.get('user_id') or request.remote_addr
+        response = chatbot.get_response(user_message, user_id=user_id)
         
-        return jsonify(response)
+        headers = chatbot.quota.headers(user_id)
+        if response.get('retry_after') is not None:
+            headers['Retry-After'] = str(max(1, int(response['retry_after'] + 0.999)))
+        return jsonify(response), 200, headers
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/chat/stream', methods=['GET', 'POST'])
+def chat_stream():
+    """Server-Sent Events: মেমরির উত্তর সাথে সাথে, না হলে ধাপে ধাপে অগ্রগতি"""
+    if request.method == 'POST':
+        user_message = (request.get_json(silent=True) or {}).get('message', '')
+    else:
+        user_message = request.args.get('message', '')
+    user_message = user_message.strip()
+    
+    if not user_message:
+        return jsonify({'error': 'খালি মেসেজ'}), 400
+    
+    events = queue.Queue()
+    user_id = session.get('user_id') or request.remote_addr
+    
+    def progress(stage, **data):
+        events.put(('progress', dict(data, stage=stage)))
+    
+    def run():
+        try:
+            events.put(('answer', chatbot.get_response(user_message, progress, user_id)))
+        except Exception as e:
+            events.put(('error', {'error': str(e)}))
+    
+    threading.Thread(target=run, daemon=True).start()
+    
+    def generate():
+        # হেডার সাথে সাথে পাঠাতে একটি কমেন্ট
+        yield ': connected\n\n'
+        while True:
+            event, data = events.get()
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+            if event != 'progress':
+                break
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/learn', methods=['POST'])
 def learn():
     try:
@@ -182,13 +649,81 @@ def learn():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/learn/bulk', methods=['POST'])
+def learn_bulk():
+    """JSONL বডি (প্রতি লাইনে {"question", "answer"}), প্রতিটির ফলাফল NDJSON হিসেবে স্ট্রিম"""
+    stream = request.stream
+    
+    def generate():
+        counts = {'accepted': 0, 'rejected': 0}
+        for result in chatbot.learn_bulk(iter_records(stream)):
+            counts[result['status']] += 1
+            yield json.dumps(result, ensure_ascii=False) + '\n'
+        yield json.dumps(dict(counts, done=True)) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.cli.command('learn-bulk')
+@click.argument('source', type=click.File('rb'), default='-')
+@click.option('--quiet', is_flag=True, help='শুধু বাতিল হওয়া লাইন দেখাবে')
+def learn_bulk_command(source, quiet):
+    """JSONL ফাইল থেকে একসাথে শেখানো: flask --app app learn-bulk data.jsonl"""
+    counts = {'accepted': 0, 'rejected': 0}
+    for result in chatbot.learn_bulk(iter_records(source)):
+        counts[result['status']] += 1
+        if not quiet or result['status'] == 'rejected':
+            click.echo(json.dumps(result, ensure_ascii=False))
+    chatbot.stats.save()
+    click.echo(json.dumps(dict(counts, done=True)))
+
+@app.route('/api/export', methods=['GET'])
+def export():
+    """সব জ্ঞান NDJSON হিসেবে স্ট্রিম (?format=gzip দিলে .ndjson.gz)
+
+    প্রতি লাইনে {"question", "answer"}; শেখার উৎস নেই (BengaliChatbot.iter_export দেখুন)।
+    """
+    chunks = coalesce(ndjson(chatbot.iter_export()))
+    if request.args.get('format') == 'gzip':
+        return Response(
+            stream_with_context(gzip_chunks(chunks)),
+            mimetype='application/gzip',
+            headers={'Content-Disposition': 'attachment; filename=knowledge.ndjson.gz'}
+        )
+    return Response(
+        stream_with_context(chunks),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': 'attachment; filename=knowledge.ndjson'}
+    )
+
+@app.cli.command('export')
+@click.argument('target', type=click.File('wb'), default='-')
+@click.option('--gzip', 'compress', is_flag=True, help='gzip করে লেখা')
+def export_command(target, compress):
+    """সব জ্ঞান NDJSON ফাইলে: flask --app app export knowledge.ndjson.gz --gzip"""
+    chunks = coalesce(ndjson(chatbot.iter_export()))
+    for chunk in gzip_chunks(chunks) if compress else chunks:
+        target.write(chunk)
+
 @app.route('/api/stats', methods=['GET'])
 def stats():
+    chatbot.sync_knowledge()
     return jsonify({
         'total_knowledge': len(chatbot.knowledge),
-        'knowledge_file': os.path.exists(chatbot.knowledge_file)
+        'knowledge_file': chatbot.knowledge_exists(),
+        'today_learned': chatbot.stats.today_learned(),
+        'daily': chatbot.stats.series(min(request.args.get('days', 7, type=int), 365)),
+        'cache': chatbot.cache.stats(),
+        'learning_queue': chatbot.learner.stats(),
+        'search_quota': chatbot.quota.status(),
+        'queries': chatbot.queries.summary(min(request.args.get('top', 10, type=int), 100)),
+        'prewarm': chatbot.prewarmer.stats_dict()
     })
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus টেক্সট ফরম্যাট (সব ওয়ার্কার মিলিয়ে)"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,8 @@
+"""অফলাইন লোড টেস্ট
+
+    python -m bench.load --workers 2 --concurrency 16 --duration 30
+
+bench.sites লোকাল ওয়েবসাইট চালায়, bench/stubs/googlesearch.py আসল গুগলের
+বদলে সেই সাইটের URL দেয়। তাই ইন্টারনেট ছাড়াই স্টোরেজ বা স্ক্র্যাপিং-এর
+পরিবর্তন আগে-পরে তুলনা করা যায় (--json দিয়ে ফলাফল সেভ করে)।
+"""
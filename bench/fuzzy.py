@@ -0,0 +1,126 @@
+"""ফাজি ইনডেক্সের মেমরি ও সময়ের বাজেট পরীক্ষা
+
+নতুন প্রসেসে QuestionIndex তৈরি করে tracemalloc দিয়ে প্রতি প্রশ্নে কত
+বাইট লাগে, তৈরিতে কত সময় লাগে, আর কাছাকাছি/না-থাকা/অর্ধেক প্রশ্নের
+lookup এর p99 মাপে। lazy মোডে প্রথম lookup এর আগে কিছুই তৈরি হয় না সেটাও
+দেখে। বাজেট পার হলে exit code 1:
+
+    python -m bench.fuzzy --entries 100000 --bytes-per-key 600 --lookup-ms 1
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, random, sys, time, tracemalloc
+from chatbot.fuzzy_index import QuestionIndex
+
+entries = %d
+random.seed(1)
+consonants = 'কখগঘচছজঝটঠডঢতথদধনপফবভমযরলশষসহ'
+vowels = ['', 'া', 'ি', 'ী', 'ু', 'ে', 'ো']
+words = [
+    ''.join(random.choice(consonants) + random.choice(vowels) for _ in range(random.randint(2, 4)))
+    for _ in range(3000)
+]
+# অর্ধেক একই টেমপ্লেটের (সাধারণ gram-এর বিশাল posting), অর্ধেক শব্দ দিয়ে
+keys = [f"পরীক্ষার প্রশ্ন নম্বর {i} এর উত্তর কী" for i in range(entries // 2)]
+seen = set(keys)
+while len(keys) < entries:
+    key = f"{random.choice(words)} {random.choice(words)} এর রাজধানী কি"
+    if key not in seen:
+        seen.add(key)
+        keys.append(key)
+
+def typo(key):
+    chars = list(key)
+    chars[random.randrange(len(chars))] = random.choice(consonants)
+    return ''.join(chars)
+
+tracemalloc.start()
+lazy = QuestionIndex(lazy=True)
+lazy.build(keys)
+lazy_bytes = tracemalloc.get_traced_memory()[0]
+del lazy
+
+started = time.perf_counter()
+index = QuestionIndex()
+index.build(keys)
+build = time.perf_counter() - started
+size = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+
+queries = {
+    'near': [typo(random.choice(keys)) for _ in range(200)],
+    'miss': [f"{random.choice(words)}{random.choice(words)} এর রাজধানী কি" for _ in range(200)],
+    'partial': [' '.join(random.choice(keys).split()[:-1]) for _ in range(200)],
+}
+lookup = {}
+found = 0
+for kind, items in queries.items():
+    times = []
+    for query in items:
+        started = time.perf_counter()
+        match = index.lookup(query)
+        times.append(time.perf_counter() - started)
+        if kind == 'near' and match:
+            found += 1
+    times.sort()
+    lookup[kind] = [times[len(times) // 2], times[int(len(times) * 0.99) - 1]]
+
+print(json.dumps({
+    'entries': len(index),
+    'bytes': size,
+    'lazy_bytes': lazy_bytes,
+    'build_seconds': build,
+    'lookup': lookup,
+    'near_found': found / len(queries['near'])
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ফাজি ইনডেক্সের মেমরি বাজেট")
+    parser.add_argument('--entries', type=int, default=100000, help="কতগুলো প্রশ্ন")
+    parser.add_argument('--bytes-per-key', type=float, default=600, help="প্রতি প্রশ্নে সর্বোচ্চ বাইট")
+    parser.add_argument('--lookup-ms', type=float, default=1.0, help="lookup এর p99 সর্বোচ্চ (মিলিসেকেন্ড)")
+    parser.add_argument('--min-found', type=float, default=0.9, help="এক অক্ষর ভুল প্রশ্নের কত অংশ পেতে হবে")
+    args = parser.parse_args()
+
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD % args.entries],
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(
+            filter(None, [ROOT, os.environ.get('PYTHONPATH')])
+        )),
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    per_key = result['bytes'] / max(1, result['entries'])
+    slowest = max(p99 for _, p99 in result['lookup'].values())
+    print(f"entries:        {result['entries']}")
+    print(f"index size:     {result['bytes'] / 1e6:.1f} MB ({per_key:.0f} B/key, budget {args.bytes_per_key:.0f})")
+    print(f"lazy (unbuilt): {result['lazy_bytes'] / 1e3:.1f} KB")
+    print(f"build:          {result['build_seconds']:.2f} s")
+    for kind, (p50, p99) in result['lookup'].items():
+        print(f"lookup {kind + ':':9} p50 {p50 * 1000:.3f} ms, p99 {p99 * 1000:.3f} ms (budget {args.lookup_ms:.1f} ms)")
+    print(f"near found:     {result['near_found']:.0%} (min {args.min_found:.0%})")
+
+    failed = (
+        per_key > args.bytes_per_key
+        or result['lazy_bytes'] > 64 * 1024
+        or slowest * 1000 > args.lookup_ms
+        or result['near_found'] < args.min_found
+    )
+    print("FAIL" if failed else "OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
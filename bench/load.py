@@ -0,0 +1,291 @@
+"""gunicorn-এর অধীনে অ্যাপের উপর মিশ্র লোড
+
+তিন ধরনের রিকোয়েস্ট পাঠানো হয়:
+    hit     আগে শেখানো প্রশ্ন (/api/chat, মেমরি থেকে উত্তর)
+    search  নতুন প্রশ্ন (/api/chat, লোকাল গুগল + লোকাল সাইট)
+    learn   নতুন প্রশ্ন-উত্তর (/api/learn)
+
+শেষে প্রতি ধরনের p50/p95/p99 লেটেন্সি, প্রতি সেকেন্ডে রিকোয়েস্ট আর
+স্টোর ফাইলগুলো কতটা বড় হলো তা দেখায়। উদাহরণ:
+
+    python -m bench.load --workers 2 --concurrency 16 --duration 30 \\
+        --mix hit=70,search=20,learn=10 --env KNOWLEDGE_STORAGE=json --json before.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from bench.sites import SiteServer, add_site_arguments
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUBS = os.path.join(ROOT, 'bench', 'stubs')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, p):
+    """nearest-rank পার্সেন্টাইল"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        if kind not in ('hit', 'search', 'learn'):
+            raise argparse.ArgumentTypeError(f"unknown kind: {kind}")
+        mix[kind] = float(weight)
+    return mix
+
+
+def file_sizes(directory):
+    """ডিরেক্টরির সব ফাইলের সাইজ (আপেক্ষিক পাথ অনুযায়ী)"""
+    sizes = {}
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                sizes[os.path.relpath(path, directory)] = os.path.getsize(path)
+            except OSError:
+                pass
+    return sizes
+
+
+class App:
+    """আলাদা ডিরেক্টরিতে gunicorn দিয়ে অ্যাপ চালানো"""
+
+    def __init__(self, workdir, workers, threads, env):
+        self.workdir = workdir
+        self.data_dir = os.path.join(workdir, 'app')
+        os.makedirs(self.data_dir)
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.command = [
+            sys.executable, '-m', 'gunicorn',
+            '--workers', str(workers),
+            '--threads', str(threads),
+            '--bind', f"127.0.0.1:{self.port}",
+            '--chdir', self.data_dir,
+            '--pythonpath', f"{STUBS},{ROOT}",
+            '--log-level', 'warning',
+            'app:app'
+        ]
+        self.env = dict(os.environ, **env)
+        self.process = None
+
+    def start(self, timeout=30):
+        self.log = open(os.path.join(self.workdir, 'gunicorn.log'), 'wb')
+        self.process = subprocess.Popen(self.command, env=self.env, stdout=self.log, stderr=self.log)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited, see {self.log.name}")
+            try:
+                urllib.request.urlopen(self.url + '/api/stats', timeout=1).read()
+                return self
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.2)
+        raise RuntimeError("gunicorn did not start")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.log.close()
+
+
+def post(url, payload, timeout):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+class LoadDriver:
+    """নির্দিষ্ট সময় ধরে একাধিক থ্রেড থেকে রিকোয়েস্ট"""
+
+    def __init__(self, base_url, mix, seeded, timeout=30):
+        self.base_url = base_url
+        self.kinds = list(mix)
+        self.weights = [mix[k] for k in self.kinds]
+        self.seeded = seeded
+        self.timeout = timeout
+        self.results = []       # (kind, ms, ok, source)
+        self._lock = threading.Lock()
+
+    def one(self, rng):
+        kind = rng.choices(self.kinds, self.weights)[0]
+        token = uuid.uuid4().hex[:12]
+        if kind == 'hit':
+            url, payload = '/api/chat', {'message': rng.choice(self.seeded)}
+        elif kind == 'search':
+            url, payload = '/api/chat', {'message': f"অজানা বিষয় {token} কী"}
+        else:
+            url, payload = '/api/learn', {
+                'question': f"নতুন তথ্য {token}",
+                'answer': f"বেঞ্চমার্কে শেখানো উত্তর {token}"
+            }
+
+        started = time.perf_counter()
+        try:
+            data = post(self.base_url + url, payload, self.timeout)
+            ok, source = 'error' not in data, data.get('source', 'learn')
+        except Exception:
+            ok, source = False, 'error'
+        elapsed = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self.results.append((kind, elapsed, ok, source))
+
+    def run(self, concurrency, duration):
+        stop_at = time.monotonic() + duration
+
+        def loop(seed):
+            rng = random.Random(seed)
+            while time.monotonic() < stop_at:
+                self.one(rng)
+
+        threads = [threading.Thread(target=loop, args=(i,)) for i in range(concurrency)]
+        started = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return time.monotonic() - started
+
+
+def summarize(results, elapsed, sizes_before, sizes_after):
+    report = {'elapsed': round(elapsed, 2), 'kinds': {}, 'files': {}}
+
+    for kind in ['all', 'hit', 'search', 'learn']:
+        rows = [r for r in results if kind == 'all' or r[0] == kind]
+        if not rows:
+            continue
+        latencies = [r[1] for r in rows]
+        sources = {}
+        for r in rows:
+            sources[r[3]] = sources.get(r[3], 0) + 1
+        report['kinds'][kind] = {
+            'requests': len(rows),
+            'errors': sum(1 for r in rows if not r[2]),
+            'rps': round(len(rows) / elapsed, 1),
+            'p50': round(percentile(latencies, 50), 1),
+            'p95': round(percentile(latencies, 95), 1),
+            'p99': round(percentile(latencies, 99), 1),
+            'sources': sources
+        }
+
+    for name in sorted(set(sizes_before) | set(sizes_after)):
+        before = sizes_before.get(name, 0)
+        after = sizes_after.get(name, 0)
+        if before != after:
+            report['files'][name] = {'before': before, 'after': after, 'growth': after - before}
+    return report
+
+
+def print_report(report):
+    print(f"\n{'kind':<8}{'reqs':>8}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for kind, row in report['kinds'].items():
+        print(f"{kind:<8}{row['requests']:>8}{row['errors']:>8}{row['rps']:>9}"
+              f"{row['p50']:>10}{row['p95']:>10}{row['p99']:>10}  {row['sources']}")
+
+    if report['files']:
+        print(f"\n{'file':<40}{'before':>12}{'after':>12}{'growth':>12}")
+        for name, row in report['files'].items():
+            print(f"{name:<40}{row['before']:>12}{row['after']:>12}{row['growth']:>+12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="অফলাইন লোড টেস্ট")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn ওয়ার্কার")
+    parser.add_argument('--threads', type=int, default=4, help="ওয়ার্কার প্রতি থ্রেড")
+    parser.add_argument('--concurrency', type=int, default=8, help="একসাথে কতজন ক্লায়েন্ট")
+    parser.add_argument('--duration', type=float, default=20, help="সেকেন্ড")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('hit=70,search=20,learn=10'))
+    parser.add_argument('--seed', type=int, default=200, help="আগে থেকে শেখানো প্রশ্নের সংখ্যা")
+    parser.add_argument('--search-latency', type=float, default=50, help="লোকাল গুগলের দেরি (ms)")
+    parser.add_argument('--env', action='append', default=[], help="অ্যাপের env, KEY=VALUE")
+    parser.add_argument('--json', help="ফলাফল এই ফাইলে সেভ")
+    parser.add_argument('--keep', action='store_true', help="কাজের ডিরেক্টরি মুছবে না")
+    add_site_arguments(parser)
+    args = parser.parse_args()
+
+    site = SiteServer(
+        latency=args.latency, jitter=args.jitter, size=args.size, fail_rate=args.fail_rate
+    ).start()
+
+    env = {
+        'BENCH_SITE_URL': site.url,
+        'BENCH_SEARCH_LATENCY': str(args.search_latency),
+        'PYTHONUNBUFFERED': '1',
+        # লোকাল গুগল, তাই সার্চ কোটা ছাড়া (--env দিয়ে আবার চালু করা যায়)
+        'MAX_SEARCH_PER_DAY': '0',
+        'SEARCH_PER_MIN': '1000000',
+        'SEARCH_BURST': '1000000',
+        'USER_SEARCH_PER_MIN': '1000000',
+        'USER_SEARCH_BURST': '1000000',
+        'MAX_INFLIGHT_SEARCHES': '1000'
+    }
+    env.update(item.split('=', 1) for item in args.env)
+
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    app = App(workdir, args.workers, args.threads, env)
+    try:
+        app.start()
+        print(f"App {app.url}, site {site.url}, workdir {workdir}")
+
+        seeded = [f"মুখস্থ প্রশ্ন নম্বর {i}" for i in range(args.seed)]
+        for question in seeded:
+            post(app.url + '/api/learn', {'question': question, 'answer': f"উত্তর {question}"}, 30)
+        # অন্য ওয়ার্কারগুলোও যেন শেখা প্রশ্ন দেখে
+        time.sleep(float(env.get('KNOWLEDGE_REFRESH_INTERVAL', 1.0)) + 0.5)
+
+        sizes_before = file_sizes(app.data_dir)
+        driver = LoadDriver(app.url, args.mix, seeded)
+        elapsed = driver.run(args.concurrency, args.duration)
+    finally:
+        app.stop()
+        site.stop()
+
+    report = summarize(driver.results, elapsed, sizes_before, file_sizes(app.data_dir))
+    report['config'] = {k: v for k, v in vars(args).items() if k != 'json'}
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.keep:
+        print(f"\nWorkdir kept: {workdir}")
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
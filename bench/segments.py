@@ -0,0 +1,81 @@
+"""একাধিক প্রসেস থেকে সেগমেন্ট লগে লেখার পরীক্ষা
+
+কয়েকটি প্রসেস একই SegmentedLog এ একসাথে লেখে, সেগমেন্ট ছোট রাখা হয় যাতে
+বারবার রোটেশন আর gzip হয়। শেষে দেখে প্রতিটি এন্ট্রি ঠিক একবার পড়া যায়
+আর count() সব প্রসেসের মোটের সমান কিনা। কিছু হারালে exit code 1:
+
+    python -m bench.segments --processes 2 --entries 500
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import sys
+from chatbot.segment_log import SegmentedLog
+
+log_dir, worker, entries, segment_bytes = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4])
+log = SegmentedLog(log_dir, max_segment_bytes=segment_bytes)
+for i in range(entries):
+    log.append({'timestamp': '2024-01-01T00:00:00', 'worker': worker, 'n': i, 'pad': 'x' * 40})
+log.close()
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="একাধিক প্রসেসের সেগমেন্ট লগ")
+    parser.add_argument('--processes', type=int, default=2, help="কতগুলো লেখক প্রসেস")
+    parser.add_argument('--entries', type=int, default=500, help="প্রতি প্রসেসে কতগুলো এন্ট্রি")
+    parser.add_argument('--segment-bytes', type=int, default=2048, help="সেগমেন্টের সর্বোচ্চ সাইজ")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from chatbot.segment_log import SegmentedLog
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        filter(None, [ROOT, os.environ.get('PYTHONPATH')])
+    ))
+    log_dir = tempfile.mkdtemp(prefix='segments-')
+    try:
+        children = [
+            subprocess.Popen([
+                sys.executable, '-c', CHILD, log_dir,
+                str(worker), str(args.entries), str(args.segment_bytes)
+            ], env=env)
+            for worker in range(args.processes)
+        ]
+        if any(child.wait() for child in children):
+            print("FAIL (writer crashed)")
+            sys.exit(1)
+
+        log = SegmentedLog(log_dir, max_segment_bytes=args.segment_bytes)
+        seen = {}
+        for entry in log.iter_entries():
+            key = (entry['worker'], entry['n'])
+            seen[key] = seen.get(key, 0) + 1
+        expected = args.processes * args.entries
+        missing = expected - len(seen)
+        duplicated = sum(1 for count in seen.values() if count > 1)
+        segments = len(log._segments())
+        counted = log.count()
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+    print(f"entries:    {expected} written, {len(seen)} readable")
+    print(f"missing:    {missing}")
+    print(f"duplicated: {duplicated}")
+    print(f"count():    {counted}")
+    print(f"segments:   {segments}")
+
+    failed = missing or duplicated or counted != expected
+    print("FAIL" if failed else "OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
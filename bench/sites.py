@@ -0,0 +1,127 @@
+"""বেঞ্চমার্কের জন্য লোকাল ওয়েবসাইট
+
+প্রতিটি /page/<id> একটি বাংলা HTML পেজ দেয়। দেরি, পেজের সাইজ আর
+ব্যর্থতার হার ইচ্ছামত ঠিক করা যায়:
+
+    python -m bench.sites --port 8765 --latency 200 --jitter 100 --size 50000 --fail-rate 0.1
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SENTENCES = [
+    "বাংলাদেশ দক্ষিণ এশিয়ার একটি স্বাধীন ও সার্বভৌম রাষ্ট্র।",
+    "ঢাকা বাংলাদেশের রাজধানী এবং সবচেয়ে বড় শহর।",
+    "পদ্মা, মেঘনা ও যমুনা এদেশের প্রধান নদী।",
+    "রবীন্দ্রনাথ ঠাকুর সাহিত্যে নোবেল পুরস্কার পেয়েছিলেন।",
+    "বাংলা ভাষা পৃথিবীর অন্যতম বহুল ব্যবহৃত ভাষা।",
+    "সুন্দরবন পৃথিবীর সবচেয়ে বড় ম্যানগ্রোভ বন।",
+    "একুশে ফেব্রুয়ারি আন্তর্জাতিক মাতৃভাষা দিবস।",
+    "চা এদেশের একটি গুরুত্বপূর্ণ রপ্তানি পণ্য।",
+]
+
+
+def render_page(page_id, size):
+    """page_id অনুযায়ী একই পেজ, প্রায় size বাইট"""
+    rng = random.Random(page_id)
+    head = (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{page_id}</title><script>var x = 1;</script>"
+        "<style>p { color: #333; }</style></head><body>"
+        "<nav><a href=\"/\">Home</a> | <a href=\"/about\">About</a></nav>"
+    )
+    parts = [head]
+    length = len(head.encode('utf-8'))
+    while length < size:
+        paragraph = "<p>" + " ".join(rng.sample(SENTENCES, 3)) + "</p>"
+        parts.append(paragraph)
+        length += len(paragraph.encode('utf-8'))
+    parts.append("</body></html>")
+    return "".join(parts).encode('utf-8')
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        delay = max(0.0, server.latency + random.uniform(-server.jitter, server.jitter))
+        if delay:
+            time.sleep(delay / 1000)
+
+        if random.random() < server.fail_rate:
+            if random.random() < 0.5:
+                # কানেকশন হঠাৎ বন্ধ
+                self.close_connection = True
+                return
+            self.send_error(503)
+            return
+
+        if not self.path.startswith('/page/'):
+            self.send_error(404)
+            return
+
+        body = render_page(self.path[len('/page/'):], server.size)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SiteServer:
+    """ব্যাকগ্রাউন্ড থ্রেডে চলা লোকাল সাইট"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0, jitter=0, size=20000, fail_rate=0):
+        self.httpd = ThreadingHTTPServer((host, port), SiteHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.jitter = jitter
+        self.httpd.size = size
+        self.httpd.fail_rate = fail_rate
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def add_site_arguments(parser):
+    parser.add_argument('--latency', type=float, default=100, help="পেজের দেরি (ms)")
+    parser.add_argument('--jitter', type=float, default=50, help="দেরির ওঠানামা (ms)")
+    parser.add_argument('--size', type=int, default=20000, help="পেজের সাইজ (বাইট)")
+    parser.add_argument('--fail-rate', type=float, default=0.05, help="ব্যর্থ রিকোয়েস্টের হার (0-1)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="বেঞ্চমার্কের লোকাল ওয়েবসাইট")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_site_arguments(parser)
+    args = parser.parse_args()
+
+    site = SiteServer(args.host, args.port, args.latency, args.jitter, args.size, args.fail_rate)
+    print(f"Serving {site.url}/page/<id>")
+    try:
+        site.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
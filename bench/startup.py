@@ -0,0 +1,91 @@
+"""স্টার্টআপ সময়ের বাজেট পরীক্ষা
+
+নতুন প্রসেসে `import app` (জ্ঞান লোড, --env FUZZY_INDEX=eager দিলে ফাজি
+ইনডেক্সও) কত সময় নেয় তা মাপে, আর দেখে googlesearch/requests/bs4 এর মতো
+ভারী মডিউল স্টার্টআপে লোড হচ্ছে কিনা। বাজেট পার হলে exit code 1:
+
+    python -m bench.startup --entries 20000 --budget 2.0
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# স্টার্টআপে এগুলো লোড হওয়ার কথা না
+HEAVY_MODULES = ['googlesearch', 'requests', 'urllib3', 'bs4']
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import chatbot
+package = time.perf_counter() - started
+import app
+total = time.perf_counter() - started
+print(json.dumps({
+    'package_seconds': package,
+    'app_seconds': total,
+    'knowledge': len(app.chatbot.knowledge),
+    'heavy': [m for m in %r if m in sys.modules]
+}))
+""" % (HEAVY_MODULES,)
+
+
+def make_knowledge(path, entries):
+    knowledge = {
+        f"পরীক্ষার প্রশ্ন নম্বর {i} এর উত্তর কী": f"এটি {i} নম্বর প্রশ্নের একটি লম্বা উত্তর। " * 5
+        for i in range(entries)
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(knowledge, f, ensure_ascii=False, indent=2)
+
+
+def measure(workdir, env):
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD],
+        cwd=workdir,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(
+            filter(None, [ROOT, os.environ.get('PYTHONPATH')])
+        ), **env),
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="স্টার্টআপ সময়ের বাজেট")
+    parser.add_argument('--entries', type=int, default=20000, help="knowledge.json এ কতগুলো প্রশ্ন")
+    parser.add_argument('--budget', type=float, default=2.0, help="import app এর সর্বোচ্চ সময় (সেকেন্ড)")
+    parser.add_argument('--runs', type=int, default=3, help="কতবার মেপে সবচেয়ে কম সময় নেওয়া")
+    parser.add_argument('--env', action='append', default=[], help="অ্যাপের env, KEY=VALUE")
+    args = parser.parse_args()
+
+    env = dict(item.split('=', 1) for item in args.env)
+    workdir = tempfile.mkdtemp(prefix='startup-')
+    try:
+        make_knowledge(os.path.join(workdir, 'knowledge.json'), args.entries)
+        # প্রথমবার জার্নাল তৈরি হয়, সেটা মাপে ধরা হয় না
+        measure(workdir, env)
+        results = [measure(workdir, env) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    best = min(results, key=lambda r: r['app_seconds'])
+    print(f"entries:          {best['knowledge']}")
+    print(f"import chatbot:   {best['package_seconds'] * 1000:.1f} ms")
+    print(f"import app:       {best['app_seconds'] * 1000:.1f} ms (budget {args.budget * 1000:.0f} ms)")
+    print(f"heavy at startup: {', '.join(best['heavy']) or 'none'}")
+
+    failed = best['app_seconds'] > args.budget or best['heavy']
+    print("FAIL" if failed else "OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+"""googlesearch.search এর লোকাল বিকল্প (শুধু বেঞ্চমার্কের জন্য)
+
+BENCH_SITE_URL এর সাইট থেকে কোয়েরি অনুযায়ী নির্দিষ্ট URL দেয়।
+BENCH_SEARCH_LATENCY (মিলিসেকেন্ড) দিয়ে গুগলের দেরি নকল করা যায়।
+"""
+import os
+import time
+import hashlib
+
+
+def search(term, num_results=10, lang="en", **kwargs):
+    latency = float(os.environ.get('BENCH_SEARCH_LATENCY', 0))
+    if latency:
+        time.sleep(latency / 1000)
+
+    base = os.environ.get('BENCH_SITE_URL', 'http://127.0.0.1:8765')
+    digest = hashlib.sha1(term.encode('utf-8')).hexdigest()[:12]
+    for i in range(num_results):
+        yield f"{base}/page/{digest}-{i}"
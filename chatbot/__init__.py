@@ -0,0 +1,29 @@
+# চ্যাটবট প্যাকেজ
+#
+# ক্লাসগুলো প্রথম ব্যবহারের সময় ইমপোর্ট হয় (PEP 562), তাই
+# `from chatbot import metrics` এর মতো হালকা ইমপোর্টে googlesearch বা
+# requests লোড হয় না।
+import importlib
+
+_LAZY = {
+    'BengaliChatbot': '.brain',
+    'MemoryManager': '.memory',
+    'SafetyChecker': '.safety',
+    'GoogleSearcher': '.google_searcher',
+    'WebScraper': '.web_scraper',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,12 +5,24 @@ from datetime import datetime
 from .memory import MemoryManager
 from .safety import SafetyChecker
 from .google_searcher import GoogleSearcher
+from .fuzzy_index import normalize_question
+from .single_flight import SingleFlight
+from .learning_queue import LearningQueue
+from .quota import SearchQuota
+from . import metrics
 
 class BengaliChatbot:
     def __init__(self):
         self.memory = MemoryManager()
         self.safety = SafetyChecker()
         self.searcher = GoogleSearcher()
+        # কোটায় আটকানো খোঁজা অপেক্ষায় থাকা অন্য কলারকে দেওয়া হয় না
+        self.inflight = SingleFlight(shareable=lambda result: not result[1])
+        self.quota = SearchQuota()
+        
+        # শেখা (সেফটি চেক, সেভ, লগ) ব্যাকগ্রাউন্ডে
+        self.learner = LearningQueue()
+        self._pending = {}
         
         # বেসিক জ্ঞান
         self.base_knowledge = {
@@ -21,6 +33,12 @@ class BengaliChatbot:
     
     def process_message(self, user_input, user_id, web_search=True):
         """মেসেজ প্রসেস"""
+        started = time.perf_counter()
+        response = self._process(user_input, user_id, web_search)
+        metrics.RESPONSE_SECONDS.observe(time.perf_counter() - started, source=response["type"])
+        return response
+    
+    def _process(self, user_input, user_id, web_search):
         user_input_lower = user_input.lower()
         
         # বেসিক জ্ঞান চেক
@@ -30,18 +48,29 @@ class BengaliChatbot:
                 "base"
             )
         
-        # মেমরি চেক
+        # মেমরি চেক (কিউতে থাকা শেখাও)
         memory_answer = self.memory.get_response(user_input_lower)
+        if not memory_answer:
+            memory_answer = self._pending.get(user_input_lower.strip())
         if memory_answer:
             return self._format_response(memory_answer, "learned")
         
-        # গুগল সার্চ
-        if web_search:
-            web_answer = self.try_web_search(user_input)
-            if web_answer:
-                # শিখে নেওয়া
-                self.memory.learn_new(user_input, web_answer, user_id)
-                return self._format_response(web_answer, "web_search")
+        # গুগল সার্চ (একটু আগে ব্যর্থ হলে আবার নয়)
+        if web_search and not self.searcher.cache.is_negative(user_input_lower):
+            # ইউজারের বাজেট আগেই দেখা, যাতে সীমিত ইউজার অন্যের খোঁজার ফল না পায়
+            limited = self.quota.check(user_id)
+            if limited:
+                metrics.SEARCH_LIMITED.inc(reason=limited)
+            else:
+                # একই প্রশ্ন একসাথে এলে একবারই খোঁজা
+                (web_answer, _), _ = self.inflight.do(
+                    normalize_question(user_input_lower),
+                    self._search_and_learn,
+                    user_input,
+                    user_id
+                )
+                if web_answer:
+                    return self._format_response(web_answer, "web_search")
         
         # ডিফল্ট
         return self._format_response(
@@ -49,6 +78,38 @@ class BengaliChatbot:
             "unknown"
         )
     
+    def _search_and_learn(self, user_input, user_id):
+        """গুগল থেকে খুঁজে শেখা: (উত্তর, কোটায় আটকানোর কারণ)"""
+        # বাজেট শেষ হলে না খুঁজে ডিফল্ট উত্তর (নেগেটিভ ক্যাশে রাখা হয় না)
+        limited = self.quota.acquire(user_id)
+        if limited:
+            metrics.SEARCH_LIMITED.inc(reason=limited)
+            return None, limited
+        try:
+            web_answer = self.try_web_search(user_input)
+        finally:
+            self.quota.release()
+        if web_answer:
+            # শিখে নেওয়া (ব্যাকগ্রাউন্ডে)
+            self._pending[user_input.lower().strip()] = web_answer
+            self.learner.submit(self._learn, user_input, web_answer, user_id)
+        else:
+            self.searcher.cache.set_negative(user_input.lower())
+        return web_answer, None
+    
+    def _learn(self, question, answer, user_id):
+        """সেফটি চেক করে মেমরিতে শেখা"""
+        try:
+            check = self.safety.check_content(question, answer)
+            if not check["safe"]:
+                print(f"Skipped learning '{question}': {check['reason']}")
+                return False
+            
+            answer = self.safety.sanitize_text(answer)
+            return self.memory.learn_new(question, answer, user_id, source="web_search")
+        finally:
+            self._pending.pop(question.lower().strip(), None)
+    
     def try_web_search(self, query):
         """গুগল সার্চ চেষ্টা"""
         try:
@@ -0,0 +1,50 @@
+import os
+import json
+
+BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 500))
+MAX_LINE = int(os.environ.get('BULK_MAX_LINE', 64 * 1024))
+
+
+def iter_records(stream, max_line=None):
+    """JSONL স্ট্রিম থেকে (লাইন নম্বর, রেকর্ড, ত্রুটি), একবারে এক লাইন পড়া হয়"""
+    if max_line is None:
+        max_line = MAX_LINE
+
+    number = 0
+    while True:
+        line = stream.readline(max_line + 1)
+        if not line:
+            break
+        number += 1
+
+        if len(line) > max_line and not line.endswith(b'\n'):
+            # বাকি অংশ পড়ে ফেলে দেওয়া, মেমরিতে রাখা নয়
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_line)
+            yield number, None, f"লাইন খুব বড় (সর্বোচ্চ {max_line} বাইট)"
+            continue
+
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, None, "JSON ঠিক নেই"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "প্রতিটি লাইন একটি JSON অবজেক্ট হতে হবে"
+            continue
+        yield number, record, None
+
+
+def batched(items, size=None):
+    """নির্দিষ্ট সাইজের ব্যাচ (শেষটা ছোট হতে পারে)"""
+    size = size or BATCH_SIZE
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
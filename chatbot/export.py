@@ -0,0 +1,55 @@
+import json
+import zlib
+
+
+def iter_json_items(f):
+    """JSON অবজেক্ট ফাইল থেকে (key, value), পুরো ফাইল মেমরিতে না এনে
+
+    indent দিয়ে লেখা ফাইলে (json.dump(..., indent=2)) প্রতিটি কী এক লাইনে
+    থাকে, তাই লাইন ধরে পড়া যায়। অন্য ফরম্যাট হলে পুরোটা একবারে পার্স।
+    """
+    first = f.readline()
+    if first.strip() != b'{':
+        data = json.loads(first + f.read() or b'{}')
+        yield from data.items()
+        return
+
+    for line in f:
+        line = line.strip()
+        if line == b'}':
+            break
+        if line.endswith(b','):
+            line = line[:-1]
+        # মান একাধিক লাইনে ছড়ানো (লিস্ট/ডিক্ট) হলে এখানে ValueError
+        yield from json.loads(b'{' + line + b'}').items()
+
+
+def ndjson(records):
+    """প্রতিটি রেকর্ড এক লাইন JSON (বাইট)"""
+    for record in records:
+        yield (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def coalesce(chunks, min_chunk=64 * 1024):
+    """ছোট চাঙ্ক জোড়া দিয়ে প্রায় min_chunk সাইজ করে পাঠানো"""
+    pending = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= min_chunk:
+            yield b''.join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield b''.join(pending)
+
+
+def gzip_chunks(chunks, level=6, min_chunk=64 * 1024):
+    """বাইট চাঙ্ক ক্রমান্বয়ে gzip"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in coalesce(chunks, min_chunk):
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
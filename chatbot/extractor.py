@@ -0,0 +1,141 @@
+import os
+import re
+import time
+import codecs
+from html.parser import HTMLParser
+from . import metrics
+
+# এই ট্যাগের ভেতরের লেখা বাদ
+SKIP_TAGS = {
+    'script', 'style', 'noscript', 'template', 'svg', 'head',
+    'nav', 'header', 'footer', 'aside', 'form', 'iframe', 'button', 'select'
+}
+
+# এই ট্যাগ শেষ মানে বাক্যও শেষ
+BLOCK_TAGS = {
+    'p', 'div', 'li', 'ul', 'ol', 'br', 'tr', 'td', 'th', 'table',
+    'section', 'article', 'blockquote', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'
+}
+
+MAX_BYTES = int(os.environ.get('EXTRACT_MAX_BYTES', 512 * 1024))
+
+_BANGLA_RE = re.compile(r'[\u0980-\u09FF]')
+_SENTENCE_RE = re.compile(r'[^.।!?]+[.।!?]*')
+_TERMINATORS = '.।!?\n'
+
+
+class BanglaTextParser(HTMLParser):
+    """HTML থেকে ক্রমান্বয়ে বাংলা বাক্য সংগ্রহ (পুরো DOM তৈরি না করে)"""
+
+    def __init__(self, max_sentences=5, min_length=10, head_chars=500):
+        super().__init__(convert_charrefs=True)
+        self.max_sentences = max_sentences
+        self.min_length = min_length
+        self.head_chars = head_chars
+
+        self.sentences = []
+        self.done = False
+        self._skip = 0
+        self._buffer = ''
+        self._head = ''
+
+    @property
+    def head(self):
+        """প্রথম কিছু লেখা (বাংলা না পেলে কাজে লাগে)"""
+        return ' '.join(self._head.split())[:self.head_chars]
+
+    def _append(self, text):
+        self._buffer += text
+        if len(self._head) < self.head_chars * 2:
+            self._head += text
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag in BLOCK_TAGS and not self._skip:
+            self._append('\n')
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS and not self._skip:
+            self._append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            if self._skip:
+                self._skip -= 1
+        elif tag in BLOCK_TAGS and not self._skip:
+            self._append('\n')
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip or self.done:
+            return
+
+        self._append(data)
+        self._flush()
+
+    def _flush(self, final=False):
+        """সম্পূর্ণ বাক্যগুলো বের করা, অসম্পূর্ণ অংশ বাফারে থাকে"""
+        text = self._buffer
+        if final:
+            complete, rest = text, ''
+        else:
+            last = max(text.rfind(c) for c in _TERMINATORS)
+            if last < 0:
+                if len(text) < 4000:
+                    return
+                complete, rest = text, ''
+            else:
+                complete, rest = text[:last + 1], text[last + 1:]
+        self._buffer = rest
+
+        for line in complete.split('\n'):
+            for match in _SENTENCE_RE.finditer(line):
+                sentence = ' '.join(match.group().split())
+                if len(sentence) > self.min_length and _BANGLA_RE.search(sentence):
+                    self.sentences.append(sentence)
+                    if len(self.sentences) >= self.max_sentences:
+                        self.done = True
+                        return
+
+    def finish(self):
+        if not self.done:
+            self._flush(final=True)
+        self.sentences = self.sentences[:self.max_sentences]
+        return self.sentences
+
+
+def extract_bangla_sentences(chunks, max_sentences=5, min_length=10,
+                             max_bytes=None, encoding='utf-8', parser=None):
+    """বাইট চাঙ্ক থেকে বাংলা বাক্য, যথেষ্ট পেলে বা max_bytes পার হলে থামে"""
+    if max_bytes is None:
+        max_bytes = MAX_BYTES
+    if parser is None:
+        parser = BanglaTextParser(max_sentences, min_length)
+
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    # বডি ডাউনলোডের অপেক্ষা আর পার্সিং আলাদা করে মাপা
+    started = time.perf_counter()
+    parsing = 0.0
+    size = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        size += len(chunk)
+        fed = time.perf_counter()
+        parser.feed(decoder.decode(chunk))
+        parsing += time.perf_counter() - fed
+        if parser.done or size >= max_bytes:
+            break
+
+    try:
+        parser.close()
+    except Exception:
+        pass
+    metrics.STAGE_SECONDS.observe(parsing, stage='extract')
+    metrics.STAGE_SECONDS.observe(time.perf_counter() - started - parsing, stage='download')
+    return parser.finish()
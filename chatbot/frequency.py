@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+from array import array
+
+WIDTH = int(os.environ.get('FREQ_WIDTH', 4096))
+DEPTH = int(os.environ.get('FREQ_DEPTH', 4))
+TOP_CAPACITY = int(os.environ.get('FREQ_TOP', 100))
+DECAY_INTERVAL = float(os.environ.get('FREQ_DECAY_INTERVAL', 3600))
+
+
+class CountMinSketch:
+    """নির্দিষ্ট মেমরিতে (width x depth কাউন্টার) আনুমানিক গণনা, কখনো কম বলে না"""
+
+    def __init__(self, width=WIDTH, depth=DEPTH):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('I', bytes(4 * width)) for _ in range(depth)]
+
+    def _columns(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[4 * i:4 * i + 4], 'little') % self.width for i in range(self.depth)]
+
+    def add(self, key, count=1):
+        """যোগ করে নতুন আনুমানিক মান ফেরত"""
+        estimate = None
+        for row, column in zip(self.rows, self._columns(key)):
+            value = min(row[column] + count, 0xFFFFFFFF)
+            row[column] = value
+            estimate = value if estimate is None else min(estimate, value)
+        return estimate
+
+    def estimate(self, key):
+        return min(row[column] for row, column in zip(self.rows, self._columns(key)))
+
+    def halve(self):
+        for row in self.rows:
+            for i, value in enumerate(row):
+                if value:
+                    row[i] = value >> 1
+
+
+class FrequencyTracker:
+    """একটি sketch আর সবচেয়ে বেশি আসা capacity টা প্রশ্নের তালিকা
+
+    প্রতিটি প্রশ্ন sketch-এ যায়; যাদের আনুমানিক গণনা তালিকার সবচেয়ে ছোটটির
+    চেয়ে বেশি, তারাই তালিকায় ঢোকে। তালিকায় প্রশ্নের একটি আসল রূপও থাকে
+    (প্রিওয়ার্মে সার্চের জন্য)।
+    """
+
+    def __init__(self, capacity=TOP_CAPACITY, width=WIDTH, depth=DEPTH):
+        self.capacity = capacity
+        self.sketch = CountMinSketch(width, depth)
+        self.top = {}           # key -> [count, sample]
+        self.total = 0
+
+    def add(self, key, sample):
+        self.total += 1
+        count = self.sketch.add(key)
+        entry = self.top.get(key)
+        if entry is not None:
+            entry[0] = count
+            entry[1] = sample
+            return
+        if len(self.top) < self.capacity:
+            self.top[key] = [count, sample]
+            return
+        smallest = min(self.top, key=lambda k: self.top[k][0])
+        if count > self.top[smallest][0]:
+            del self.top[smallest]
+            self.top[key] = [count, sample]
+
+    def discard(self, key):
+        self.top.pop(key, None)
+
+    def halve(self):
+        self.sketch.halve()
+        self.total >>= 1
+        for key in list(self.top):
+            self.top[key][0] >>= 1
+            if not self.top[key][0]:
+                del self.top[key]
+
+    def most_common(self, k):
+        ranked = sorted(self.top.items(), key=lambda item: -item[1][0])[:k]
+        return [(key, count, sample) for key, (count, sample) in ranked]
+
+
+class QueryStats:
+    """আসা প্রশ্নের ঘনত্ব, মেমরি hit আর miss আলাদা
+
+    DECAY_INTERVAL পরপর সব গণনা অর্ধেক, তাই তালিকা সাম্প্রতিক ট্রাফিক দেখায়।
+    সবচেয়ে বেশি miss হওয়া প্রশ্নগুলো ফাইলে সেভ হয় (প্রসেস বন্ধের সময়ও),
+    যাতে রিস্টার্টের পর প্রিওয়ার্ম সেগুলো দিয়ে শুরু করতে পারে। প্রতিটি
+    ওয়ার্কার নিজের ট্রাফিক গোনে।
+    """
+
+    KINDS = ('hit', 'miss')
+
+    def __init__(self, path=None, capacity=TOP_CAPACITY, decay_interval=DECAY_INTERVAL):
+        self.path = path or os.environ.get('FREQ_FILE', 'query_stats.json')
+        self.decay_interval = decay_interval
+        self.trackers = {kind: FrequencyTracker(capacity) for kind in self.KINDS}
+        self.last_seen = 0.0            # শেষ প্রশ্নের সময় (ব্যস্ততা বোঝার জন্য)
+        self._next_decay = time.monotonic() + decay_interval
+        self._lock = threading.Lock()
+
+        atexit.register(self.save)
+
+    def record(self, key, sample, hit):
+        """একটি প্রশ্ন গোনা; key = normalize করা প্রশ্ন"""
+        now = time.monotonic()
+        with self._lock:
+            self.last_seen = now
+            if now >= self._next_decay:
+                self._next_decay = now + self.decay_interval
+                for tracker in self.trackers.values():
+                    tracker.halve()
+            if hit:
+                # আগে miss ছিল, এখন মেমরিতে আছে
+                self.trackers['miss'].discard(key)
+            self.trackers['hit' if hit else 'miss'].add(key, sample)
+
+    def discard_miss(self, key):
+        with self._lock:
+            self.trackers['miss'].discard(key)
+
+    def top(self, kind, k=10):
+        """[(key, আনুমানিক গণনা, নমুনা প্রশ্ন)]"""
+        with self._lock:
+            return self.trackers[kind].most_common(k)
+
+    def idle_for(self):
+        return time.monotonic() - self.last_seen
+
+    def summary(self, k=10):
+        with self._lock:
+            result = {'window_seconds': self.decay_interval}
+            for kind, tracker in self.trackers.items():
+                result[kind] = {
+                    'total': tracker.total,
+                    'top': [
+                        {'question': sample, 'count': count}
+                        for _, count, sample in tracker.most_common(k)
+                    ]
+                }
+            return result
+
+    # ---------- ফাইল ----------
+
+    def load(self):
+        """আগের সেভ করা miss তালিকা (সফল হলে True)"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                with self._lock:
+                    tracker = self.trackers['miss']
+                    for key, count, sample in data.get('miss', []):
+                        tracker.sketch.add(key, count)
+                        tracker.top[key] = [tracker.sketch.estimate(key), sample]
+                return True
+        except Exception as e:
+            print(f"Query stats load error: {e}")
+        return False
+
+    def save(self):
+        """সবচেয়ে বেশি miss হওয়া প্রশ্নগুলো ফাইলে (অ্যাটমিক, শেষ লেখক জেতে)"""
+        with self._lock:
+            misses = self.trackers['miss'].most_common(self.trackers['miss'].capacity)
+        if not misses:
+            return
+        try:
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'miss': misses}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Query stats save error: {e}")
@@ -0,0 +1,282 @@
+import os
+import re
+import math
+import threading
+import unicodedata
+import heapq
+from array import array
+from collections import Counter
+from operator import itemgetter
+
+# ক্যান্ডিডেট খুঁজতে সর্বোচ্চ কত doc_id ছোঁয়া, আর কতগুলো পুরো যাচাই (lookup-এর সময় সীমিত রাখে)
+MAX_POSTINGS = int(os.environ.get('FUZZY_MAX_POSTINGS', 2000))
+MAX_CANDIDATES = int(os.environ.get('FUZZY_MAX_CANDIDATES', 8))
+
+# বানানভেদ সমান করা (কি/কী, উ/ঊ ইত্যাদি)
+_CHAR_MAP = str.maketrans({
+    '\u09C0': '\u09BF',  # ী -> ি
+    '\u09C2': '\u09C1',  # ূ -> ু
+    '\u0988': '\u0987',  # ঈ -> ই
+    '\u098A': '\u0989',  # ঊ -> উ
+    '\u200C': None,      # ZWNJ
+    '\u200D': None,      # ZWJ
+})
+
+_PUNCT_RE = re.compile(r'[^\w\u0980-\u09FF]+')
+
+
+def normalize_question(text):
+    """প্রশ্ন স্বাভাবিক করা"""
+    text = unicodedata.normalize('NFC', text.lower()).translate(_CHAR_MAP)
+    text = text.replace('\u0964', ' ').replace('\u0965', ' ')  # । ॥
+    return ' '.join(_PUNCT_RE.sub(' ', text).split())
+
+
+class QuestionIndex:
+    """ক্যারেক্টার n-gram ইনভার্টেড ইনডেক্স (ফাজি প্রশ্ন খোঁজা)
+
+    প্রতি প্রশ্নের জন্য শুধু gram সংখ্যা, আর প্রতি gram-এর posting একটি
+    বাড়তে থাকা array('I')। বাদ দেওয়া doc posting-এ থেকে যায়, অনেক জমলে
+    posting নতুন করে তৈরি হয়। lookup শুধু দুর্লভ gram-এর posting পড়ে
+    (মোট MAX_POSTINGS পর্যন্ত), তাই সময় জ্ঞানের আকারের উপর নির্ভর করে না;
+    শুধু সাধারণ gram দিয়ে গড়া প্রশ্নের ফাজি মিল পাওয়া যায় না।
+    lazy হলে প্রথম lookup ব্যাকগ্রাউন্ড থ্রেডে তৈরি শুরু করে আর তৈরি শেষ না
+    হওয়া পর্যন্ত None দেয় (রিকোয়েস্ট আটকায় না), যাতে স্টার্টআপ আর ফাজি খোঁজা
+    না লাগা ওয়ার্কারের মেমরি বাঁচে। preload-এ warm() মাস্টারেই তৈরি করে।
+    """
+
+    def __init__(self, threshold=0.8, ngram=3, enabled=True, lazy=False):
+        self.threshold = threshold
+        self.ngram = ngram
+        # False হলে কিছুই রাখে না (প্রতি ওয়ার্কারের মেমরি জ্ঞানের আকারের উপর নির্ভর করে না)
+        self.enabled = enabled
+        self.lazy = lazy
+
+        self._postings = {}          # gram -> array('I') of doc_id
+        self._keys = []              # doc_id -> key (বাদ পড়লে None)
+        self._sizes = array('I')     # doc_id -> gram সংখ্যা
+        self._ids = {}               # key -> doc_id
+        self._exact = {}             # hash(normalized) -> doc_id
+        self._dead = 0
+
+        self._source = None
+        self._built = not lazy
+        self._builder = None         # যে প্রসেসে তৈরি চলছে/চলেছে তার pid
+        self._skip = set()           # তৈরির মাঝে বাদ পড়া প্রশ্ন (উৎস থেকে আর যোগ নয়)
+        self._start_lock = threading.Lock()
+
+        # যোগ/বাদ একজন করে; lookup লক ছাড়া (মাঝে বাদ পড়া doc এড়িয়ে যায়)
+        self._write_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _grams(self, normalized):
+        padded = f" {normalized} "
+        n = self.ngram
+        if len(padded) <= n:
+            return frozenset([padded])
+        return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+    def build(self, keys):
+        """পুরো ইনডেক্স তৈরি
+
+        keys: প্রশ্নের iterable বা তা ফেরত দেওয়া ফাংশন। lazy হলে শুধু মনে
+        রাখা হয় আর প্রথম lookup (বা warm()) এর পর পড়া হয়, তাই তখনকার সব প্রশ্ন দিতে
+        হবে (ডিক্ট বা ফাংশন, একবার চলা iterator নয়)।
+        """
+        if not self.enabled:
+            return
+        if self.lazy and not self._built:
+            self._source = keys
+            return
+        for key in (keys() if callable(keys) else keys):
+            self.add(key)
+
+    def warm(self):
+        """lazy ইনডেক্স এখনই এই থ্রেডে তৈরি (preload-এ মাস্টারে, fork-এর আগে, যাতে
+        ওয়ার্কাররা copy-on-write শেয়ার করে)"""
+        if not self.enabled or self._built:
+            return
+        with self._write_lock:
+            self._reset()
+            self._builder = os.getpid()
+        self._build_source(self._builder)
+
+    def _start_build(self):
+        """ব্যাকগ্রাউন্ড থ্রেডে তৈরি শুরু (fork-এর পর প্রতিটি ওয়ার্কারে নতুন করে)"""
+        if self._builder == os.getpid():
+            return
+        with self._start_lock:
+            if self._builder == os.getpid():
+                return
+            if self._builder is not None:
+                # অন্য প্রসেসে তৈরির মাঝপথে fork: অর্ধেক অংশ আর লক সেই প্রসেসের
+                self._write_lock = threading.Lock()
+            with self._write_lock:
+                self._reset()
+                self._builder = os.getpid()
+            threading.Thread(
+                target=self._build_source, args=(self._builder,),
+                name='fuzzy-index', daemon=True
+            ).start()
+
+    def _reset(self):
+        self._postings, self._keys, self._sizes = {}, [], array('I')
+        self._ids, self._exact, self._dead = {}, {}, 0
+        self._skip = set()
+
+    def _build_source(self, pid, batch=1000):
+        source = self._source
+        keys = list(source() if callable(source) else source or ())
+
+        # অল্প অল্প করে লক নেওয়া, যাতে মাঝে যোগ/বাদ আটকে না থাকে
+        for start in range(0, len(keys), batch):
+            with self._write_lock:
+                if self._builder != pid:
+                    return
+                for key in keys[start:start + batch]:
+                    if key not in self._skip:
+                        self._add(key)
+        with self._write_lock:
+            self._source = None
+            self._skip = set()
+            self._built = True
+
+    def add(self, key):
+        """একটি প্রশ্ন যোগ"""
+        # তৈরি শুরু না হলে দরকার নেই, তৈরির সময় উৎসেই থাকবে
+        if not self.enabled or self._builder is None and not self._built or key in self._ids:
+            return
+        with self._write_lock:
+            self._skip.discard(key)
+            self._add(key)
+
+    def _add(self, key):
+        if key in self._ids:
+            return
+        normalized = normalize_question(key)
+        if not normalized:
+            return
+        grams = self._grams(normalized)
+
+        # posting-এর আগে doc, যাতে lookup কখনো অজানা doc_id না পায়
+        doc_id = len(self._keys)
+        self._keys.append(key)
+        self._sizes.append(len(grams))
+        self._ids[key] = doc_id
+        self._exact[hash(normalized)] = doc_id
+
+        postings = self._postings
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array('I')
+            posting.append(doc_id)
+
+    def remove(self, key):
+        """একটি প্রশ্ন বাদ"""
+        if self._builder is None and not self._built:
+            return
+        normalized = normalize_question(key)
+        with self._write_lock:
+            if not self._built:
+                self._skip.add(key)
+            doc_id = self._ids.pop(key, None)
+            if doc_id is None:
+                return
+
+            exact = hash(normalized)
+            if self._exact.get(exact) == doc_id:
+                del self._exact[exact]
+            self._keys[doc_id] = None
+            self._dead += 1
+            if self._dead > max(1024, len(self._ids)):
+                self._repack()
+
+    def _repack(self):
+        """বাদ পড়া doc বাদ দিয়ে posting নতুন করে (পুরাতন posting পড়ছে এমন lookup চলতে থাকে)"""
+        keys = self._keys
+        postings = {}
+        for gram, posting in self._postings.items():
+            kept = array('I', (doc_id for doc_id in posting if keys[doc_id] is not None))
+            if kept:
+                postings[gram] = kept
+        self._postings = postings
+        self._dead = 0
+
+    def _key(self, doc_id):
+        return self._keys[doc_id] if doc_id < len(self._keys) else None
+
+    def lookup(self, query):
+        """সবচেয়ে কাছের প্রশ্ন, (key, score) অথবা None"""
+        if not self.enabled:
+            return None
+        normalized = normalize_question(query)
+        if not normalized:
+            return None
+        if not self._built:
+            self._start_build()
+            return None
+
+        # ১. স্বাভাবিক রূপে হুবহু মিল (hash মিললে আসল রূপ যাচাই)
+        doc_id = self._exact.get(hash(normalized))
+        key = self._key(doc_id) if doc_id is not None else None
+        if key is not None and normalize_question(key) == normalized:
+            return key, 1.0
+
+        # ২. দুর্লভ gram থেকে ক্যান্ডিডেট (prefix filtering), মোট MAX_POSTINGS টা
+        # doc_id এর বেশি নয়: টেমপ্লেটের মতো সাধারণ gram-এর বিশাল posting ছোঁয়াই হয় না
+        grams = self._grams(normalized)
+        index = self._postings
+        postings = sorted(
+            (index.get(gram, ()) for gram in grams),
+            key=len
+        )
+
+        # Dice >= t হলে কমপক্ষে t*|A|/(2-t) gram মিলতে হবে
+        t = self.threshold
+        query_size = len(grams)
+        min_overlap = max(1, math.ceil(t * query_size / (2 - t)))
+        prefix = query_size - min_overlap + 1
+
+        counts = Counter()
+        touched = 0
+        for posting in postings[:prefix]:
+            touched += len(posting)
+            if touched > MAX_POSTINGS and counts:
+                break
+            if len(posting) > MAX_POSTINGS:
+                # সব gram-ই সাধারণ, দুর্লভ কিছু দিয়ে খোঁজা যায় না
+                return None
+            counts.update(posting)
+        if not counts:
+            return None
+
+        # ৩. বেশি দুর্লভ gram মেলা প্রশ্নগুলো থেকে সাইজ দিয়ে বাদ (Dice >= t হলে
+        # |B| এর সীমা), বাকি MAX_CANDIDATES টা আসল gram দিয়ে যাচাই
+        low = t * query_size / (2 - t)
+        high = (2 - t) * query_size / t
+        sizes = self._sizes
+        ranked = heapq.nlargest(MAX_CANDIDATES * 2, counts.items(), key=itemgetter(1))
+
+        best_key, best_score = None, 0.0
+        checked = 0
+        for doc_id, _ in ranked:
+            if not low <= sizes[doc_id] <= high:
+                continue
+            if checked >= MAX_CANDIDATES:
+                break
+            checked += 1
+            key = self._key(doc_id)
+            if key is None:
+                # বাদ পড়েছে
+                continue
+            other = self._grams(normalize_question(key))
+            score = 2.0 * len(grams & other) / (query_size + len(other))
+            if score > best_score:
+                best_key, best_score = key, score
+
+        if best_key is None or best_score < t:
+            return None
+        return best_key, best_score
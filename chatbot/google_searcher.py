@@ -1,30 +1,67 @@
 # chatbot/google_searcher.py (সরল)
-from googlesearch import search
-import requests
-from bs4 import BeautifulSoup
+import re
+import time
+from .parallel_fetch import fetch_first, DEFAULT_DEADLINE
+from . import http_client
+from .extractor import BanglaTextParser, extract_bangla_sentences
+from .result_cache import SearchCache, MISSING
+from . import metrics
 
 class GoogleSearcher:
-    def search_google(self, query, num_results=3):
-        """সরল গুগল সার্চ"""
+    def __init__(self, cache=None):
+        self.cache = cache or SearchCache()
+    
+    def search_google(self, query, num_results=3, deadline=None):
+        """সরল গুগল সার্চ (URL গুলো একসাথে আনা, প্রথম কাজের উত্তর)"""
         try:
-            results = []
-            for url in search(query + " বাংলায়", num_results=num_results):
-                # কিছু ওয়েবসাইট থেকে কন্টেন্ট নেওয়া
-                content = self.get_web_content(url)
-                results.append({
-                    'url': url,
-                    'content': content[:200] if content else f"'{query}' সম্পর্কিত তথ্য"
-                })
-            return results
+            if deadline is None:
+                deadline = DEFAULT_DEADLINE
+            started = time.monotonic()
+            
+            search_query = query + " বাংলায়"
+            urls = self.cache.get_urls(search_query)
+            if urls is None:
+                from googlesearch import search
+                with metrics.timer(metrics.STAGE_SECONDS, stage='search'):
+                    urls = list(search(search_query, num_results=num_results))
+                self.cache.set_urls(search_query, urls)
+            if not urls:
+                return []
+            
+            # কিছু ওয়েবসাইট থেকে কন্টেন্ট নেওয়া
+            url, content = fetch_first(
+                urls,
+                self.get_cached_content,
+                accept=lambda c: bool(c) and bool(re.search(r'[\u0980-\u09FF]', c)),
+                deadline=deadline - (time.monotonic() - started),
+                fallback=bool
+            )
+            
+            if content:
+                return [{'url': url, 'content': content[:200]}]
+            return [{'url': urls[0], 'content': f"'{query}' সম্পর্কিত তথ্য"}]
         except:
             return []
     
-    def get_web_content(self, url):
+    def get_cached_content(self, url, timeout=5):
+        """ক্যাশ থেকে, না থাকলে ওয়েবসাইট থেকে কন্টেন্ট"""
+        content = self.cache.get_page(url)
+        if content is MISSING:
+            content = self.get_web_content(url, timeout)
+            self.cache.set_page(url, content)
+        return content
+    
+    def get_web_content(self, url, timeout=5):
         """ওয়েবসাইট থেকে কন্টেন্ট"""
         try:
-            response = requests.get(url, timeout=5)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            text = soup.get_text()[:500]  # প্রথম ৫০০ অক্ষর
-            return ' '.join(text.split())  # স্পেস ক্লিন
+            parser = BanglaTextParser(max_sentences=5, min_length=10)
+            with http_client.stream(url, timeout=timeout) as (response, chunks):
+                sentences = extract_bangla_sentences(
+                    chunks,
+                    encoding=http_client.response_encoding(response.headers),
+                    parser=parser
+                )
+            # বাংলা বাক্য, না পেলে প্রথম ৫০০ অক্ষর
+            return ' '.join(sentences)[:500] or parser.head[:500]
         except:
             return None
@@ -0,0 +1,111 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from . import metrics
+
+# সব স্ক্র্যাপারের জন্য একই হেডার
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (BanglaChatBot/1.0; +https://github.com)',
+    'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'bn,en;q=0.8',
+}
+
+POOL_HOSTS = int(os.environ.get('HTTP_POOL_HOSTS', 20))
+POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', 10))
+RETRIES = int(os.environ.get('HTTP_RETRIES', 1))
+BACKOFF = float(os.environ.get('HTTP_BACKOFF', 0.3))
+MAX_BYTES = int(os.environ.get('HTTP_MAX_BYTES', 2 * 1024 * 1024))
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def response_encoding(headers):
+    """Content-Type থেকে charset"""
+    content_type = headers.get('Content-Type', '')
+    if 'charset=' in content_type:
+        return content_type.split('charset=')[-1].split(';')[0].strip().strip('"')
+    # হেডারে charset না থাকলে বাংলা সাইটগুলো প্রায় সবসময় UTF-8
+    return 'utf-8'
+
+
+def _build_session():
+    """হোস্ট প্রতি কানেকশন পুল, keep-alive ও রিট্রাই সহ সেশন"""
+    # requests প্রথম রিকোয়েস্টের সময় লোড হয়, স্টার্টআপে নয়
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=RETRIES,
+        connect=RETRIES,
+        read=RETRIES,
+        backoff_factor=BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_HOSTS,
+        pool_maxsize=POOL_SIZE,
+        max_retries=retry,
+        pool_block=False
+    )
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _get(url, timeout, headers):
+    """GET (হেডার পর্যন্ত), হোস্ট অনুযায়ী সময় ও ফলাফল গোনা"""
+    host = metrics.host_label(url)
+    started = time.perf_counter()
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout, stream=True)
+    except Exception as e:
+        metrics.FETCH_TOTAL.inc(host=host, outcome=type(e).__name__)
+        raise
+    finally:
+        metrics.FETCH_SECONDS.observe(time.perf_counter() - started, host=host)
+    metrics.FETCH_TOTAL.inc(host=host, outcome=f"{response.status_code // 100}xx")
+    return response
+
+
+def get_session():
+    """প্রসেস প্রতি একটি শেয়ার্ড সেশন (fork-এর পর নতুন)"""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = _build_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+def _read(response, max_bytes):
+    """১৬ KB করে চাঙ্ক, মোট max_bytes এর বেশি নয়"""
+    size = 0
+    for chunk in response.iter_content(chunk_size=16 * 1024):
+        if size + len(chunk) >= max_bytes:
+            yield chunk[:max_bytes - size]
+            return
+        size += len(chunk)
+        yield chunk
+
+
+@contextmanager
+def stream(url, timeout=10, headers=None, max_bytes=None):
+    """পেজ ক্রমান্বয়ে পড়া: with stream(url) as (response, chunks)
+
+    chunks মোট max_bytes (HTTP_MAX_BYTES) পর্যন্ত, বাকিটা ডাউনলোডই হয় না।
+    """
+    if max_bytes is None:
+        max_bytes = MAX_BYTES
+
+    response = _get(url, timeout, headers)
+    try:
+        yield response, _read(response, max_bytes)
+    finally:
+        response.close()
@@ -1,16 +0,0 @@
-# চ্যাটবট প্যাকেজ
-from .brain import BengaliChatbot
-from .memory import MemoryManager
-from .safety import SafetyChecker
-from .google_searcher import GoogleSearcher
-from .smart_learner import SmartLearner
-from .web_scraper import WebScraper
-
-__all__ = [
-    'BengaliChatbot',
-    'MemoryManager',
-    'SafetyChecker',
-    'GoogleSearcher',
-    'SmartLearner',
-    'WebScraper'
-]
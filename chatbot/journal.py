@@ -0,0 +1,401 @@
+import json
+import os
+import time
+import threading
+from contextlib import contextmanager
+from .export import iter_json_items
+from .snapshot import SnapshotDict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class KnowledgeJournal:
+    """স্ন্যাপশট JSON + append-only জার্নাল
+
+    প্রতিটি পরিবর্তন জার্নালে এক লাইন হিসেবে যোগ হয়। জার্নাল বড় হলে
+    ব্যাকগ্রাউন্ডে স্ন্যাপশট নতুন করে লেখা হয় (temp ফাইল + rename)।
+    জার্নালের প্রথম লাইনে কোন স্ন্যাপশটের উপর এটি প্রযোজ্য তা লেখা থাকে,
+    তাই কমপ্যাকশনের মাঝে ক্র্যাশ হলেও পুরাতন রেকর্ড দুবার প্রয়োগ হয় না।
+
+    ডিক্ট ডেটা SnapshotDict হিসেবে থাকে: অন্য থ্রেড লক ছাড়াই পড়ে, আর
+    কমপ্যাকশন বদলাবে না এমন স্ন্যাপশট ডিস্কে লেখে (পুরো কপি নয়)।
+
+    একাধিক ওয়ার্কার একই জার্নালে লেখে। refresh() শুধু শেষবার পড়ার পর
+    যোগ হওয়া অংশটুকু পড়ে; অন্য কেউ কমপ্যাক্ট করলে (জার্নালের inode বদলায়)
+    স্ন্যাপশট আবার লোড হয়। <journal>.lock ফাইলে flock: লেখায় shared,
+    কমপ্যাকশনে exclusive।
+    """
+
+    def __init__(self, snapshot_file, compact_every=1000, background=True,
+                 refresh_interval=1.0):
+        self.snapshot_file = snapshot_file
+        self.journal_file = snapshot_file + '.journal'
+        self.lock_file = self.journal_file + '.lock'
+        self.compact_every = compact_every
+        self.background = background
+        self.refresh_interval = refresh_interval
+
+        self.data = None
+        self.pending = 0
+        self._lock = threading.RLock()
+        self._compacting = False
+        self._offset = 0            # জার্নালের কত বাইট পড়া/প্রয়োগ হয়েছে
+        self._generation = None     # (জার্নাল inode, স্ন্যাপশট পরিচয়)
+        self._next_refresh = 0
+
+    # ---------- ওয়ার্কারদের মধ্যে লক ----------
+
+    @contextmanager
+    def _flock(self, exclusive=False):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_file, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    # ---------- লোড ----------
+
+    def _fingerprint(self):
+        """স্ন্যাপশট ফাইলের পরিচয় (size, mtime)"""
+        try:
+            st = os.stat(self.snapshot_file)
+            return [st.st_size, st.st_mtime_ns]
+        except OSError:
+            return None
+
+    def _read_snapshot(self, default):
+        try:
+            if os.path.exists(self.snapshot_file):
+                with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Snapshot load error: {e}")
+        return default
+
+    def load(self, default):
+        """স্ন্যাপশট লোড করে জার্নাল রিপ্লে"""
+        # exclusive: ভাঙা শেষ লাইন কাটার সময় অন্য কেউ যেন লিখতে না থাকে
+        with self._flock(exclusive=True), self._lock:
+            self.data = self._read_snapshot(default)
+            self.pending = self._replay()
+            if isinstance(self.data, dict):
+                self.data = SnapshotDict(self.data)
+            self._next_refresh = time.monotonic() + self.refresh_interval
+            return self.data
+
+    def _replay(self, repair=True):
+        """জার্নাল রেকর্ড প্রয়োগ"""
+        if not os.path.exists(self.journal_file):
+            if repair:
+                self._start_journal()
+            return 0
+
+        count = 0
+        valid_end = 0
+        with open(self.journal_file, 'rb') as f:
+            header = self._parse(f.readline())
+            if not header or header.get('snapshot') != self._fingerprint():
+                # পুরাতন স্ন্যাপশটের জার্নাল, ইতিমধ্যে কমপ্যাক্ট করা
+                f.close()
+                if repair:
+                    self._start_journal()
+                else:
+                    self._offset = os.path.getsize(self.journal_file)
+                    self._generation = self._current_generation()
+                return 0
+            valid_end = f.tell()
+
+            for line in f:
+                record = self._parse(line) if line.endswith(b'\n') else None
+                if record is None:
+                    # অসম্পূর্ণ শেষ লাইন (ক্র্যাশ)
+                    break
+                self._apply(record)
+                count += 1
+                valid_end = f.tell()
+
+        # ভাঙা অংশ কেটে ফেলা, যাতে পরের লাইন ঠিকঠাক যোগ হয়
+        if repair and valid_end < os.path.getsize(self.journal_file):
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(valid_end)
+        self._offset = valid_end
+        self._generation = self._current_generation()
+        return count
+
+    def _parse(self, line):
+        try:
+            return json.loads(line.decode('utf-8'))
+        except ValueError:
+            return None
+
+    def _apply(self, record):
+        op = record.get('op')
+        if op == 'set':
+            self.data[record['key']] = record['value']
+        elif op == 'del':
+            self.data.pop(record['key'], None)
+        elif op == 'append':
+            self.data.append(record['value'])
+
+    def _start_journal(self, tail=b''):
+        """নতুন জার্নাল (হেডার + বাকি রেকর্ড), অ্যাটমিক"""
+        header = (json.dumps({'snapshot': self._fingerprint()}) + '\n').encode('utf-8')
+        tmp = self.journal_file + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(header)
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.journal_file)
+        self._offset = len(header)
+        self._generation = self._current_generation()
+
+    def _current_generation(self):
+        """কমপ্যাকশনে বদলায়; inode একা যথেষ্ট না, পুরাতন inode আবার ব্যবহার হয়"""
+        try:
+            inode = os.stat(self.journal_file).st_ino
+        except OSError:
+            return None
+        return inode, tuple(self._fingerprint() or ())
+
+    # ---------- অন্য ওয়ার্কারের পরিবর্তন ----------
+
+    def maybe_refresh(self):
+        """refresh_interval পার হলে refresh(), নাহলে []"""
+        if time.monotonic() < self._next_refresh:
+            return []
+        return self.refresh()
+
+    def refresh(self):
+        """অন্য প্রসেসের লেখা রেকর্ড প্রয়োগ, বদলানো কী-গুলো ফেরত"""
+        with self._flock(), self._lock:
+            return self._refresh()
+
+    def _refresh(self):
+        self._next_refresh = time.monotonic() + self.refresh_interval
+        generation = self._current_generation()
+        if generation is None:
+            return []
+        if generation != self._generation:
+            return self._reload()
+        if os.path.getsize(self.journal_file) <= self._offset:
+            return []
+
+        changed = []
+        with open(self.journal_file, 'rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # এখনো লেখা হচ্ছে
+                    break
+                self._offset += len(line)
+                record = self._parse(line)
+                if record is None:
+                    continue
+                self._apply(record)
+                self.pending += 1
+                if 'key' in record:
+                    changed.append(record['key'])
+        return changed
+
+    def _reload(self):
+        """কমপ্যাকশনের পর স্ন্যাপশট + নতুন জার্নাল, জায়গাতেই আপডেট"""
+        old = self.data
+        self.data = self._read_snapshot([] if isinstance(old, list) else {})
+        self.pending = self._replay(repair=False)
+        new, self.data = self.data, old
+
+        if isinstance(old, SnapshotDict):
+            current = old.view()
+            changed = [k for k in current if k not in new]
+            changed += [k for k, v in new.items() if k not in current or current[k] != v]
+            # পাঠকেরা হয় পুরাতন নয় নতুন অবস্থা দেখে, মাঝের খালি ডিক্ট নয়
+            old.replace(new)
+            return changed
+
+        old[:] = new
+        return []
+
+    # ---------- এক্সপোর্ট ----------
+
+    def iter_items(self):
+        """এই মুহূর্তের (key, value) স্ট্রিম, লেখা বা কমপ্যাকশন আটকে না রেখে
+
+        লকের ভেতরে শুধু স্ন্যাপশট আর জার্নাল খোলা হয় ও জার্নালের তখনকার
+        সাইজ নেওয়া হয়। পরে কমপ্যাকশন ফাইল বদলালেও খোলা হ্যান্ডেল পুরাতন
+        ফাইলই পড়ে। মেমরিতে থাকে শুধু জার্নালের রেকর্ড (compact_every পর্যন্ত)।
+        """
+        with self._flock(), self._lock:
+            snapshot = open(self.snapshot_file, 'rb') if os.path.exists(self.snapshot_file) else None
+            journal = open(self.journal_file, 'rb') if os.path.exists(self.journal_file) else None
+            end = os.fstat(journal.fileno()).st_size if journal else 0
+            fingerprint = self._fingerprint()
+
+        try:
+            overlay = {}
+            if journal:
+                header = self._parse(journal.readline())
+                if header and header.get('snapshot') == fingerprint:
+                    while journal.tell() < end:
+                        line = journal.readline()
+                        if journal.tell() > end or not line.endswith(b'\n'):
+                            # তখনো লেখা হচ্ছিল
+                            break
+                        record = self._parse(line)
+                        if record and record.get('op') in ('set', 'del'):
+                            overlay[record['key']] = record
+
+            if snapshot:
+                for key, value in iter_json_items(snapshot):
+                    record = overlay.pop(key, None)
+                    if record is None:
+                        yield key, value
+                    elif record['op'] == 'set':
+                        yield key, record['value']
+
+            for key, record in overlay.items():
+                if record['op'] == 'set':
+                    yield key, record['value']
+        finally:
+            if snapshot:
+                snapshot.close()
+            if journal:
+                journal.close()
+
+    # ---------- লেখা ----------
+
+    def _write(self, records):
+        data = ''.join(
+            json.dumps(r, ensure_ascii=False) + '\n' for r in records
+        ).encode('utf-8')
+        # এক write() কলে O_APPEND, তাই অন্য ওয়ার্কারের লাইনের সাথে মিশে যায় না
+        fd = os.open(self.journal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+            end = os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            os.close(fd)
+        # মাঝে অন্য কেউ না লিখলে নিজের লাইন আর পড়তে হবে না
+        if end - len(data) == self._offset:
+            self._offset = end
+        self.pending += len(records)
+
+    def set(self, key, value):
+        """কী সেট"""
+        with self._flock(), self._lock:
+            self.data[key] = value
+            self._write([{'op': 'set', 'key': key, 'value': value}])
+        self.maybe_compact()
+
+    def set_many(self, items):
+        """একসাথে অনেক কী সেট, এক write-এ"""
+        items = list(items)
+        with self._flock(), self._lock:
+            records = [{'op': 'set', 'key': key, 'value': value} for key, value in items]
+            if records:
+                self.data.update(items)
+                self._write(records)
+        self.maybe_compact()
+
+    def delete(self, key):
+        """কী ডিলিট"""
+        with self._flock(), self._lock:
+            self.data.pop(key, None)
+            self._write([{'op': 'del', 'key': key}])
+        self.maybe_compact()
+
+    def append(self, value):
+        """লিস্টে যোগ"""
+        with self._flock(), self._lock:
+            self.data.append(value)
+            self._write([{'op': 'append', 'value': value}])
+        self.maybe_compact()
+
+    # ---------- কমপ্যাকশন ----------
+
+    def maybe_compact(self):
+        """থ্রেশহোল্ড পার হলে কমপ্যাক্ট"""
+        if self.pending < self.compact_every or self._compacting:
+            return
+        if self.background:
+            threading.Thread(target=self.compact, args=(False,), daemon=True).start()
+        else:
+            self.compact(False)
+
+    def compact(self, force=True):
+        """স্ন্যাপশট নতুন করে লেখা, জার্নাল ছোট করা"""
+        with self._lock:
+            if self._compacting:
+                return False
+            self._compacting = True
+
+        # প্রতিটি প্রসেসের আলাদা temp ফাইল
+        tmp = f"{self.snapshot_file}.{os.getpid()}.tmp"
+        try:
+            with self._flock(exclusive=True), self._lock:
+                # অন্য ওয়ার্কার এইমাত্র কমপ্যাক্ট করে থাকলে দরকার নেই
+                self._refresh()
+                if not force and self.pending < self.compact_every:
+                    return False
+                data = self._freeze()
+                offset = self._offset
+                generation = self._generation
+                pending = self.pending
+
+            self._write_snapshot(data, tmp)
+
+            with self._flock(exclusive=True), self._lock:
+                if self._current_generation() != generation:
+                    # মাঝে অন্য ওয়ার্কার কমপ্যাক্ট করেছে
+                    self._discard_snapshot(tmp)
+                    return False
+                self._install_snapshot(tmp)
+
+                # কপির পরে আসা রেকর্ড নতুন জার্নালে রাখা
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(offset)
+                    tail = f.read()
+                consumed = self._offset - offset
+                self._start_journal(tail)
+                self._offset += consumed
+                self.pending -= pending
+                self._compacted(tail[:consumed])
+            return True
+
+        except Exception as e:
+            print(f"Compaction error: {e}")
+            return False
+
+        finally:
+            self._compacting = False
+
+    # ---------- কমপ্যাকশনের ধাপ (সাবক্লাস বদলাতে পারে) ----------
+
+    def _freeze(self):
+        """লেখার জন্য বদলাবে না এমন কপি (লকের ভেতরে)"""
+        if isinstance(self.data, SnapshotDict):
+            return self.data.snapshot()
+        return self.data.copy()
+
+    def _write_snapshot(self, data, tmp):
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _install_snapshot(self, tmp):
+        os.replace(tmp, self.snapshot_file)
+
+    def _discard_snapshot(self, tmp):
+        os.remove(tmp)
+
+    def _compacted(self, records):
+        """নতুন স্ন্যাপশট বসার পর; records = এই প্রসেসের প্রয়োগ করা কিন্তু স্ন্যাপশটে না থাকা লাইন"""
+
@@ -0,0 +1,103 @@
+import os
+import queue
+import atexit
+import threading
+import traceback
+
+
+class LearningQueue:
+    """শেখার কাজ ব্যাকগ্রাউন্ডে চালানো (সীমিত কিউ + একটি ওয়ার্কার থ্রেড)
+
+    কিউ ভরে গেলে submit() put_timeout পর্যন্ত অপেক্ষা করে, তারপর কাজটা
+    কলারের থ্রেডেই চালিয়ে দেয় — কোনো শেখা হারায় না, শুধু ধীর হয়।
+    প্রসেস বন্ধের সময় drain() বাকি কাজ শেষ করে।
+    """
+
+    def __init__(self, maxsize=None, put_timeout=0.5, name='learner'):
+        if maxsize is None:
+            maxsize = int(os.environ.get('LEARN_QUEUE_SIZE', 1000))
+        self.maxsize = maxsize
+        self.put_timeout = put_timeout
+        self.name = name
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+
+        self.processed = 0
+        self.failed = 0
+        self.inline = 0
+
+        atexit.register(self.drain)
+
+    def _ensure_worker(self):
+        """ওয়ার্কার থ্রেড চালু (fork-এর পর নতুন করে)"""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            if self._pid != os.getpid():
+                # fork-এর আগের কিউ এই প্রসেসে অর্থহীন
+                self._queue = queue.Queue(maxsize=self.maxsize)
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._execute(*item)
+            finally:
+                self._queue.task_done()
+
+    def _execute(self, fn, args, kwargs):
+        try:
+            fn(*args, **kwargs)
+            self.processed += 1
+        except Exception:
+            self.failed += 1
+            print(f"Learning task error:\n{traceback.format_exc()}")
+
+    def submit(self, fn, *args, **kwargs):
+        """কাজ কিউতে দেওয়া, True = ব্যাকগ্রাউন্ডে গেছে"""
+        if self._closed:
+            self._execute(fn, args, kwargs)
+            self.inline += 1
+            return False
+
+        self._ensure_worker()
+        try:
+            self._queue.put((fn, args, kwargs), timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            # ব্যাকপ্রেশার: কলার নিজেই চালাবে
+            self._execute(fn, args, kwargs)
+            self.inline += 1
+            return False
+
+    def drain(self, timeout=30):
+        """বাকি কাজ শেষ করে ওয়ার্কার বন্ধ"""
+        if self._closed:
+            return
+        self._closed = True
+
+        thread = self._thread
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "processed": self.processed,
+            "failed": self.failed,
+            "inline": self.inline
+        }
@@ -0,0 +1,81 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """একাধিক শব্দ এক পাসে খোঁজার অটোমাটন
+
+    একবার তৈরি করে যত খুশি লেখায় চালানো যায়। প্রতিটি শব্দের সাথে
+    একটি লেবেল থাকে (যেমন 'banned' বা 'sensitive')।
+    """
+
+    def __init__(self, patterns=None):
+        # নোড: goto (dict), fail, output [(pattern, label)]
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self.size = 0
+
+        if patterns:
+            for pattern, label in patterns:
+                self.add(pattern, label)
+            self.build()
+
+    def add(self, pattern, label=None):
+        """শব্দ যোগ (build() এর আগে)"""
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        self._output[node].append((pattern, label))
+        self.size += 1
+
+    def build(self):
+        """fail লিংক তৈরি (BFS)"""
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+
+        while queue:
+            node = queue.popleft()
+            for char, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                if self._fail[nxt] == nxt:
+                    self._fail[nxt] = 0
+                # fail চেইনের আউটপুট একসাথে রাখা
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def iter_matches(self, text):
+        """(শেষ অবস্থান, শব্দ, লেবেল) — লেখায় যেই ক্রমে আসে"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                for pattern, label in output[node]:
+                    yield i, pattern, label
+
+    def find_all(self, text):
+        """লেবেল অনুযায়ী পাওয়া শব্দ (ক্রম বজায় রেখে, পুনরাবৃত্তি ছাড়া)"""
+        found = {}
+        for _, pattern, label in self.iter_matches(text):
+            hits = found.setdefault(label, [])
+            if pattern not in hits:
+                hits.append(pattern)
+        return found
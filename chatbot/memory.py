@@ -1,86 +1,110 @@
-import json
 import os
-import sqlite3
+import threading
 from datetime import datetime
 from collections import deque
+from .fuzzy_index import QuestionIndex
+from .storage import create_storage
+from .mmap_index import IndexedJournal
+from .stats import LearningStats
+from .trust import TrustBuffer
+from . import metrics
 
 class MemoryManager:
-    def __init__(self):
+    def __init__(self, storage=None):
         self.data_dir = "data"
         os.makedirs(self.data_dir, exist_ok=True)
         
-        # ফাইল পাথ
-        self.knowledge_file = os.path.join(self.data_dir, "knowledge_base.json")
-        self.trust_file = os.path.join(self.data_dir, "user_trust.json")
-        self.log_file = os.path.join(self.data_dir, "learning_log.json")
+        # স্টোরেজ (MEMORY_BACKEND=json|sqlite)
+        self.storage = storage or create_storage(data_dir=self.data_dir)
         
-        # ডেটা লোড
-        self.knowledge_base = self._load_json(self.knowledge_file, {})
-        self.user_trust = self._load_json(self.trust_file, {})
-        self.learning_log = self._load_json(self.log_file, [])
+        # দৈনিক পরিসংখ্যান (লগের সাথে না মিললে লগ থেকে আবার গোনা)
+        self.stats = LearningStats(os.path.join(self.data_dir, "learning_stats.json"))
+        self.stats.sync(self.storage.count_log(), self.storage.iter_log)
         
-        # আনডো বাফার
+        # ফাজি প্রশ্ন ইনডেক্স
+        # FUZZY_INDEX=lazy (প্রথম ফাজি খোঁজায় ব্যাকগ্রাউন্ডে তৈরি) | eager | false; mmap
+        # স্টোরেজে ডিফল্ট বন্ধ, কারণ ইনডেক্স প্রতি ওয়ার্কারের নিজের মেমরিতে থাকে
+        mmap = isinstance(getattr(self.storage, 'knowledge_journal', None), IndexedJournal)
+        fuzzy = os.environ.get('FUZZY_INDEX', 'false' if mmap else 'lazy')
+        self.index = QuestionIndex(
+            threshold=float(os.environ.get('FUZZY_THRESHOLD', 0.8)),
+            enabled=fuzzy != 'false',
+            lazy=fuzzy == 'lazy'
+        )
+        self.index.build(self.storage.iter_questions)
+        
+        # ট্রাস্ট স্কোর মেমরিতে জমিয়ে একসাথে লেখা (TRUST_FLUSH_INTERVAL)
+        self.trust = TrustBuffer(self.storage)
+        
+        # আনডো বাফার (শেখা আর আনডো একটার পর একটা, যাতে পুরাতন উত্তর ঠিক থাকে)
         self.undo_buffer = deque(maxlen=15)
-    
-    def _load_json(self, filepath, default):
-        """JSON লোড"""
-        try:
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except:
-            pass
-        return default
-    
-    def _save_json(self, filepath, data):
-        """JSON সেভ"""
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            return True
-        except:
-            return False
+        self._write_lock = threading.RLock()
     
     def get_response(self, question):
         """উত্তর খোঁজা"""
-        return self.knowledge_base.get(question.lower().strip())
+        question_key = question.lower().strip()
+        self._sync()
+        answer = self.storage.get_answer(question_key)
+        if answer is not None:
+            return answer
+        
+        # কাছাকাছি প্রশ্ন
+        with metrics.timer(metrics.STAGE_SECONDS, stage='fuzzy'):
+            match = self.index.lookup(question_key)
+        if match:
+            return self.storage.get_answer(match[0])
+        return None
+    
+    def _sync(self):
+        """অন্য ওয়ার্কারের শেখা প্রশ্ন ফাজি ইনডেক্সে আনা"""
+        for key in self.storage.refresh():
+            if self.storage.has_question(key):
+                self.index.add(key)
+            else:
+                self.index.remove(key)
     
     def question_exists(self, question):
         """প্রশ্ন আছে কিনা"""
-        return question.lower().strip() in self.knowledge_base
+        return self.storage.has_question(question.lower().strip())
+    
+    def _log(self, entry):
+        """লগে যোগ ও পরিসংখ্যান আপডেট"""
+        self.storage.append_log(entry)
+        self.stats.record(entry)
     
-    def learn_new(self, question, answer, user_id):
+    def learn_new(self, question, answer, user_id, source="manual"):
         """নতুন শেখা"""
         try:
             question_key = question.lower().strip()
             
-            # পুরাতন উত্তর সংরক্ষণ (যদি থাকে)
-            old_answer = self.knowledge_base.get(question_key)
-            
-            self.undo_buffer.append({
-                "question": question_key,
-                "old_answer": old_answer,
-                "new_answer": answer,
-                "user_id": user_id,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # আপডেট
-            self.knowledge_base[question_key] = answer
+            with self._write_lock:
+                # পুরাতন উত্তর সংরক্ষণ (যদি থাকে)
+                old_answer = self.storage.get_answer(question_key)
+                
+                self.undo_buffer.append({
+                    "question": question_key,
+                    "old_answer": old_answer,
+                    "new_answer": answer,
+                    "user_id": user_id,
+                    "source": source,
+                    "timestamp": datetime.now().isoformat()
+                })
+                
+                # আপডেট
+                with metrics.timer(metrics.STAGE_SECONDS, stage='persist'):
+                    self.storage.set_answer(question_key, answer)
+                self.index.add(question_key)
             
             # লগ
-            self.learning_log.append({
+            self._log({
                 "question": question,
                 "answer": answer,
                 "user_id": user_id,
+                "source": source,
                 "timestamp": datetime.now().isoformat(),
                 "action": "learned"
             })
             
-            # সেভ
-            self._save_json(self.knowledge_file, self.knowledge_base)
-            self._save_json(self.log_file, self.learning_log)
-            
             return True
             
         except Exception as e:
@@ -89,56 +113,53 @@ class MemoryManager:
     
     def increase_trust_score(self, user_id, amount=5):
         """ট্রাস্ট বাড়ানো"""
-        current = self.user_trust.get(user_id, 50)
+        current = self.trust.get(user_id, 50)
         new_score = min(100, current + amount)
-        self.user_trust[user_id] = new_score
-        self._save_json(self.trust_file, self.user_trust)
+        self.trust.set(user_id, new_score)
         return new_score
     
     def decrease_trust_score(self, user_id, amount=10):
         """ট্রাস্ট কমানো"""
-        current = self.user_trust.get(user_id, 50)
+        current = self.trust.get(user_id, 50)
         new_score = max(0, current - amount)
-        self.user_trust[user_id] = new_score
-        self._save_json(self.trust_file, self.user_trust)
+        self.trust.set(user_id, new_score)
         return new_score
     
     def get_user_trust_score(self, user_id):
         """ট্রাস্ট স্কোর"""
-        return self.user_trust.get(user_id, 50)
+        return self.trust.get(user_id, 50)
     
     def undo_last_learning(self, user_id):
         """শেষ শেখা বাতিল"""
         try:
-            if not self.undo_buffer:
-                return {
-                    "success": False,
-                    "message": "কোন শেখা জিনিস নেই"
-                }
-            
-            last = self.undo_buffer.pop()
-            
-            if last["old_answer"] is None:
-                # নতুন প্রশ্ন ছিল, ডিলিট
-                del self.knowledge_base[last["question"]]
-            else:
-                # পুরাতন উত্তর রিস্টোর
-                self.knowledge_base[last["question"]] = last["old_answer"]
+            with self._write_lock:
+                if not self.undo_buffer:
+                    return {
+                        "success": False,
+                        "message": "কোন শেখা জিনিস নেই"
+                    }
+                
+                last = self.undo_buffer.pop()
+                
+                if last["old_answer"] is None:
+                    # নতুন প্রশ্ন ছিল, ডিলিট
+                    self.storage.delete_answer(last["question"])
+                    self.index.remove(last["question"])
+                else:
+                    # পুরাতন উত্তর রিস্টোর
+                    self.storage.set_answer(last["question"], last["old_answer"])
             
             # লগ
-            self.learning_log.append({
+            self._log({
                 "question": last["question"],
                 "old_answer": last["new_answer"],
                 "new_answer": last["old_answer"],
                 "user_id": user_id,
+                "source": last.get("source", "manual"),
                 "timestamp": datetime.now().isoformat(),
                 "action": "undid"
             })
             
-            # সেভ
-            self._save_json(self.knowledge_file, self.knowledge_base)
-            self._save_json(self.log_file, self.learning_log)
-            
             # ট্রাস্ট কমানো
             self.decrease_trust_score(user_id, 5)
             
@@ -154,23 +175,21 @@ class MemoryManager:
                 "message": f"ত্রুটি: {str(e)}"
             }
     
-    def get_statistics(self):
+    def get_statistics(self, days=7):
         """পরিসংখ্যান"""
         return {
-            "total_learned": len(self.knowledge_base),
-            "today_learned": self._count_today_learned(),
-            "total_logs": len(self.learning_log),
-            "total_users": len(self.user_trust),
-            "undo_available": len(self.undo_buffer)
+            "total_learned": self.storage.count_knowledge(),
+            "today_learned": self.stats.today_learned(),
+            "total_logs": self.storage.count_log(),
+            "total_users": self.trust.count(),
+            "undo_available": len(self.undo_buffer),
+            "daily": self.stats.series(days)
         }
     
-    def _count_today_learned(self):
-        """আজকের শেখা গণনা"""
-        today = datetime.now().date().isoformat()
-        count = 0
-        
-        for log in self.learning_log:
-            if log.get("timestamp", "").startswith(today) and log.get("action") == "learned":
-                count += 1
-        
-        return count
+    def export(self):
+        """সব জ্ঞান স্ট্রিম (শেখার উৎস সহ)"""
+        return self.storage.iter_export()
+    
+    def get_daily_series(self, days=30):
+        """দৈনিক শেখা/বাতিলের হিসাব"""
+        return self.stats.series(days)
@@ -0,0 +1,300 @@
+import os
+import json
+import time
+import atexit
+import bisect
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# অ্যাপের নিজের data ডিরেক্টরিতে, যাতে একই হোস্টের অন্য ডিপ্লয়মেন্টের ফাইল না মেশে
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.abspath(os.path.join('data', 'metrics')))
+FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+STALE_AFTER = float(os.environ.get('METRICS_STALE', 24 * 3600))
+MAX_HOSTS = int(os.environ.get('METRICS_MAX_HOSTS', 100))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class _Metric:
+    def __init__(self, registry, name, help, labelnames):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.samples = {}       # লেবেলের মান (tuple) -> মান
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    """শুধু বাড়ে এমন গণনা"""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self.registry.touch()
+        with self.registry.lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+
+    def dump(self):
+        return [[list(k), v] for k, v in self.samples.items()]
+
+
+class Histogram(_Metric):
+    """সময়ের বণ্টন (bucket অনুযায়ী গণনা, যোগফল)"""
+
+    type = 'histogram'
+
+    def __init__(self, registry, name, help, labelnames, buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        self.registry.touch()
+        with self.registry.lock:
+            sample = self.samples.get(key)
+            if sample is None:
+                # bucket প্রতি গণনা (+Inf সহ), যোগফল
+                sample = self.samples[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            sample[0][index] += 1
+            sample[1] += value
+
+    def dump(self):
+        return [[list(k), list(counts), total] for k, (counts, total) in self.samples.items()]
+
+
+class Registry:
+    """প্রসেসের মেট্রিক্স; কিছুক্ষণ পরপর METRICS_DIR/<pid>-<token>.json এ লেখা হয়
+
+    /metrics সব ওয়ার্কারের ফাইল যোগ করে দেখায়, তাই gunicorn-এর যেকোনো
+    ওয়ার্কার রিকোয়েস্ট পেলেও পুরো সার্ভারের হিসাব আসে।
+    """
+
+    def __init__(self, directory=METRICS_DIR, flush_interval=FLUSH_INTERVAL):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self._dirty = False
+        self._pid = None
+        self._token = None
+        self._flusher = None
+
+        atexit.register(self.flush)
+
+    def counter(self, name, help, labelnames=()):
+        return self._register(Counter(self, name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, help, labelnames, buckets))
+
+    def _register(self, metric):
+        with self.lock:
+            return self.metrics.setdefault(metric.name, metric)
+
+    # ---------- ফাইলে লেখা ----------
+
+    def touch(self):
+        """নতুন মান যোগের আগে (fork হয়ে থাকলে আগে গণনা খালি)"""
+        if self._pid != os.getpid():
+            self._start_flusher()
+        self._dirty = True
+
+    def _start_flusher(self):
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # fork-এর পর প্যারেন্টের গণনা এই প্রসেসের নয়
+                for metric in self.metrics.values():
+                    metric.samples.clear()
+            self._pid = os.getpid()
+            # pid আবার ব্যবহার হলেও পুরাতন প্রসেসের ফাইল মুছে যায় না
+            self._token = os.urandom(4).hex()
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def _path(self):
+        return os.path.join(self.directory, f"{self._pid}-{self._token}.json")
+
+    def flush(self):
+        """এই প্রসেসের গণনা ফাইলে (অ্যাটমিক)"""
+        if self._pid != os.getpid():
+            return False
+        path = self._path()
+        if not self._dirty:
+            # বদল নেই, শুধু ফাইলটা যেন পুরাতন না দেখায়
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return False
+        with self.lock:
+            self._dirty = False
+            data = {name: metric.dump() for name, metric in self.metrics.items()}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(path + '.tmp', path)
+            return True
+        except OSError as e:
+            print(f"Metrics flush error: {e}")
+            return False
+
+    # ---------- সব ওয়ার্কার মিলিয়ে ----------
+
+    def collect(self):
+        """সব প্রসেসের ফাইল যোগ করে {name: {labels: value}}"""
+        self.flush()
+        totals = {name: {} for name in self.metrics}
+        now = time.time()
+
+        try:
+            filenames = os.listdir(self.directory)
+        except OSError:
+            filenames = []
+
+        for filename in filenames:
+            if not filename.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                if now - os.path.getmtime(path) > STALE_AFTER:
+                    # অনেক আগে বন্ধ হওয়া প্রসেস
+                    os.remove(path)
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            for name, samples in data.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                merged = totals[name]
+                for sample in samples:
+                    key = tuple(sample[0])
+                    if metric.type == 'counter':
+                        merged[key] = merged.get(key, 0) + sample[1]
+                        continue
+                    counts, total = merged.get(key, ([0] * (len(metric.buckets) + 1), 0.0))
+                    if len(sample[1]) != len(counts):
+                        continue
+                    merged[key] = ([a + b for a, b in zip(counts, sample[1])], total + sample[2])
+        return totals
+
+    def render(self):
+        """Prometheus টেক্সট ফরম্যাট"""
+        totals = self.collect()
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for key, value in sorted(totals[name].items()):
+                labels = list(zip(metric.labelnames, key))
+                if metric.type == 'counter':
+                    lines.append(f"{name}{_labels(labels)} {value}")
+                    continue
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {total}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    escaped = (
+        f'{k}="' + str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for k, v in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+registry = Registry()
+
+# উত্তর দিতে মোট সময়, কোথা থেকে উত্তর এলো অনুযায়ী
+RESPONSE_SECONDS = registry.histogram(
+    'chatbot_response_seconds', 'Time to answer a chat message', ['source']
+)
+# প্রতিটি ধাপ: sync, fuzzy, search, download, extract, persist
+STAGE_SECONDS = registry.histogram(
+    'chatbot_stage_seconds', 'Time spent per stage', ['stage']
+)
+FETCH_SECONDS = registry.histogram(
+    'chatbot_fetch_seconds', 'Time to response headers per target host', ['host']
+)
+FETCH_TOTAL = registry.counter(
+    'chatbot_fetch_total', 'Page fetches per target host and outcome', ['host', 'outcome']
+)
+# পেজ ক্যাশ: fresh (নেটওয়ার্ক নয়), revalidated (304), miss (ডাউনলোড ও পার্স), error
+PAGE_CACHE_TOTAL = registry.counter(
+    'chatbot_page_cache_total', 'Page cache lookups per outcome', ['outcome']
+)
+# প্রিওয়ার্মে খোঁজা প্রশ্নের ফলাফল: google, none, limited, skipped
+PREWARM_TOTAL = registry.counter(
+    'chatbot_prewarm_total', 'Prewarmed questions per outcome', ['outcome']
+)
+# কোটার কারণে বাদ পড়া সার্চ: disabled, user, busy, global, daily
+SEARCH_LIMITED = registry.counter(
+    'chatbot_search_limited_total', 'Searches skipped by the quota per reason', ['reason']
+)
+
+_hosts = set()
+
+
+def host_label(url):
+    """টার্গেট হোস্ট (বেশি হোস্ট হলে 'other', যাতে লেবেল অসীম না হয়)"""
+    host = urlsplit(url).hostname or ''
+    if host in _hosts:
+        return host
+    if len(_hosts) < MAX_HOSTS:
+        _hosts.add(host)
+        return host
+    return 'other'
+
+
+@contextmanager
+def timer(histogram, **labels):
+    """with timer(STAGE_SECONDS, stage='search'): ..."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started, **labels)
+
+
+def render():
+    return registry.render()
+
+
+def clear(directory=METRICS_DIR):
+    """আগের চালুর সব প্রসেস ফাইল মুছে ফেলা (gunicorn on_starting থেকে)"""
+    try:
+        filenames = os.listdir(directory)
+    except OSError:
+        return
+    for filename in filenames:
+        if filename.endswith('.json') or filename.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(directory, filename))
+            except OSError:
+                pass
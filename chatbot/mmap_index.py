@@ -0,0 +1,391 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import threading
+from array import array
+from collections.abc import MutableMapping
+from .export import iter_json_items
+from .journal import KnowledgeJournal
+from .snapshot import SnapshotDict
+
+# হেডার: magic, এন্ট্রি সংখ্যা, স্লট সংখ্যা, টেবিলের অফসেট, স্ন্যাপশটের (size, mtime_ns)
+_MAGIC = b'BNKIDX01'
+_HEADER = struct.Struct('<8sQQQQQ')
+_RECORDS_AT = 64
+_SLOT = struct.Struct('<QQ')        # কী-এর হ্যাশ, রেকর্ডের অফসেট (0 = খালি)
+_RECORD = struct.Struct('<II')      # কী বাইট, মান বাইট
+
+_DELETED = object()
+_MISSING = object()
+
+
+def _hash(key_bytes):
+    return int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), 'little')
+
+
+class CompiledIndex:
+    """শুধু পড়ার জন্য কম্পাইল করা প্রশ্ন→উত্তর ফাইল, mmap করে পড়া
+
+    ফাইল: হেডার, তারপর রেকর্ড (কী ও JSON মান, UTF-8), শেষে open addressing
+    হ্যাশ টেবিল (হ্যাশ, রেকর্ডের অফসেট)। পাইথন অবজেক্ট হিসেবে কিছুই মেমরিতে
+    থাকে না; সব ওয়ার্কার একই ফাইল mmap করে, তাই পেজগুলো OS-এর page cache
+    এ একবারই থাকে।
+    """
+
+    def __init__(self, mm=None, fingerprint=None):
+        self._mm = mm
+        self.fingerprint = fingerprint
+        if mm is None:
+            self.count = self.slots = self.table_at = 0
+            return
+        magic, self.count, self.slots, self.table_at, size, mtime_ns = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC:
+            raise ValueError("not a knowledge index")
+        self.fingerprint = [size, mtime_ns]
+        self._mask = self.slots - 1
+
+    @classmethod
+    def open(cls, path):
+        """ফাইল mmap করা, না থাকলে বা ভাঙা হলে None"""
+        try:
+            with open(path, 'rb') as f:
+                # ফাইল বন্ধ হলেও ম্যাপিং থাকে; rename হলেও পুরাতন ফাইলই দেখা যায়
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(mm)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    @classmethod
+    def build(cls, path, items, fingerprint):
+        """(key, value) থেকে ইনডেক্স ফাইল লেখা (temp + rename)"""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        hashes = array('Q')
+        offsets = array('Q')
+        with open(tmp, 'wb') as f:
+            f.write(b'\0' * _RECORDS_AT)
+            offset = _RECORDS_AT
+            for key, value in items:
+                key_bytes = key.encode('utf-8')
+                value_bytes = json.dumps(value, ensure_ascii=False).encode('utf-8')
+                f.write(_RECORD.pack(len(key_bytes), len(value_bytes)))
+                f.write(key_bytes)
+                f.write(value_bytes)
+                hashes.append(_hash(key_bytes))
+                offsets.append(offset)
+                offset += _RECORD.size + len(key_bytes) + len(value_bytes)
+
+            # অর্ধেকের বেশি ভরা নয়, যাতে প্রোব ছোট থাকে
+            slots = 8
+            while slots < 2 * len(hashes):
+                slots *= 2
+            mask = slots - 1
+            table = array('Q', bytes(16 * slots))
+            for h, record_at in zip(hashes, offsets):
+                i = h & mask
+                while table[2 * i + 1]:
+                    i = (i + 1) & mask
+                table[2 * i] = h
+                table[2 * i + 1] = record_at
+
+            if sys.byteorder != 'little':
+                table.byteswap()
+            f.write(table.tobytes())
+            size, mtime_ns = fingerprint or (0, 0)
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, len(hashes), slots, offset, size, mtime_ns))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return self.count
+
+    def _find(self, key_bytes, h):
+        """রেকর্ডের অফসেট, না থাকলে 0"""
+        mm = self._mm
+        i = h & self._mask
+        while True:
+            slot_hash, record_at = _SLOT.unpack_from(mm, self.table_at + 16 * i)
+            if not record_at:
+                return 0
+            if slot_hash == h:
+                key_len, _ = _RECORD.unpack_from(mm, record_at)
+                start = record_at + _RECORD.size
+                if mm[start:start + key_len] == key_bytes:
+                    return record_at
+            i = (i + 1) & self._mask
+
+    def get(self, key, default=None):
+        if not self.count:
+            return default
+        key_bytes = key.encode('utf-8')
+        record_at = self._find(key_bytes, _hash(key_bytes))
+        if not record_at:
+            return default
+        key_len, value_len = _RECORD.unpack_from(self._mm, record_at)
+        start = record_at + _RECORD.size + key_len
+        return json.loads(self._mm[start:start + value_len].decode('utf-8'))
+
+    def __contains__(self, key):
+        if not self.count:
+            return False
+        key_bytes = key.encode('utf-8')
+        return bool(self._find(key_bytes, _hash(key_bytes)))
+
+    def _records(self):
+        mm = self._mm
+        offset = _RECORDS_AT
+        while offset < self.table_at:
+            key_len, value_len = _RECORD.unpack_from(mm, offset)
+            start = offset + _RECORD.size
+            yield start, key_len, value_len
+            offset = start + key_len + value_len
+
+    def __iter__(self):
+        mm = self._mm
+        for start, key_len, _ in self._records():
+            yield mm[start:start + key_len].decode('utf-8')
+
+    def items(self):
+        mm = self._mm
+        for start, key_len, value_len in self._records():
+            key = mm[start:start + key_len].decode('utf-8')
+            value = json.loads(mm[start + key_len:start + key_len + value_len].decode('utf-8'))
+            yield key, value
+
+    def hashes(self):
+        """সব কী-এর হ্যাশ (দুই ইনডেক্সের তুলনার জন্য)"""
+        if not self.count:
+            return set()
+        table = array('Q')
+        table.frombytes(self._mm[self.table_at:self.table_at + 16 * self.slots])
+        if sys.byteorder != 'little':
+            table.byteswap()
+        return {h for h, record_at in zip(table[0::2], table[1::2]) if record_at}
+
+    def key_for_hash(self, h):
+        mm = self._mm
+        i = h & self._mask
+        while True:
+            slot_hash, record_at = _SLOT.unpack_from(mm, self.table_at + 16 * i)
+            if not record_at:
+                return None
+            if slot_hash == h:
+                key_len, _ = _RECORD.unpack_from(mm, record_at)
+                start = record_at + _RECORD.size
+                return mm[start:start + key_len].decode('utf-8')
+            i = (i + 1) & self._mask
+
+
+class IndexedDict(MutableMapping):
+    """mmap করা ইনডেক্স (base) + সাম্প্রতিক শেখা (delta, সাধারণ ডিক্ট)
+
+    পড়া লক ছাড়া: (base, delta) একসাথে এক অ্যাট্রিবিউটে থাকে, আর delta
+    নিজেই SnapshotDict। লেখা শুধু delta-তে যায়; পরের কমপ্যাকশনে নতুন base
+    তৈরি হলে delta আবার ছোট হয়।
+    """
+
+    def __init__(self, base):
+        self._state = (base, SnapshotDict())
+        self._size = len(base)
+        self._lock = threading.RLock()
+
+    @property
+    def base(self):
+        return self._state[0]
+
+    def delta_size(self):
+        return len(self._state[1])
+
+    # ---------- পড়া ----------
+
+    def get(self, key, default=None):
+        base, delta = self._state
+        value = delta.get(key, _MISSING)
+        if value is _MISSING:
+            return base.get(key, default)
+        return default if value is _DELETED else value
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        base, delta = self._state
+        value = delta.get(key, _MISSING)
+        if value is _MISSING:
+            return key in base
+        return value is not _DELETED
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for key, _ in self._iter_items(values=False):
+            yield key
+
+    def items(self):
+        return self._iter_items()
+
+    def _iter_items(self, values=True):
+        base, delta = self._state
+        delta = delta.view()
+        if values:
+            records = base.items()
+        else:
+            records = ((key, None) for key in base)
+        for key, value in records:
+            override = delta.get(key, _MISSING)
+            if override is _MISSING:
+                yield key, value
+            elif override is not _DELETED:
+                yield key, override
+        for key in delta:
+            value = delta[key]
+            if value is not _DELETED and key not in base:
+                yield key, value
+
+    # ---------- লেখা ----------
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            if key not in self:
+                self._size += 1
+            self._state[1][key] = value
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self:
+                raise KeyError(key)
+            self._size -= 1
+            base, delta = self._state
+            if key in base:
+                delta[key] = _DELETED
+            else:
+                delta.pop(key, None)
+
+    def pop(self, key, *default):
+        with self._lock:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                if default:
+                    return default[0]
+                raise KeyError(key)
+            del self[key]
+            return value
+
+    def frozen(self):
+        """কমপ্যাকশনের জন্য বদলাবে না এমন ভিউ"""
+        view = IndexedDict.__new__(IndexedDict)
+        base, delta = self._state
+        view._state = (base, SnapshotDict(delta.snapshot()))
+        view._size = self._size
+        view._lock = None
+        return view
+
+    def rebase(self, base, keep=()):
+        """নতুন base, delta-তে শুধু keep কী-গুলো (base-এ এখনো নেই এমন বদল)"""
+        with self._lock:
+            _, delta = self._state
+            kept = SnapshotDict((key, delta[key]) for key in keep if key in delta)
+            size = len(base)
+            for key, value in kept.items():
+                if value is _DELETED:
+                    size -= key in base
+                elif key not in base:
+                    size += 1
+            self._state = (base, kept)
+            self._size = size
+
+    def swap(self, other):
+        """অন্যটির অবস্থা নিজের করে নেওয়া (একই অবজেক্ট, যাতে রেফারেন্স ঠিক থাকে)"""
+        with self._lock:
+            self._state = other._state
+            self._size = other._size
+
+    def changed_keys(self, other):
+        """other-এর সাথে কোন কী যোগ/বাদ হয়েছে বা delta-তে বদলেছে"""
+        old_base, old_delta = self._state
+        new_base, new_delta = other._state
+        changed = set(old_delta) | set(new_delta)
+        if old_base is not new_base:
+            old_hashes = old_base.hashes()
+            new_hashes = new_base.hashes()
+            changed.update(old_base.key_for_hash(h) for h in old_hashes - new_hashes)
+            changed.update(new_base.key_for_hash(h) for h in new_hashes - old_hashes)
+        changed.discard(None)
+        return list(changed)
+
+
+class IndexedJournal(KnowledgeJournal):
+    """KnowledgeJournal, কিন্তু স্ন্যাপশট মেমরিতে ডিক্ট নয়, mmap ইনডেক্স
+
+    কমপ্যাকশনে স্ন্যাপশট JSON (আগের ফরম্যাটেই) আর তার ইনডেক্স
+    (<snapshot>.idx) একসাথে লেখা হয়। ইনডেক্সে কোন স্ন্যাপশট থেকে তৈরি তা
+    লেখা থাকে; না মিললে (পুরাতন ফাইল, হাতে বদলানো JSON) লোডের সময় JSON
+    স্ট্রিম করে নতুন করে তৈরি হয়। জার্নালের রেকর্ড থাকে delta-তে।
+    """
+
+    def __init__(self, snapshot_file, *args, **kwargs):
+        super().__init__(snapshot_file, *args, **kwargs)
+        self.index_file = os.path.splitext(snapshot_file)[0] + '.idx'
+
+    def _read_snapshot(self, default):
+        fingerprint = self._fingerprint()
+        if fingerprint is None:
+            return IndexedDict(CompiledIndex())
+        index = CompiledIndex.open(self.index_file)
+        if index is None or index.fingerprint != fingerprint:
+            try:
+                with open(self.snapshot_file, 'rb') as f:
+                    CompiledIndex.build(self.index_file, iter_json_items(f), fingerprint)
+            except Exception as e:
+                print(f"Index build error: {e}")
+                return IndexedDict(CompiledIndex())
+            index = CompiledIndex.open(self.index_file)
+        return IndexedDict(index or CompiledIndex())
+
+    def _reload(self):
+        old = self.data
+        self.data = self._read_snapshot(None)
+        self.pending = self._replay(repair=False)
+        new, self.data = self.data, old
+        changed = old.changed_keys(new)
+        old.swap(new)
+        return changed
+
+    def _freeze(self):
+        return self.data.frozen()
+
+    def _write_snapshot(self, data, tmp):
+        # indent=2 ফরম্যাটের মতো প্রতি লাইনে একটি কী, পুরো ডিক্ট না বানিয়ে
+        with open(tmp, 'w', encoding='utf-8') as f:
+            first = True
+            for key, value in data.items():
+                f.write('{\n  ' if first else ',\n  ')
+                f.write(json.dumps(key, ensure_ascii=False) + ': ' + json.dumps(value, ensure_ascii=False))
+                first = False
+            f.write('{}' if first else '\n}')
+            f.flush()
+            os.fsync(f.fileno())
+        st = os.stat(tmp)
+        # rename-এ mtime বদলায় না, তাই temp ফাইলের পরিচয়ই স্ন্যাপশটের পরিচয়
+        CompiledIndex.build(f"{tmp}.idx", data.items(), [st.st_size, st.st_mtime_ns])
+
+    def _install_snapshot(self, tmp):
+        os.replace(f"{tmp}.idx", self.index_file)
+        os.replace(tmp, self.snapshot_file)
+
+    def _discard_snapshot(self, tmp):
+        for path in (f"{tmp}.idx", tmp):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _compacted(self, records):
+        keys = [r['key'] for r in map(self._parse, records.splitlines(True)) if r and 'key' in r]
+        self.data.rebase(CompiledIndex.open(self.index_file) or CompiledIndex(), keys)
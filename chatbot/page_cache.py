@@ -0,0 +1,150 @@
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+from . import http_client
+from . import metrics
+from .extractor import BanglaTextParser, extract_bangla_sentences
+
+CACHE_DIR = os.environ.get(
+    'PAGE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'bangla-chatbot-pages')
+)
+FRESH = float(os.environ.get('PAGE_CACHE_FRESH', 60))
+MAX_FRESH = float(os.environ.get('PAGE_CACHE_MAX_FRESH', 3600))
+MAX_AGE = float(os.environ.get('PAGE_CACHE_MAX_AGE', 24 * 3600))
+
+
+def _max_age(headers):
+    """Cache-Control থেকে max-age (না থাকলে None), no-cache হলে 0 (প্রতিবার যাচাই)"""
+    value = headers.get('Cache-Control', '').lower()
+    if 'no-cache' in value:
+        return 0
+    match = re.search(r'max-age=(\d+)', value)
+    return int(match.group(1)) if match else None
+
+
+class PageCache:
+    """পেজের বাংলা বাক্যের ডিস্ক ক্যাশ, ETag/Last-Modified দিয়ে যাচাই
+
+    প্রতি URL এর জন্য একটি JSON ফাইল: validator হেডার আর এক্সট্র্যাক্ট করা
+    বাক্য (max_sentences/min_length অনুযায়ী)। fresh সময়ের মধ্যে নেটওয়ার্কে
+    যাওয়াই হয় না; তারপর conditional GET, 304 এলে আগের বাক্যই চলে। তাই পেজ
+    না বদলালে আবার ডাউনলোড বা পার্স হয় না। সব ওয়ার্কার একই ডিরেক্টরি
+    শেয়ার করে (temp ফাইল + rename)।
+    """
+
+    def __init__(self, directory=CACHE_DIR, fresh=FRESH, max_age=MAX_AGE):
+        self.directory = directory
+        self.fresh = fresh
+        self.max_age = max_age
+        self._writes = 0
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _load(self, url):
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # হ্যাশ মিললেও URL আলাদা হলে ব্যবহার নয়
+        return entry if entry.get('url') == url else None
+
+    def _save(self, url, entry):
+        path = self._path(url)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Page cache write error: {e}")
+            return
+
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.prune()
+
+    def prune(self):
+        """অনেকদিন না ছোঁয়া ফাইল মুছে ফেলা"""
+        now = time.time()
+        try:
+            filenames = os.listdir(self.directory)
+        except OSError:
+            return
+        for filename in filenames:
+            path = os.path.join(self.directory, filename)
+            try:
+                if now - os.path.getmtime(path) > self.max_age:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def sentences(self, url, timeout=10, max_sentences=10, min_length=20):
+        """URL এর বাংলা বাক্য (ক্যাশ থেকে, বা conditional GET করে)"""
+        key = f"{max_sentences}:{min_length}"
+        entry = self._load(url)
+        now = time.time()
+
+        if entry and key in entry['sentences'] and now < entry['fresh_until']:
+            metrics.PAGE_CACHE_TOTAL.inc(outcome='fresh')
+            return entry['sentences'][key]
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        with http_client.stream(url, timeout=timeout, headers=headers or None) as (response, chunks):
+            max_age = _max_age(response.headers)
+            fresh = self.fresh if max_age is None else min(max_age, MAX_FRESH)
+
+            if response.status_code == 304 and entry:
+                # পেজ বদলায়নি
+                entry['fresh_until'] = now + fresh
+                if key in entry['sentences']:
+                    metrics.PAGE_CACHE_TOTAL.inc(outcome='revalidated')
+                    self._save(url, entry)
+                    return entry['sentences'][key]
+            else:
+                if response.status_code >= 400:
+                    metrics.PAGE_CACHE_TOTAL.inc(outcome='error')
+                    return []
+                metrics.PAGE_CACHE_TOTAL.inc(outcome='miss')
+                return self._store(url, response, chunks, key, max_sentences, min_length, now + fresh)
+
+        # 304 কিন্তু এই সেটিংসের বাক্য নেই, পুরো পেজ আবার
+        with http_client.stream(url, timeout=timeout) as (response, chunks):
+            if response.status_code >= 400:
+                metrics.PAGE_CACHE_TOTAL.inc(outcome='error')
+                return []
+            metrics.PAGE_CACHE_TOTAL.inc(outcome='miss')
+            return self._store(url, response, chunks, key, max_sentences, min_length,
+                               entry['fresh_until'], entry)
+
+    def _store(self, url, response, chunks, key, max_sentences, min_length, fresh_until, entry=None):
+        parser = BanglaTextParser(max_sentences, min_length)
+        sentences = extract_bangla_sentences(
+            chunks,
+            encoding=http_client.response_encoding(response.headers),
+            parser=parser
+        )
+        if 'no-store' in response.headers.get('Cache-Control', '').lower():
+            # ক্যাশ করা নিষেধ
+            return sentences
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if entry is None or entry.get('etag') != etag or entry.get('last_modified') != last_modified:
+            # পেজ বদলেছে, অন্য সেটিংসের পুরাতন বাক্য বাদ
+            entry = {'url': url, 'etag': etag, 'last_modified': last_modified, 'sentences': {}}
+        entry['fresh_until'] = fresh_until
+        entry['sentences'][key] = sentences
+        self._save(url, entry)
+        return sentences
@@ -0,0 +1,78 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DEFAULT_DEADLINE = float(os.environ.get('SEARCH_DEADLINE', 8))
+MAX_WORKERS = int(os.environ.get('FETCH_WORKERS', 8))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """শেয়ার্ড থ্রেড পুল (fork-এর পর নতুন করে তৈরি)"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_WORKERS,
+                thread_name_prefix='fetch'
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def fetch_first(urls, fetch, accept, deadline=None, fallback=None):
+    """সব URL একসাথে আনা, যেটা আগে কাজের কন্টেন্ট দেয় সেটাই ফেরত
+
+    fetch(url, timeout) কন্টেন্ট ফেরত দেয়। accept(content) সত্য হলে সাথে সাথে
+    (url, content) ফেরত আসে এবং বাকিগুলো বাতিল হয়। কেউ accept না হলে
+    fallback(content) সত্য এমন প্রথম URL (মূল ক্রমে) ফেরত আসে।
+    পুরো কাজ deadline সেকেন্ডের মধ্যে শেষ হয়।
+    """
+    if deadline is None:
+        deadline = DEFAULT_DEADLINE
+    if not urls or deadline <= 0:
+        return None, None
+
+    end = time.monotonic() + deadline
+
+    def run(url):
+        # কিউতে অপেক্ষার পর যতটুকু সময় বাকি, ততটুকুই timeout
+        return fetch(url, max(0.5, end - time.monotonic()))
+
+    pool = get_executor()
+    futures = {pool.submit(run, url): url for url in urls}
+    done_results = {}
+
+    try:
+        pending = set(futures)
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    content = future.result()
+                except Exception:
+                    continue
+                url = futures[future]
+                if accept(content):
+                    return url, content
+                done_results[url] = content
+
+    finally:
+        # বাকিগুলো বাতিল (চলমান রিকোয়েস্ট নিজের timeout-এ শেষ হবে)
+        for future in futures:
+            future.cancel()
+
+    if fallback:
+        for url in urls:
+            content = done_results.get(url)
+            if content is not None and fallback(content):
+                return url, content
+    return None, None
@@ -0,0 +1,138 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from . import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class Prewarmer:
+    """ফাঁকা সময়ে সবচেয়ে বেশি miss হওয়া প্রশ্ন আগেই খুঁজে শেখা
+
+    প্রতি interval সেকেন্ডে দেখে শেষ idle সেকেন্ডে কোনো প্রশ্ন এসেছে কিনা;
+    না এলে QueryStats-এর শীর্ষ miss থেকে batch টা প্রশ্ন resolve(question)
+    দিয়ে খোঁজে। resolve() ফলাফলের dict দেয় (app-এর search_and_learn)।
+    থ্রেড চালু হয়েই (ওয়ার্কারের প্রথম রিকোয়েস্টে) আগের সেভ করা তালিকা থেকে
+    একবার চালায়, ব্যস্ততা না দেখে।
+
+    সব ওয়ার্কারের মধ্যে একটিই পাস চালায়: lock_file এ non-blocking flock
+    আর শেষ পাসের সময় লেখা থাকে, interval এর মধ্যে কেউ চালিয়ে থাকলে বাকিরা
+    বাদ দেয় (বুট বা ওয়ার্কার রিসাইকেলে একই সার্চ বারবার হয় না)। পাসের
+    শুরুতে refresh() দিয়ে অন্য ওয়ার্কারের শেখা জ্ঞান আনা হয়।
+    """
+
+    def __init__(self, stats, resolve, is_known, allowed=None, refresh=None,
+                 interval=None, idle=None, batch=None, lock_file=None):
+        env = os.environ.get
+        self.stats = stats
+        self.resolve = resolve
+        self.is_known = is_known
+        self.allowed = allowed or (lambda: True)
+        self.refresh = refresh
+        self.lock_file = lock_file or env('PREWARM_LOCK', 'prewarm.lock')
+        self.interval = interval if interval is not None else float(env('PREWARM_INTERVAL', 60))
+        self.idle = idle if idle is not None else float(env('PREWARM_IDLE', 5))
+        self.batch = batch if batch is not None else int(env('PREWARM_BATCH', 5))
+        self.min_count = int(env('PREWARM_MIN_COUNT', 2))
+
+        self.runs = 0
+        self.resolved = 0
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        """ব্যাকগ্রাউন্ড থ্রেড (fork-এর পর প্রতিটি ওয়ার্কারে নতুন করে)"""
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='prewarm', daemon=True).start()
+
+    def _run(self):
+        pid = os.getpid()
+        first = True
+        while self._pid == pid:
+            if first or self.stats.idle_for() >= self.idle:
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Prewarm error: {e}")
+            first = False
+            time.sleep(self.interval)
+
+    @contextmanager
+    def _claim(self):
+        """এই পাস চালানোর অধিকার (অন্য ওয়ার্কার চালাচ্ছে বা সম্প্রতি চালিয়েছে হলে False)"""
+        if fcntl is None:
+            yield True
+            return
+        with open(self.lock_file, 'a+') as f:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            try:
+                f.seek(0)
+                try:
+                    last = float(f.read().strip() or 0)
+                except ValueError:
+                    last = 0.0
+                now = time.time()
+                # সবার ঘুমের সময় একটু এদিক-ওদিক হয়, তাই পুরো interval নয়
+                if now - last < self.interval * 0.9:
+                    yield False
+                    return
+                f.seek(0)
+                f.truncate()
+                f.write(str(now))
+                f.flush()
+                yield True
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def run_once(self):
+        """শীর্ষ miss থেকে batch টা প্রশ্ন খোঁজা, কতগুলো শেখা হলো তা ফেরত"""
+        with self._claim() as claimed:
+            if not claimed:
+                return 0
+            return self._run_pass()
+
+    def _run_pass(self):
+        self.runs += 1
+        if self.refresh:
+            self.refresh()
+        learned = 0
+        attempts = 0
+        for key, count, question in self.stats.top('miss', self.batch * 2):
+            if attempts >= self.batch or count < self.min_count:
+                break
+            if not self.allowed():
+                metrics.PREWARM_TOTAL.inc(outcome='skipped')
+                break
+            # তালিকা থেকে বাদ, পেলে পরেরবার hit, না পেলে আবার miss হলে ফিরবে
+            self.stats.discard_miss(key)
+            if self.is_known(question):
+                continue
+            attempts += 1
+            result = self.resolve(question)
+            outcome = 'limited' if result.get('limited') else result.get('source', 'none')
+            metrics.PREWARM_TOTAL.inc(outcome=outcome)
+            if result.get('learned'):
+                learned += 1
+        self.resolved += learned
+        return learned
+
+    def stats_dict(self):
+        return {
+            'runs': self.runs,
+            'resolved': self.resolved,
+            'interval': self.interval,
+            'running': self._pid == os.getpid()
+        }
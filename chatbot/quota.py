@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def _env_float(name, default):
+    return float(os.environ.get(name, default))
+
+
+class TokenBucket:
+    """rate টোকেন/সেকেন্ড হারে ভরে, সর্বোচ্চ capacity টা জমে"""
+
+    def __init__(self, rate, capacity, tokens=None, updated=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity if tokens is None else tokens
+        self.updated = time.time() if updated is None else updated
+
+    def _fill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now=None):
+        self._fill(time.time() if now is None else now)
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def refund(self):
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def level(self, now=None):
+        self._fill(time.time() if now is None else now)
+        return self.tokens
+
+    def wait_time(self, now=None):
+        """পরের টোকেন আসতে কত সেকেন্ড"""
+        missing = 1 - self.level(now)
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float('inf')
+
+
+class SearchQuota:
+    """বাইরের সার্চের বাজেট
+
+    ক্রম অনুযায়ী চেক:
+        ENABLE_WEB_SEARCH       false হলে কখনো সার্চ নয়
+        ইউজার token bucket      USER_SEARCH_PER_MIN, USER_SEARCH_BURST (প্রসেসের ভেতরে)
+        একসাথে চলা সার্চ        MAX_INFLIGHT_SEARCHES (প্রসেসের ভেতরে)
+        গ্লোবাল token bucket    SEARCH_PER_MIN, SEARCH_BURST (সব ওয়ার্কার মিলে)
+        দৈনিক সীমা              MAX_SEARCH_PER_DAY, 0 = সীমা নেই (সব ওয়ার্কার মিলে)
+
+    গ্লোবাল bucket আর দৈনিক গণনা QUOTA_FILE এ থাকে, flock দিয়ে সব
+    gunicorn ওয়ার্কার একই হিসাব দেখে এবং রিস্টার্টেও হারায় না। বাজেট শেষ
+    হলে acquire() সাথে সাথে কারণ ফেরত দেয়, অপেক্ষা করে না।
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('QUOTA_FILE', 'search_quota.json')
+        self.lock_file = self.path + '.lock'
+        self.enabled = os.environ.get('ENABLE_WEB_SEARCH', 'true').lower() == 'true'
+        self.daily_limit = int(os.environ.get('MAX_SEARCH_PER_DAY', 50))
+
+        self.rate = _env_float('SEARCH_PER_MIN', 30) / 60
+        self.burst = _env_float('SEARCH_BURST', 5)
+        self.user_rate = _env_float('USER_SEARCH_PER_MIN', 5) / 60
+        self.user_burst = _env_float('USER_SEARCH_BURST', 3)
+        self.max_users = int(os.environ.get('QUOTA_MAX_USERS', 10000))
+        self.max_inflight = int(os.environ.get('MAX_INFLIGHT_SEARCHES', 4))
+
+        self._users = OrderedDict()     # user_id -> TokenBucket (LRU)
+        self._lock = threading.Lock()
+        self._inflight = threading.BoundedSemaphore(self.max_inflight)
+
+        # শেষবার ফাইল থেকে দেখা অবস্থা (হেডারের জন্য, প্রতি রিকোয়েস্টে ফাইল না পড়ে)
+        self._state = None
+        self._state_at = 0
+        self._exhausted_day = None
+
+    # ---------- শেয়ার্ড অবস্থা ----------
+
+    @contextmanager
+    def _flock(self, exclusive):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_file, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _read(self, today):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        if state.get('day') != today:
+            # নতুন দিন, দৈনিক গণনা শূন্য (bucket আগের মতোই)
+            state = dict(state, day=today, used=0)
+        state.setdefault('tokens', self.burst)
+        state.setdefault('updated', time.time())
+        return state
+
+    def _write(self, state):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+    def _remember(self, state):
+        self._state = state
+        self._state_at = time.monotonic()
+        if self.daily_limit and state['used'] >= self.daily_limit:
+            self._exhausted_day = state['day']
+
+    def _take_shared(self, today):
+        """গ্লোবাল bucket আর দৈনিক গণনা থেকে একটি সার্চ নেওয়া"""
+        with self._flock(exclusive=True):
+            state = self._read(today)
+            if self.daily_limit and state['used'] >= self.daily_limit:
+                self._remember(state)
+                return 'daily'
+            bucket = TokenBucket(self.rate, self.burst, state['tokens'], state['updated'])
+            if not bucket.take():
+                self._remember(state)
+                return 'global'
+            state.update(used=state['used'] + 1, tokens=bucket.tokens, updated=bucket.updated)
+            try:
+                self._write(state)
+            except OSError as e:
+                # ফাইল লেখা না গেলে সার্চ আটকানো হয় না
+                print(f"Quota write error: {e}")
+            self._remember(state)
+            return None
+
+    def _shared_state(self, max_age=1.0):
+        today = time.strftime('%Y-%m-%d')
+        state = self._state
+        if state is None or state['day'] != today or time.monotonic() - self._state_at > max_age:
+            with self._flock(exclusive=False):
+                state = self._read(today)
+            self._remember(state)
+        return state
+
+    # ---------- ইউজার ----------
+
+    def _user_bucket(self, user_id):
+        bucket = self._users.get(user_id)
+        if bucket is None:
+            bucket = self._users[user_id] = TokenBucket(self.user_rate, self.user_burst)
+            if len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        return bucket
+
+    # ---------- পাবলিক ----------
+
+    def acquire(self, user_id=None):
+        """সার্চের অনুমতি: None = অনুমতি আছে (শেষে release()), নাহলে কারণ"""
+        if not self.enabled:
+            return 'disabled'
+        today = time.strftime('%Y-%m-%d')
+        if self._exhausted_day == today:
+            return 'daily'
+
+        with self._lock:
+            bucket = self._user_bucket(user_id) if user_id else None
+            if bucket is not None and not bucket.take():
+                return 'user'
+
+        if not self._inflight.acquire(blocking=False):
+            reason = 'busy'
+        else:
+            try:
+                reason = self._take_shared(today)
+            except OSError as e:
+                print(f"Quota error: {e}")
+                reason = None
+            if reason:
+                self._inflight.release()
+            else:
+                return None
+
+        # অনুমতি না পেলে ইউজারের টোকেন ফেরত
+        if bucket is not None:
+            with self._lock:
+                bucket.refund()
+        return reason
+
+    def check(self, user_id=None):
+        """টোকেন না নিয়ে আগাম চেক (একই প্রশ্নের খোঁজায় যোগ দেওয়ার আগে): None বা কারণ"""
+        if not self.enabled:
+            return 'disabled'
+        if self._exhausted_day == time.strftime('%Y-%m-%d'):
+            return 'daily'
+        if user_id:
+            with self._lock:
+                if self._user_bucket(user_id).level() < 1:
+                    return 'user'
+        return None
+
+    def release(self):
+        self._inflight.release()
+
+    def retry_after(self, reason, user_id=None):
+        """কারণ অনুযায়ী আবার চেষ্টার আগে কত সেকেন্ড (Retry-After), সার্চ বন্ধ হলে None"""
+        if reason == 'disabled':
+            return None
+        if reason == 'user' and user_id:
+            with self._lock:
+                return self._user_bucket(user_id).wait_time()
+        if reason == 'global':
+            state = self._shared_state(max_age=0)
+            return TokenBucket(self.rate, self.burst, state['tokens'], state['updated']).wait_time()
+        if reason == 'daily':
+            now = time.localtime()
+            return 24 * 3600 - (now.tm_hour * 3600 + now.tm_min * 60 + now.tm_sec)
+        return 1.0
+
+    def status(self, user_id=None):
+        """বাকি বাজেট (ফাইলের অবস্থা সর্বোচ্চ ১ সেকেন্ড পুরাতন)"""
+        try:
+            state = self._shared_state()
+        except OSError:
+            state = {'used': 0}
+        status = {
+            'enabled': self.enabled,
+            'limit': self.daily_limit,
+            'used': state['used'],
+            'remaining': max(0, self.daily_limit - state['used']) if self.daily_limit else None
+        }
+        if user_id:
+            with self._lock:
+                bucket = self._users.get(user_id)
+                status['user_remaining'] = int(bucket.level()) if bucket else int(self.user_burst)
+        return status
+
+    def headers(self, user_id=None):
+        status = self.status(user_id)
+        headers = {}
+        if status['limit']:
+            headers['X-Search-Quota-Limit'] = str(status['limit'])
+            headers['X-Search-Quota-Remaining'] = str(status['remaining'])
+        if 'user_remaining' in status:
+            headers['X-Search-Quota-User-Remaining'] = str(status['user_remaining'])
+        return headers
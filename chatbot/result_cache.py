@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from .fuzzy_index import normalize_question
+
+MISSING = object()
+
+
+def _sizeof(value):
+    """আনুমানিক মেমরি সাইজ"""
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class TTLCache:
+    """TTL + LRU ক্যাশ, এন্ট্রি সংখ্যা ও মোট বাইট দুটোই সীমিত"""
+
+    def __init__(self, max_entries=5000, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._data = OrderedDict()   # key -> (expires_at, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=MISSING):
+        """মান, মেয়াদ শেষ বা না থাকলে default"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+
+            expires_at, value, size = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self._bytes -= size
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl):
+        """মান রাখা"""
+        size = _sizeof(key) + _sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+            self._data[key] = (time.monotonic() + ttl, value, size)
+            self._bytes += size
+
+            # পুরাতনগুলো বাদ (LRU)
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, old_size) = self._data.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+class SearchCache:
+    """ওয়েব খোঁজার ক্যাশ: সার্চ URL, পেজের নির্যাস আর ব্যর্থ প্রশ্ন"""
+
+    def __init__(self, url_ttl=None, page_ttl=None, negative_ttl=None,
+                 max_entries=None, max_bytes=None):
+        env = os.environ.get
+        self.url_ttl = url_ttl if url_ttl is not None else float(env('CACHE_URL_TTL', 3600))
+        self.page_ttl = page_ttl if page_ttl is not None else float(env('CACHE_PAGE_TTL', 1800))
+        self.negative_ttl = negative_ttl if negative_ttl is not None else float(env('CACHE_NEGATIVE_TTL', 300))
+
+        max_entries = max_entries or int(env('CACHE_MAX_ENTRIES', 5000))
+        max_bytes = max_bytes or int(env('CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+        # মেমরি সীমা তিন ভাগে ভাগ
+        self.urls = TTLCache(max_entries, max_bytes // 4)
+        self.pages = TTLCache(max_entries, max_bytes // 2)
+        self.negative = TTLCache(max_entries, max_bytes // 4)
+
+    # ---------- সার্চ URL ----------
+
+    def get_urls(self, query):
+        return self.urls.get(query, None)
+
+    def set_urls(self, query, urls):
+        self.urls.set(query, list(urls), self.url_ttl)
+
+    # ---------- পেজ নির্যাস (None = পেজে কিছু নেই) ----------
+
+    def get_page(self, url):
+        return self.pages.get(url)
+
+    def set_page(self, url, content):
+        ttl = self.page_ttl if content else self.negative_ttl
+        self.pages.set(url, content, ttl)
+
+    # ---------- উত্তর না পাওয়া প্রশ্ন ----------
+
+    def is_negative(self, question):
+        return self.negative.get(normalize_question(question), False)
+
+    def set_negative(self, question):
+        self.negative.set(normalize_question(question), True, self.negative_ttl)
+
+    def stats(self):
+        return {
+            "urls": self.urls.stats(),
+            "pages": self.pages.stats(),
+            "negative": self.negative.stats()
+        }
@@ -1,7 +1,14 @@
 import re
+import os
+import json
+from .matcher import AhoCorasick
+
+# HTML ট্যাগ আর অনুমোদিত নয় এমন ক্যারেক্টার এক পাসে
+_STRIP_RE = re.compile(r'<[^>]+>|[^\w\u0980-\u09FF\s.,!?-]')
+_URL_RE = re.compile(r'http[s]?://')
 
 class SafetyChecker:
-    def __init__(self):
+    def __init__(self, lists_file=None):
         self.banned_words = [
             "মিথ্যা", "গুজব", "অপপ্রচার", "ঘৃণা", "বিদ্বেষ",
             "অশ্লীল", "অভদ্র", "খারাপ", "ভুল", "বানোয়াট",
@@ -15,6 +22,39 @@ class SafetyChecker:
         
         self.min_answer_length = 3
         self.max_answer_length = 1000
+        
+        # বড় তালিকা ফাইল থেকে (JSON: banned_words, sensitive_topics)
+        self.lists_file = lists_file or os.environ.get('SAFETY_LISTS_FILE')
+        if self.lists_file and os.path.exists(self.lists_file):
+            self.reload(self.lists_file)
+        else:
+            self._compile()
+    
+    def _compile(self):
+        """তালিকা থেকে অটোমাটন তৈরি"""
+        patterns = [(w.lower(), 'banned') for w in self.banned_words]
+        patterns += [(t.lower(), 'sensitive') for t in self.sensitive_topics]
+        
+        # তালিকার ক্রম মনে রাখা, যাতে রিপোর্ট আগের মতোই হয়
+        self._rank = {}
+        for i, (pattern, label) in enumerate(patterns):
+            self._rank.setdefault((pattern, label), i)
+        self._matcher = AhoCorasick(patterns)
+    
+    def reload(self, path=None):
+        """ফাইল থেকে তালিকা আবার লোড"""
+        path = path or self.lists_file
+        with open(path, 'r', encoding='utf-8') as f:
+            lists = json.load(f)
+        
+        self.banned_words = list(lists.get('banned_words', self.banned_words))
+        self.sensitive_topics = list(lists.get('sensitive_topics', self.sensitive_topics))
+        self.lists_file = path
+        self._compile()
+        return {
+            "banned_words": len(self.banned_words),
+            "sensitive_topics": len(self.sensitive_topics)
+        }
     
     def check_content(self, question, answer):
         """কন্টেন্ট চেক"""
@@ -41,22 +81,25 @@ class SafetyChecker:
                 "can_override": True
             }
         
-        # নিষিদ্ধ শব্দ
+        # নিষিদ্ধ শব্দ ও সেনসিটিভ টপিক, এক পাসে
         text_lower = (question + " " + answer).lower()
+        found = self._matcher.find_all(text_lower)
+        rank = self._rank
         
-        for word in self.banned_words:
-            if word in text_lower:
-                return {
-                    "safe": False,
-                    "reason": f"নিষিদ্ধ শব্দ পাওয়া গেছে: '{word}'",
-                    "can_override": False
-                }
+        banned = found.get('banned')
+        if banned:
+            word = min(banned, key=lambda w: rank[(w, 'banned')])
+            return {
+                "safe": False,
+                "reason": f"নিষিদ্ধ শব্দ পাওয়া গেছে: '{word}'",
+                "can_override": False
+            }
         
         # সেনসিটিভ টপিক সতর্কতা
-        warning_topics = []
-        for topic in self.sensitive_topics:
-            if topic in text_lower:
-                warning_topics.append(topic)
+        warning_topics = sorted(
+            found.get('sensitive', []),
+            key=lambda t: rank[(t, 'sensitive')]
+        )
         
         if warning_topics:
             return {
@@ -67,7 +110,7 @@ class SafetyChecker:
             }
         
         # URL/লিংক চেক
-        if re.search(r'http[s]?://', answer):
+        if _URL_RE.search(answer):
             return {
                 "safe": True,
                 "reason": "উত্তরে লিংক পাওয়া গেছে",
@@ -82,15 +125,21 @@ class SafetyChecker:
             "can_override": False
         }
     
+    def check_many(self, items):
+        """একসাথে অনেক (question, answer) চেক, ইনপুটের ক্রমে ফলাফল"""
+        results = []
+        for item in items:
+            if isinstance(item, dict):
+                question, answer = item.get('question', ''), item.get('answer', '')
+            else:
+                question, answer = item
+            results.append(self.check_content(question, answer))
+        return results
+    
     def sanitize_text(self, text):
         """টেক্সট পরিষ্কার"""
-        # HTML ট্যাগ রিমুভ
-        text = re.sub(r'<[^>]+>', '', text)
+        # HTML ট্যাগ ও বিশেষ ক্যারেক্টার রিমুভ (এক পাসে)
+        text = _STRIP_RE.sub('', text)
         
         # এক্সট্রা স্পেস
-        text = ' '.join(text.split())
-        
-        # বিশেষ ক্যারেক্টার লিমিট
-        text = re.sub(r'[^\w\u0980-\u09FF\s.,!?-]', '', text)
-        
-        return text.strip()
+        return ' '.join(text.split())
@@ -0,0 +1,331 @@
+import os
+import re
+import gzip
+import json
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_SEGMENT_RE = re.compile(r'^log-(\d{8})-(\d{4})\.jsonl(\.gz)?$')
+
+
+class SegmentedLog:
+    """JSON Lines সেগমেন্টে ভাগ করা লগ
+
+    শুধু সক্রিয় সেগমেন্ট append-এর জন্য খোলা থাকে। সাইজ বা দিন পার হলে
+    নতুন সেগমেন্ট শুরু হয় আর পুরাতনটা ব্যাকগ্রাউন্ডে gzip হয়।
+    iter_entries() সময়সীমা ধরে এন্ট্রিগুলো স্ট্রিম করে, পুরো লগ মেমরিতে আনে না।
+
+    একাধিক প্রসেস (gunicorn ওয়ার্কার) একই লগে লেখে: প্রতিটি append,
+    রোটেশন আর segments.json লেখা segments.lock ধরে হয়। সক্রিয় সেগমেন্টের
+    নাম segments.json এ থাকে, অন্য প্রসেস রোটেট করলে পরের append আগে
+    সেটা দেখে নতুন ফাইল খোলে। বন্ধ সেগমেন্ট মুছে ফেলাও লক ধরে, তাই কেউ
+    মুছে ফেলা ফাইলে লেখে না।
+    """
+
+    def __init__(self, log_dir, max_segment_bytes=4 * 1024 * 1024,
+                 rotate_daily=True, compress=True):
+        self.log_dir = log_dir
+        self.max_segment_bytes = max_segment_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        self.index_file = os.path.join(self.log_dir, 'segments.json')
+        self.lock_file = os.path.join(self.log_dir, 'segments.lock')
+        self._lock = threading.RLock()
+        self._handle = None
+        self._handle_pid = None
+        self._handle_name = None
+        self._active = None         # সক্রিয় সেগমেন্টের নাম (এক্সটেনশন ছাড়া)
+        self._closed_counts = {}    # বন্ধ সেগমেন্ট -> এন্ট্রি সংখ্যা
+        self._index_stat = None
+        self._counted = (None, 0, 0)  # সক্রিয় সেগমেন্টের (নাম, অফসেট, লাইন) কতদূর গোনা
+        self._compressing = []
+
+        self._open_existing()
+
+    @contextmanager
+    def _flock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_file, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    # ---------- সেগমেন্ট তালিকা ----------
+
+    def _segments(self):
+        """(নাম, পাথ) পুরাতন থেকে নতুন; gzip শেষ হলে .gz পাথ"""
+        found = {}
+        for filename in os.listdir(self.log_dir):
+            match = _SEGMENT_RE.match(filename)
+            if not match:
+                continue
+            name = filename.split('.')[0]
+            path = os.path.join(self.log_dir, filename)
+            # .jsonl আর .jsonl.gz দুটো থাকলে gzip সম্পূর্ণ, সেটাই নেওয়া
+            if match.group(3) or name not in found:
+                found[name] = path
+        return sorted(found.items())
+
+    def _path(self, name):
+        return os.path.join(self.log_dir, name + '.jsonl')
+
+    def _open_existing(self):
+        """স্টার্টআপে সেগমেন্ট ও গণনা লোড (যা index-এ নেই তা গুনে যোগ)"""
+        with self._lock, self._flock():
+            has_index = self._load_index()
+            segments = self._segments()
+            if not has_index and segments and not segments[-1][1].endswith('.gz'):
+                # পুরাতন index-এ সক্রিয় সেগমেন্টের নাম ছিল না
+                self._active = segments[-1][0]
+
+            closed = dict(self._closed_counts)
+            for name, path in segments:
+                if name != self._active and name not in closed:
+                    closed[name] = sum(1 for _ in self._read_lines(path))
+            known = {name for name, _ in segments}
+            closed = {name: count for name, count in closed.items() if name in known}
+            if self._active is not None and self._active not in known:
+                self._active = None
+
+            if closed != self._closed_counts or not has_index:
+                self._closed_counts = closed
+                self._save_index()
+
+    def _load_index(self):
+        """segments.json বদলালে আবার পড়া (অন্য প্রসেস রোটেট করেছে); আছে কিনা ফেরত"""
+        try:
+            stat = os.stat(self.index_file)
+        except OSError:
+            return False
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if key == self._index_stat:
+            return True
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self._closed_counts = data.get('segments', {})
+        self._active = data.get('active')
+        self._index_stat = key
+        return 'active' in data
+
+    def _save_index(self):
+        tmp = f"{self.index_file}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'active': self._active, 'segments': self._closed_counts}, f)
+        os.replace(tmp, self.index_file)
+        stat = os.stat(self.index_file)
+        self._index_stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    # ---------- লেখা ----------
+
+    def _new_segment_name(self):
+        today = datetime.now().strftime('%Y%m%d')
+        seq = 1
+        for name, _ in self._segments():
+            day, number = _SEGMENT_RE.match(name + '.jsonl').group(1, 2)
+            if day == today:
+                seq = max(seq, int(number) + 1)
+        return f"log-{today}-{seq:04d}"
+
+    def _needs_rotation(self):
+        if self._active is None:
+            return True
+        if self.rotate_daily and self._active[4:12] != datetime.now().strftime('%Y%m%d'):
+            return True
+        try:
+            return os.path.getsize(self._path(self._active)) >= self.max_segment_bytes
+        except OSError:
+            return False
+
+    def _rotate(self):
+        """সক্রিয় সেগমেন্ট বন্ধ করে নতুন শুরু (লক ধরে)"""
+        self._close_handle()
+        closed = self._active
+        if closed is not None:
+            self._closed_counts[closed] = self._count_active()
+        self._active = self._new_segment_name()
+        # ফাইল আগে তৈরি, যাতে পরের _new_segment_name একই নাম না দেয়
+        open(self._path(self._active), 'a').close()
+        self._save_index()
+
+        if closed is not None and self.compress:
+            thread = threading.Thread(target=self._compress, args=(closed,), daemon=True)
+            thread.start()
+            self._compressing = [t for t in self._compressing if t.is_alive()] + [thread]
+
+    def _compress(self, name):
+        """পুরাতন সেগমেন্ট gzip (temp + rename, তারপর লক ধরে মূল ফাইল মুছে ফেলা)
+
+        বন্ধ সেগমেন্টে আর কেউ লেখে না (লেখার আগে সবাই index দেখে), তাই
+        লকের বাইরে কপি করা যায়।
+        """
+        src = self._path(name)
+        dst = src + '.gz'
+        tmp = f"{dst}.{os.getpid()}.tmp"
+        try:
+            with open(src, 'rb') as f_in, gzip.open(tmp, 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            with self._flock():
+                os.replace(tmp, dst)
+                os.remove(src)
+        except OSError as e:
+            print(f"Log compress error: {e}")
+
+    def _close_handle(self):
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+            self._handle = None
+
+    def _open_handle(self):
+        """সক্রিয় সেগমেন্টের হ্যান্ডেল; fork, রোটেশন বা ফাইল বদলালে নতুন করে খোলা"""
+        path = self._path(self._active)
+        if self._handle is not None:
+            try:
+                same = (
+                    self._handle_pid == os.getpid()
+                    and self._handle_name == self._active
+                    and os.fstat(self._handle.fileno()).st_ino == os.stat(path).st_ino
+                )
+            except OSError:
+                same = False
+            if not same:
+                if self._handle_pid == os.getpid():
+                    self._close_handle()
+                # fork-এর পর প্যারেন্টের হ্যান্ডেল বন্ধ না করে ছেড়ে দেওয়া
+                self._handle = None
+        if self._handle is None:
+            self._handle = open(path, 'a', encoding='utf-8')
+            self._handle_pid = os.getpid()
+            self._handle_name = self._active
+        return self._handle
+
+    def append(self, entry):
+        """একটি এন্ট্রি যোগ"""
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock, self._flock():
+            self._load_index()
+            if self._needs_rotation():
+                self._rotate()
+            handle = self._open_handle()
+            handle.write(line)
+            handle.flush()
+
+    def close(self):
+        with self._lock:
+            if self._handle_pid == os.getpid():
+                self._close_handle()
+            self._handle = None
+            compressing, self._compressing = self._compressing, []
+        # চলতে থাকা gzip শেষ হওয়া পর্যন্ত
+        for thread in compressing:
+            thread.join()
+
+    # ---------- পড়া ----------
+
+    def count(self):
+        with self._lock:
+            self._load_index()
+            return sum(self._closed_counts.values()) + self._count_active()
+
+    def _count_active(self):
+        """সক্রিয় সেগমেন্টের লাইন, আগের বার যতদূর গোনা হয়েছিল তার পর থেকে"""
+        name, offset, count = self._counted
+        if name != self._active:
+            name, offset, count = self._active, 0, 0
+        if name is None:
+            return 0
+        try:
+            with open(self._path(name), 'rb') as f:
+                f.seek(offset)
+                position = offset
+                while True:
+                    chunk = f.read(64 * 1024)
+                    if not chunk:
+                        break
+                    end = chunk.rfind(b'\n')
+                    if end >= 0:
+                        # শুধু সম্পূর্ণ লাইন পর্যন্ত (অর্ধেক লেখা লাইন পরের বার)
+                        count += chunk.count(b'\n')
+                        offset = position + end + 1
+                    position += len(chunk)
+        except OSError:
+            pass
+        self._counted = (name, offset, count)
+        return count
+
+    def _read_lines(self, path):
+        # তালিকা করার পরে _compress মূল ফাইল মুছে থাকলে একই সেগমেন্ট .gz থেকে
+        for candidate in (path,) if path.endswith('.gz') else (path, path + '.gz'):
+            opener = gzip.open if candidate.endswith('.gz') else open
+            try:
+                f = opener(candidate, 'rt', encoding='utf-8')
+            except FileNotFoundError:
+                continue
+            except OSError:
+                return
+            try:
+                with f:
+                    for line in f:
+                        if line.strip():
+                            yield line
+            except OSError:
+                pass
+            return
+
+    @staticmethod
+    def _as_text(value):
+        if value is None or isinstance(value, str):
+            return value
+        return value.isoformat()
+
+    def iter_entries(self, since=None, until=None):
+        """সময়সীমার (since <= timestamp <= until) এন্ট্রি স্ট্রিম"""
+        since = self._as_text(since)
+        until = self._as_text(until)
+        since_day = since[:10].replace('-', '') if since else None
+        until_day = until[:10].replace('-', '') if until else None
+
+        with self._lock:
+            if self._handle is not None and self._handle_pid == os.getpid():
+                self._handle.flush()
+        segments = self._segments()
+
+        for i, (name, path) in enumerate(segments):
+            day = name[4:12]
+            if until_day and day > until_day:
+                break
+            # পরের সেগমেন্ট since-এর আগের দিনে শুরু হলে এটা পুরোটাই আগের
+            if since_day and i + 1 < len(segments) and segments[i + 1][0][4:12] < since_day:
+                continue
+
+            for line in self._read_lines(path):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                timestamp = entry.get('timestamp', '')
+                if since and timestamp < since:
+                    continue
+                if until and timestamp > until:
+                    # until তারিখ হলে সেই দিনের শেষ পর্যন্ত
+                    if len(until) > 10 or timestamp[:10] > until:
+                        continue
+                yield entry
@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.shared = True
+
+
+class SingleFlight:
+    """একই কী-র জন্য একসাথে আসা কাজ একবারই চালানো (একই প্রসেসের থ্রেড)
+
+    প্রথম কলার কাজটা চালায়, বাকিরা তার ফলাফলের জন্য অপেক্ষা করে।
+    do() ফেরত দেয় (result, shared) — shared সত্য মানে অন্যের ফলাফল।
+    shareable(result) মিথ্যা হলে (যেমন কোটায় আটকানো) সেই ফলাফল অন্য কেউ
+    পায় না, অপেক্ষায় থাকা কলাররা নিজেরাই আবার চালায়।
+    """
+
+    def __init__(self, shareable=None):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.shareable = shareable or (lambda result: True)
+
+    def do(self, key, fn, *args, **kwargs):
+        return self._do(key, self.shareable, fn, *args, **kwargs)
+
+    def _do(self, key, shareable, fn, *args, **kwargs):
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+
+            if leader:
+                break
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            if call.shared:
+                return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+            call.shared = shareable(call.result)
+            return call.result, False
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def in_flight(self):
+        return len(self._calls)
+
+
+class FileSingleFlight(SingleFlight):
+    """একাধিক gunicorn ওয়ার্কারের মধ্যে coalescing (ফাইল লক)
+
+    প্রতি ওয়ার্কারে একটি থ্রেডই ফাইল লকের জন্য লাইনে দাঁড়ায়। লিডার কাজ শেষে
+    ফলাফল JSON ফাইলে রেখে যায়, পরের ওয়ার্কার লক পেয়ে সেটাই পড়ে নেয়।
+    ফলাফল অবশ্যই JSON-যোগ্য হতে হবে; shareable নয় এমন ফলাফল ফাইলে রাখা হয় না।
+    """
+
+    def __init__(self, lock_dir=None, result_ttl=30, lock_timeout=30, shareable=None):
+        super().__init__(shareable)
+        self.lock_dir = lock_dir or os.path.join(tempfile.gettempdir(), 'bangla-chatbot-inflight')
+        self.result_ttl = result_ttl
+        self.lock_timeout = lock_timeout
+        self._writes = 0
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+    def do(self, key, fn, *args, **kwargs):
+        if fcntl is None:
+            return super().do(key, fn, *args, **kwargs)
+        (result, shared), waited = self._do(
+            key, lambda pair: self.shareable(pair[0]),
+            self._locked_call, key, fn, args, kwargs
+        )
+        return result, shared or waited
+
+    def _paths(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        base = os.path.join(self.lock_dir, digest)
+        return base + '.lock', base + '.json'
+
+    def _read_result(self, result_path):
+        try:
+            if time.time() - os.path.getmtime(result_path) > self.result_ttl:
+                return None
+            with open(result_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_result(self, result_path, result):
+        try:
+            tmp = f"{result_path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp, result_path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.cleanup()
+
+    def _acquire(self, f):
+        """লক, lock_timeout পার হলে লক ছাড়াই এগোনো"""
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except OSError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.05)
+
+    def _locked_call(self, key, fn, args, kwargs):
+        lock_path, result_path = self._paths(key)
+
+        with open(lock_path, 'a+') as f:
+            locked = self._acquire(f)
+            try:
+                # অন্য ওয়ার্কার একটু আগে শেষ করে থাকলে তার ফলাফল
+                result = self._read_result(result_path)
+                if result is not None:
+                    return result, True
+
+                result = fn(*args, **kwargs)
+                if self.shareable(result):
+                    self._write_result(result_path, result)
+                return result, False
+            finally:
+                if locked:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def cleanup(self):
+        """পুরাতন ফলাফল ফাইল মুছে ফেলা"""
+        now = time.time()
+        for name in os.listdir(self.lock_dir):
+            # লক ফাইল রাখা হয়, কেউ ধরে থাকতে পারে
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.lock_dir, name)
+            try:
+                if now - os.path.getmtime(path) > self.result_ttl:
+                    os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,188 @@
+import os
+import threading
+from collections.abc import Mapping, MutableMapping
+
+MAX_DELTA = int(os.environ.get('SNAPSHOT_MAX_DELTA', 512))
+
+_DELETED = object()
+_MISSING = object()
+
+
+class Snapshot(Mapping):
+    """একটি মুহূর্তের অপরিবর্তনীয় ভিউ: base ডিক্ট + ছোট delta
+
+    তৈরি হওয়ার পর base বা delta কেউ বদলায় না, তাই যেকোনো থ্রেড লক
+    ছাড়াই পড়তে বা iterate করতে পারে।
+    """
+
+    __slots__ = ('base', 'delta', 'size')
+
+    def __init__(self, base, delta, size):
+        self.base = base
+        self.delta = delta
+        self.size = size
+
+    def __getitem__(self, key):
+        value = self.delta.get(key, _MISSING)
+        if value is _MISSING:
+            return self.base[key]
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self.delta.get(key, _MISSING)
+        if value is _MISSING:
+            return self.base.get(key, default)
+        return default if value is _DELETED else value
+
+    def __contains__(self, key):
+        value = self.delta.get(key, _MISSING)
+        if value is _MISSING:
+            return key in self.base
+        return value is not _DELETED
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        # base-এর ক্রম বজায় রেখে (dict আপডেটের মতো), নতুন কী শেষে
+        delta = self.delta
+        for key in self.base:
+            if delta.get(key, _MISSING) is not _DELETED:
+                yield key
+        for key, value in delta.items():
+            if value is not _DELETED and key not in self.base:
+                yield key
+
+    def materialize(self):
+        """delta মিলিয়ে নতুন dict"""
+        if not self.delta:
+            return self.base
+        data = dict(self.base)
+        for key, value in self.delta.items():
+            if value is _DELETED:
+                data.pop(key, None)
+            else:
+                data[key] = value
+        return data
+
+
+class SnapshotDict(MutableMapping):
+    """copy-on-write ডিক্ট: পড়া লক ছাড়া, লেখা একজন করে
+
+    প্রতিটি লেখা নতুন Snapshot তৈরি করে এক অ্যাসাইনমেন্টে বসায়, তাই পাঠক
+    কখনো অর্ধেক বদলানো অবস্থা দেখে না আর iterate করার সময় "dictionary
+    changed size" হয় না। বদলগুলো ছোট delta-তে জমে, max_delta পার হলে base
+    এর নতুন কপিতে মেশানো হয় (পুরো কপি প্রতি max_delta লেখায় একবার)।
+    snapshot() যে dict দেয় তা আর কখনো বদলায় না, লক ছাড়াই ডিস্কে লেখা যায়।
+    """
+
+    def __init__(self, data=None, max_delta=MAX_DELTA):
+        base = dict(data or {})
+        self.max_delta = max_delta
+        self._snap = Snapshot(base, {}, len(base))
+        self._lock = threading.RLock()
+
+    # ---------- পড়া (লক নেই) ----------
+
+    def __getitem__(self, key):
+        return self._snap[key]
+
+    def get(self, key, default=None):
+        return self._snap.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._snap
+
+    def __len__(self):
+        return self._snap.size
+
+    def __iter__(self):
+        return iter(self._snap)
+
+    def __repr__(self):
+        return f"SnapshotDict({len(self)} items)"
+
+    def view(self):
+        """বর্তমান অপরিবর্তনীয় ভিউ (O(1))"""
+        return self._snap
+
+    def snapshot(self):
+        """বর্তমান অবস্থার অপরিবর্তনীয় dict (দরকার হলে delta মিশিয়ে)
+
+        ফেরত পাওয়া dict বদলানো যাবে না।
+        """
+        snap = self._snap
+        if not snap.delta:
+            return snap.base
+        with self._lock:
+            snap = self._snap
+            if snap.delta:
+                snap = self._snap = Snapshot(snap.materialize(), {}, snap.size)
+            return snap.base
+
+    def copy(self):
+        return dict(self.snapshot())
+
+    # ---------- লেখা (এক লেখক) ----------
+
+    def _publish(self, changes):
+        """changes: [(key, value অথবা _DELETED)]"""
+        snap = self._snap
+        delta = dict(snap.delta)
+        size = snap.size
+        for key, value in changes:
+            existed = key in snap.base if key not in delta else delta[key] is not _DELETED
+            if value is _DELETED:
+                if not existed:
+                    continue
+                size -= 1
+                if key in snap.base:
+                    delta[key] = _DELETED
+                else:
+                    del delta[key]
+            else:
+                if not existed:
+                    size += 1
+                delta[key] = value
+
+        snap = Snapshot(snap.base, delta, size)
+        if len(delta) > self.max_delta:
+            snap = Snapshot(snap.materialize(), {}, size)
+        self._snap = snap
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._publish([(key, value)])
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self._snap:
+                raise KeyError(key)
+            self._publish([(key, _DELETED)])
+
+    def pop(self, key, *default):
+        with self._lock:
+            value = self._snap.get(key, _MISSING)
+            if value is _MISSING:
+                if default:
+                    return default[0]
+                raise KeyError(key)
+            self._publish([(key, _DELETED)])
+            return value
+
+    def update(self, other=(), **kwargs):
+        """অনেক কী, একবারে প্রকাশ"""
+        items = other.items() if isinstance(other, Mapping) else other
+        with self._lock:
+            self._publish(list(items) + list(kwargs.items()))
+
+    def replace(self, data):
+        """পুরো বিষয়বস্তু একবারে বদলানো (clear + update এর মাঝের খালি অবস্থা ছাড়া)"""
+        base = dict(data)
+        with self._lock:
+            self._snap = Snapshot(base, {}, len(base))
+
+    def clear(self):
+        self.replace({})
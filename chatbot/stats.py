@@ -0,0 +1,235 @@
+import os
+import json
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def _add(days, entry):
+    day = entry.get("timestamp", "")[:10] or datetime.now().date().isoformat()
+    bucket = days.get(day)
+    if bucket is None:
+        bucket = days[day] = {"learned": 0, "undid": 0, "sources": {}, "users": {}}
+
+    action = entry.get("action", "learned")
+    bucket[action] = bucket.get(action, 0) + 1
+
+    if action == "learned":
+        source = entry.get("source", "manual")
+        bucket["sources"][source] = bucket["sources"].get(source, 0) + 1
+        user_id = entry.get("user_id")
+        if user_id:
+            bucket["users"][user_id] = bucket["users"].get(user_id, 0) + 1
+
+
+def _merge(days, other):
+    """other এর দিনভিত্তিক সংখ্যা days এ যোগ"""
+    for day, extra in other.items():
+        bucket = days.setdefault(day, {"learned": 0, "undid": 0, "sources": {}, "users": {}})
+        for field, value in extra.items():
+            if isinstance(value, dict):
+                counts = bucket.setdefault(field, {})
+                for name, count in value.items():
+                    counts[name] = counts.get(name, 0) + count
+            else:
+                bucket[field] = bucket.get(field, 0) + value
+
+
+class LearningStats:
+    """দিনভিত্তিক শেখার পরিসংখ্যান, লগে যোগ হওয়ার সাথে সাথে আপডেট
+
+    প্রতিদিনের জন্য learned/undid সংখ্যা, সোর্স আর ইউজার অনুযায়ী ভাগ রাখা হয়।
+    ফাইলে কতগুলো লগ এন্ট্রি গোনা হয়েছে (log_count) তাও লেখা থাকে, তাই
+    স্টার্টআপে লগের সাথে না মিললে লগ থেকে আবার তৈরি করা যায়।
+
+    প্রতিটি ওয়ার্কার শুধু শেষ সেভের পরের বৃদ্ধি (pending) মনে রাখে আর সেভের
+    সময় ফাইলের লক (<stats_file>.lock) ধরে ফাইলের সংখ্যার সাথে যোগ করে, তাই
+    সব ওয়ার্কারের হিসাব এক ফাইলে মেলে। days = ফাইল + নিজের pending।
+    """
+
+    def __init__(self, stats_file, save_every=50, save_interval=None):
+        self.stats_file = stats_file
+        self.lock_file = stats_file + '.lock'
+        self.save_every = save_every
+        if save_interval is None:
+            save_interval = float(os.environ.get('STATS_SAVE_INTERVAL', 5))
+        self.save_interval = save_interval
+
+        self.days = {}
+        self.log_count = 0
+        self._pending = {}
+        self._pending_count = 0
+        self._mtime = None
+        self._last_save = time.monotonic()
+        self._lock = threading.Lock()
+
+        atexit.register(self.save)
+
+    @contextmanager
+    def _flock(self, exclusive):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_file, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.stats_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read(self):
+        """ফাইলের (log_count, days), ফাইল না থাকলে None"""
+        if not os.path.exists(self.stats_file):
+            return None
+        with open(self.stats_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('log_count', 0), data.get('days', {})
+
+    def _write(self, log_count, days):
+        tmp = f"{self.stats_file}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"log_count": log_count, "days": days}, f, ensure_ascii=False)
+        os.replace(tmp, self.stats_file)
+        self._mtime = self._file_mtime()
+
+    def _show(self, log_count, days):
+        """ফাইলের হিসাবের সাথে নিজের না-সেভ হওয়া অংশ মিলিয়ে দেখানো"""
+        _merge(days, self._pending)
+        self.days = days
+        self.log_count = log_count + self._pending_count
+
+    # ---------- লোড / তৈরি ----------
+
+    def load(self):
+        """ফাইল থেকে লোড, সফল হলে True"""
+        try:
+            with self._lock:
+                with self._flock(exclusive=False):
+                    mtime = self._file_mtime()
+                    data = self._read()
+                if data is None:
+                    return False
+                self._mtime = mtime
+                self._show(*data)
+                return True
+        except Exception as e:
+            print(f"Stats load error: {e}")
+        return False
+
+    def refresh(self):
+        """অন্য ওয়ার্কার সেভ করলে ফাইল আবার পড়া"""
+        if self._file_mtime() != self._mtime:
+            self.load()
+
+    def sync(self, log_count, iter_log):
+        """লগের সাথে না মিললে লগ থেকে আবার গোনা"""
+        if self.load() and self.log_count == log_count:
+            return False
+        self.rebuild(iter_log())
+        return True
+
+    def rebuild(self, entries):
+        """পুরো লগ থেকে নতুন করে গোনা (স্ট্রিমিং)
+
+        লগে সব ওয়ার্কারের এন্ট্রি থাকে, তাই নিজের pending বাদ যায়।
+        """
+        days = {}
+        count = 0
+        for entry in entries:
+            _add(days, entry)
+            count += 1
+        with self._lock:
+            self._pending = {}
+            self._pending_count = 0
+            try:
+                with self._flock(exclusive=True):
+                    self._write(count, days)
+            except Exception as e:
+                print(f"Stats save error: {e}")
+            self._show(count, days)
+
+    # ---------- আপডেট ----------
+
+    def record(self, entry):
+        """একটি নতুন লগ এন্ট্রি গোনা"""
+        with self._lock:
+            _add(self._pending, entry)
+            _add(self.days, entry)
+            self._pending_count += 1
+            self.log_count += 1
+            should_save = (
+                self._pending_count >= self.save_every
+                or time.monotonic() - self._last_save >= self.save_interval
+            )
+        if should_save:
+            self.save()
+
+    def save(self):
+        """শেষ সেভের পরের বৃদ্ধি ফাইলে যোগ (লক ধরে পড়া-যোগ-অ্যাটমিক লেখা)"""
+        with self._lock:
+            self._last_save = time.monotonic()
+            if not self._pending_count:
+                return True
+            try:
+                with self._flock(exclusive=True):
+                    try:
+                        data = self._read()
+                    except ValueError as e:
+                        # ভাঙা ফাইল, নিজের হিসাব দিয়েই নতুন করে
+                        print(f"Stats load error: {e}")
+                        data = None
+                    log_count, days = data or (0, {})
+                    _merge(days, self._pending)
+                    log_count += self._pending_count
+                    self._write(log_count, days)
+            except Exception as e:
+                print(f"Stats save error: {e}")
+                return False
+            self._pending = {}
+            self._pending_count = 0
+            self._show(log_count, days)
+            return True
+
+    # ---------- পড়া (অন্য ওয়ার্কারের সেভ করা অংশসহ) ----------
+
+    def day(self, date=None):
+        """একদিনের হিসাব"""
+        self.refresh()
+        return self._day(date)
+
+    def _day(self, date=None):
+        date = date or datetime.now().date().isoformat()
+        bucket = self.days.get(date, {})
+        return {
+            "date": date,
+            "learned": bucket.get("learned", 0),
+            "undid": bucket.get("undid", 0),
+            "sources": dict(bucket.get("sources", {})),
+            "users": len(bucket.get("users", {}))
+        }
+
+    def today_learned(self):
+        self.refresh()
+        return self.days.get(datetime.now().date().isoformat(), {}).get("learned", 0)
+
+    def series(self, days=7):
+        """শেষ কয়েকদিনের দৈনিক হিসাব (পুরাতন থেকে নতুন)"""
+        self.refresh()
+        today = datetime.now().date()
+        return [
+            self._day((today - timedelta(days=i)).isoformat())
+            for i in range(days - 1, -1, -1)
+        ]
@@ -0,0 +1,435 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from .journal import KnowledgeJournal
+from .segment_log import SegmentedLog
+from .export import iter_json_items
+from .snapshot import SnapshotDict
+from .mmap_index import IndexedJournal
+
+
+class JsonStorage:
+    """JSON ফাইল স্টোরেজ (ঐচ্ছিক জার্নাল সহ)"""
+
+    def __init__(self, data_dir, journal=True, compact_every=1000, refresh_interval=1.0,
+                 index=False):
+        self.data_dir = data_dir
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        # ফাইল পাথ
+        self.knowledge_file = os.path.join(self.data_dir, "knowledge_base.json")
+        self.trust_file = os.path.join(self.data_dir, "user_trust.json")
+        self.log_file = os.path.join(self.data_dir, "learning_log.json")
+        self.log_dir = os.path.join(self.data_dir, "learning_log")
+
+        # একাধিক থ্রেড থেকে ফাইল লেখা একজন করে (একই temp ফাইল)
+        self._save_lock = threading.RLock()
+
+        # ডেটা লোড ('journal' মোডে প্রতিটি শেখা শুধু এক লাইন যোগ করে);
+        # জ্ঞান SnapshotDict, পাঠক থ্রেড লক ছাড়াই পড়ে। index=True হলে
+        # স্ন্যাপশট mmap করা ইনডেক্স ফাইল (সব ওয়ার্কার শেয়ার করে), মেমরিতে শুধু নতুন শেখা
+        self.knowledge_journal = None
+        if journal:
+            journal_class = IndexedJournal if index else KnowledgeJournal
+            self.knowledge_journal = journal_class(
+                self.knowledge_file, compact_every, refresh_interval=refresh_interval
+            )
+            self.knowledge_base = self.knowledge_journal.load({})
+        else:
+            self.knowledge_base = SnapshotDict(self._load_json(self.knowledge_file, {}))
+        self.user_trust = self._load_json(self.trust_file, {})
+
+        # লগ: দিন/সাইজ অনুযায়ী সেগমেন্ট, পুরাতনগুলো gzip
+        self.learning_log = SegmentedLog(
+            self.log_dir,
+            max_segment_bytes=int(os.environ.get('LOG_SEGMENT_BYTES', 4 * 1024 * 1024))
+        )
+        self._migrate_log()
+
+    def _load_json(self, filepath, default):
+        """JSON লোড"""
+        try:
+            if os.path.exists(filepath):
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Load error ({filepath}): {e}")
+        return default
+
+    def _save_json(self, filepath, data):
+        """JSON সেভ (SnapshotDict হলে তার অপরিবর্তনীয় স্ন্যাপশট)"""
+        try:
+            with self._save_lock:
+                if isinstance(data, SnapshotDict):
+                    data = data.snapshot()
+                tmp = f"{filepath}.{os.getpid()}.tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp, filepath)
+            return True
+        except Exception as e:
+            print(f"Save error ({filepath}): {e}")
+            return False
+
+    def _migrate_log(self):
+        """পুরাতন learning_log.json (+ জার্নাল) একবার সেগমেন্টে সরানো"""
+        if self.learning_log.count() or not (
+            os.path.exists(self.log_file) or os.path.exists(self.log_file + '.journal')
+        ):
+            return
+
+        for entry in KnowledgeJournal(self.log_file).load([]):
+            self.learning_log.append(entry)
+
+        for path in (self.log_file, self.log_file + '.journal'):
+            if os.path.exists(path):
+                os.replace(path, path + '.migrated')
+
+    # ---------- জ্ঞান ----------
+
+    def get_answer(self, question_key):
+        return self.knowledge_base.get(question_key)
+
+    def has_question(self, question_key):
+        return question_key in self.knowledge_base
+
+    def set_answer(self, question_key, answer):
+        if self.knowledge_journal:
+            self.knowledge_journal.set(question_key, answer)
+        else:
+            with self._save_lock:
+                self.knowledge_base[question_key] = answer
+                self._save_json(self.knowledge_file, self.knowledge_base)
+
+    def delete_answer(self, question_key):
+        if self.knowledge_journal:
+            self.knowledge_journal.delete(question_key)
+        else:
+            with self._save_lock:
+                self.knowledge_base.pop(question_key, None)
+                self._save_json(self.knowledge_file, self.knowledge_base)
+
+    def count_knowledge(self):
+        return len(self.knowledge_base)
+
+    def iter_questions(self):
+        # স্ন্যাপশটের উপর iterate, মাঝে লেখা হলেও সমস্যা নেই
+        return iter(self.knowledge_base)
+
+    def iter_export(self):
+        """ডিস্কের স্ন্যাপশট থেকে সব প্রশ্ন-উত্তর, শেষ শেখার লগ (উৎস, ইউজার, সময়) সহ
+
+        SQLiteStorage-এর SQL_EXPORT এর মতো: লগ একবার পড়ে প্রশ্ন প্রতি শুধু
+        শেষ 'learned' এন্ট্রি মনে রাখা হয়।
+        """
+        learned = self._latest_learned()
+        if self.knowledge_journal:
+            items = self.knowledge_journal.iter_items()
+        elif os.path.exists(self.knowledge_file):
+            items = self._iter_file(self.knowledge_file)
+        else:
+            items = iter(())
+        for question, answer in items:
+            record = {"question": question, "answer": answer}
+            if question in learned:
+                record["learned"] = learned[question]
+            yield record
+
+    def _latest_learned(self):
+        """প্রশ্ন -> শেষবার শেখার {source, user_id, timestamp}"""
+        learned = {}
+        for entry in self.learning_log.iter_entries():
+            question = entry.get("question")
+            if entry.get("action", "learned") != "learned" or not isinstance(question, str):
+                continue
+            learned[question.lower().strip()] = {
+                "source": entry.get("source", "manual"),
+                "user_id": entry.get("user_id"),
+                "timestamp": entry.get("timestamp")
+            }
+        return learned
+
+    def _iter_file(self, path):
+        with open(path, 'rb') as f:
+            yield from iter_json_items(f)
+
+    def refresh(self):
+        """অন্য ওয়ার্কারের বদলানো প্রশ্ন (জার্নালের নতুন অংশ থেকে)"""
+        if self.knowledge_journal:
+            return self.knowledge_journal.maybe_refresh()
+        return []
+
+    # ---------- লগ ----------
+
+    def append_log(self, entry):
+        self.learning_log.append(entry)
+
+    def count_log(self):
+        return self.learning_log.count()
+
+    def iter_log(self, since=None, until=None):
+        return self.learning_log.iter_entries(since, until)
+
+    # ---------- ট্রাস্ট ----------
+
+    def get_trust(self, user_id, default):
+        return self.user_trust.get(user_id, default)
+
+    def set_trust(self, user_id, score):
+        self.set_trusts([(user_id, score)])
+
+    def set_trusts(self, items):
+        """অনেক ইউজারের স্কোর, ফাইল একবার লেখা"""
+        self.user_trust.update(items)
+        self._save_json(self.trust_file, self.user_trust)
+
+    def count_users(self):
+        return len(self.user_trust)
+
+    def close(self):
+        self.learning_log.close()
+
+
+class SQLiteStorage:
+    """SQLite (WAL) স্টোরেজ, একাধিক gunicorn ওয়ার্কার একই ফাইল শেয়ার করে"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS knowledge (
+            question TEXT PRIMARY KEY,
+            answer TEXT NOT NULL,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_knowledge_updated ON knowledge(updated_at);
+
+        CREATE TABLE IF NOT EXISTS learning_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question TEXT,
+            action TEXT,
+            user_id TEXT,
+            timestamp TEXT,
+            entry TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_log_timestamp ON learning_log(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_log_question ON learning_log(question);
+
+        CREATE TABLE IF NOT EXISTS user_trust (
+            user_id TEXT PRIMARY KEY,
+            score INTEGER NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    # একই SQL স্ট্রিং বারবার ব্যবহার হয়, তাই sqlite3-এর স্টেটমেন্ট ক্যাশে prepared থাকে
+    SQL_GET = "SELECT answer FROM knowledge WHERE question = ?"
+    SQL_SET = (
+        "INSERT INTO knowledge (question, answer, updated_at) "
+        "VALUES (?, ?, CURRENT_TIMESTAMP) "
+        "ON CONFLICT(question) DO UPDATE SET "
+        "answer = excluded.answer, updated_at = excluded.updated_at"
+    )
+    SQL_DELETE = "DELETE FROM knowledge WHERE question = ?"
+    SQL_EXPORT = (
+        "SELECT k.question, k.answer, k.updated_at, ("
+        "SELECT l.entry FROM learning_log l "
+        "WHERE l.question = k.question AND l.action = 'learned' "
+        "ORDER BY l.id DESC LIMIT 1"
+        ") FROM knowledge k"
+    )
+    SQL_LOG = (
+        "INSERT INTO learning_log (question, action, user_id, timestamp, entry) "
+        "VALUES (?, ?, ?, ?, ?)"
+    )
+    SQL_GET_TRUST = "SELECT score FROM user_trust WHERE user_id = ?"
+    SQL_SET_TRUST = (
+        "INSERT INTO user_trust (user_id, score) VALUES (?, ?) "
+        "ON CONFLICT(user_id) DO UPDATE SET score = excluded.score"
+    )
+
+    def __init__(self, db_path, timeout=10, refresh_interval=1.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._connect().executescript(self.SCHEMA)
+
+        self._seen_at = self._scalar("SELECT MAX(updated_at) FROM knowledge") or ""
+        self._next_refresh = time.monotonic() + refresh_interval
+
+    def _connect(self):
+        """থ্রেড প্রতি একটি কানেকশন (fork-এর পর নতুন)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=64
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _scalar(self, sql, params=()):
+        row = self._connect().execute(sql, params).fetchone()
+        return row[0] if row else None
+
+    # ---------- জ্ঞান ----------
+
+    def get_answer(self, question_key):
+        return self._scalar(self.SQL_GET, (question_key,))
+
+    def has_question(self, question_key):
+        return self.get_answer(question_key) is not None
+
+    def set_answer(self, question_key, answer):
+        self._connect().execute(self.SQL_SET, (question_key, answer))
+
+    def delete_answer(self, question_key):
+        self._connect().execute(self.SQL_DELETE, (question_key,))
+
+    def count_knowledge(self):
+        return self._scalar("SELECT COUNT(*) FROM knowledge")
+
+    def iter_questions(self):
+        cursor = self._connect().execute("SELECT question FROM knowledge")
+        for (question,) in cursor:
+            yield question
+
+    def iter_export(self):
+        """সব প্রশ্ন-উত্তর, শেষ শেখার লগ (উৎস, ইউজার, সময়) সহ
+
+        আলাদা কানেকশনে একটি read ট্রানজ্যাকশন; WAL মোডে এটা এক মুহূর্তের
+        স্ন্যাপশট দেখে আর এর মধ্যে অন্য লেখা আটকায় না।
+        """
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        try:
+            conn.execute("BEGIN")
+            for question, answer, updated_at, entry in conn.execute(self.SQL_EXPORT):
+                record = {"question": question, "answer": answer, "updated_at": updated_at}
+                if entry:
+                    entry = json.loads(entry)
+                    record["learned"] = {
+                        "source": entry.get("source", "manual"),
+                        "user_id": entry.get("user_id"),
+                        "timestamp": entry.get("timestamp")
+                    }
+                yield record
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def refresh(self):
+        """শেষবারের পর যোগ/বদলানো প্রশ্ন (ডিলিট এখানে আসে না)"""
+        now = time.monotonic()
+        if now < self._next_refresh:
+            return []
+        self._next_refresh = now + self.refresh_interval
+
+        rows = self._connect().execute(
+            "SELECT question, updated_at FROM knowledge WHERE updated_at >= ?",
+            (self._seen_at,)
+        ).fetchall()
+        if rows:
+            self._seen_at = max(updated_at for _, updated_at in rows)
+        return [question for question, _ in rows]
+
+    # ---------- লগ ----------
+
+    def append_log(self, entry):
+        self._connect().execute(self.SQL_LOG, (
+            entry.get("question"),
+            entry.get("action"),
+            entry.get("user_id"),
+            entry.get("timestamp"),
+            json.dumps(entry, ensure_ascii=False)
+        ))
+
+    def count_log(self):
+        return self._scalar("SELECT COUNT(*) FROM learning_log")
+
+    def iter_log(self, since=None, until=None):
+        sql = "SELECT entry FROM learning_log"
+        clauses, params = [], []
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since if isinstance(since, str) else since.isoformat())
+        if until:
+            until = until if isinstance(until, str) else until.isoformat()
+            if len(until) == 10:
+                # শুধু তারিখ হলে সেই দিনের শেষ পর্যন্ত
+                until += "T99"
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+
+        cursor = self._connect().execute(sql, params)
+        for (entry,) in cursor:
+            yield json.loads(entry)
+
+    # ---------- ট্রাস্ট ----------
+
+    def get_trust(self, user_id, default):
+        score = self._scalar(self.SQL_GET_TRUST, (user_id,))
+        return default if score is None else score
+
+    def set_trust(self, user_id, score):
+        self._connect().execute(self.SQL_SET_TRUST, (user_id, score))
+
+    def set_trusts(self, items):
+        """অনেক ইউজারের স্কোর, এক ট্রানজ্যাকশনে"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(self.SQL_SET_TRUST, items)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def count_users(self):
+        return self._scalar("SELECT COUNT(*) FROM user_trust")
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def create_storage(backend=None, data_dir="data"):
+    """MEMORY_BACKEND অনুযায়ী স্টোরেজ তৈরি ('json' বা 'sqlite')"""
+    backend = backend or os.environ.get('MEMORY_BACKEND', 'json')
+    refresh_interval = float(os.environ.get('KNOWLEDGE_REFRESH_INTERVAL', 1.0))
+
+    if backend == 'sqlite':
+        db_path = os.environ.get('MEMORY_DB', os.path.join(data_dir, "memory.db"))
+        return SQLiteStorage(
+            db_path,
+            refresh_interval=refresh_interval
+        )
+
+    if backend == 'json':
+        # KNOWLEDGE_STORAGE: 'journal', 'mmap' (জার্নাল + mmap ইনডেক্স) বা 'json'
+        mode = os.environ.get('KNOWLEDGE_STORAGE', 'journal')
+        return JsonStorage(
+            data_dir,
+            journal=mode in ('journal', 'mmap'),
+            compact_every=int(os.environ.get('JOURNAL_COMPACT_EVERY', 1000)),
+            refresh_interval=refresh_interval,
+            index=mode == 'mmap'
+        )
+
+    raise ValueError(f"অজানা স্টোরেজ: {backend}")
@@ -0,0 +1,94 @@
+import os
+import time
+import atexit
+import threading
+
+
+class TrustBuffer:
+    """ট্রাস্ট স্কোর মেমরিতে জমিয়ে একসাথে লেখা
+
+    বদলানো ইউজারগুলো dirty হিসেবে থাকে। flush_interval সেকেন্ড পরপর
+    অথবা flush_every টা বদল জমলে একবারে স্টোরেজে লেখা হয়, প্রসেস বন্ধের
+    সময়ও। ক্র্যাশ হলে সর্বোচ্চ flush_interval সময়ের বদল হারাতে পারে;
+    flush_interval=0 দিলে প্রতিটি বদল সাথে সাথে লেখা হয়।
+    """
+
+    def __init__(self, storage, flush_interval=None, flush_every=None):
+        if flush_interval is None:
+            flush_interval = float(os.environ.get('TRUST_FLUSH_INTERVAL', 5))
+        if flush_every is None:
+            flush_every = int(os.environ.get('TRUST_FLUSH_EVERY', 100))
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+
+        self._dirty = {}            # user_id -> score (এখনো লেখা হয়নি)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+        self.flushes = 0
+
+        atexit.register(self.flush)
+
+    def get(self, user_id, default):
+        with self._lock:
+            if user_id in self._dirty:
+                return self._dirty[user_id]
+        return self.storage.get_trust(user_id, default)
+
+    def set(self, user_id, score):
+        if self.flush_interval > 0:
+            self._ensure_flusher()
+        with self._lock:
+            self._dirty[user_id] = score
+            pending = len(self._dirty)
+
+        if self.flush_interval <= 0 or pending >= self.flush_every:
+            self.flush()
+
+    def count(self):
+        """মোট ইউজার (এখনো না লেখা নতুন ইউজার সহ)"""
+        with self._lock:
+            pending = list(self._dirty)
+        new = sum(1 for user_id in pending if self.storage.get_trust(user_id, None) is None)
+        return self.storage.count_users() + new
+
+    def flush(self):
+        """জমা বদলগুলো একবারে স্টোরেজে লেখা"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty or self._pid not in (None, os.getpid()):
+                    return 0
+                items = list(self._dirty.items())
+                self._dirty = {}
+            try:
+                self.storage.set_trusts(items)
+            except Exception as e:
+                # পরের বার আবার চেষ্টা (এর মধ্যে নতুন মান এলে সেটাই থাকবে)
+                print(f"Trust flush error: {e}")
+                with self._lock:
+                    for user_id, score in items:
+                        self._dirty.setdefault(user_id, score)
+                return 0
+            self.flushes += 1
+            return len(items)
+
+    def _ensure_flusher(self):
+        """ব্যাকগ্রাউন্ড flush থ্রেড (fork-এর পর নতুন করে)"""
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            if self._pid is not None and self._pid != os.getpid():
+                # fork-এর আগের জমা বদল প্যারেন্ট লিখবে
+                self._dirty = {}
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='trust-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self.flush_interval)
+            self.flush()
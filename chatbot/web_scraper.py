@@ -1,43 +1,54 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+from concurrent.futures import wait
+from .page_cache import PageCache
+from .parallel_fetch import get_executor, DEFAULT_DEADLINE
 
 class WebScraper:
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+    BANGLA_SITES = [
+        'https://bn.wikipedia.org/wiki/',
+        'https://www.prothomalo.com/',
+        'https://www.bbc.com/bengali',
+        'https://www.kalerkantho.com/'
+    ]
     
-    def scrape_bangla_sites(self, query):
-        """বাংলা ওয়েবসাইট স্ক্রেপ"""
-        bangla_sites = [
-            'https://bn.wikipedia.org/wiki/',
-            'https://www.prothomalo.com/',
-            'https://www.bbc.com/bengali',
-            'https://www.kalerkantho.com/'
-        ]
+    def __init__(self, cache=None):
+        # পেজ না বদলালে আবার ডাউনলোড/পার্স নয় (ETag/Last-Modified)
+        self.cache = cache or PageCache()
+    
+    def scrape_bangla_sites(self, query, deadline=None):
+        """বাংলা ওয়েবসাইট স্ক্রেপ (সব সাইট একসাথে, ফলাফল সাইটের ক্রমে)"""
+        if deadline is None:
+            deadline = DEFAULT_DEADLINE
         
-        results = []
+        def scrape(site):
+            # Wikipedia বিশেষ হ্যান্ডলিং
+            if 'wikipedia' in site:
+                return self.scrape_wikipedia(query)
+            
+            # অন্যান্য সাইট
+            content = self.scrape_site(site, query)
+            if content:
+                return {
+                    'url': site,
+                    'content': content[:500]
+                }
+            return None
         
-        for site in bangla_sites:
+        pool = get_executor()
+        futures = [pool.submit(scrape, site) for site in self.BANGLA_SITES]
+        wait(futures, timeout=deadline)
+        
+        results = []
+        for future in futures:
+            if not future.done():
+                # সময়ের মধ্যে শেষ হয়নি
+                future.cancel()
+                continue
             try:
-                # Wikipedia বিশেষ হ্যান্ডলিং
-                if 'wikipedia' in site:
-                    wiki_result = self.scrape_wikipedia(query)
-                    if wiki_result:
-                        results.append(wiki_result)
-                
-                # অন্যান্য সাইট
-                else:
-                    content = self.scrape_site(site, query)
-                    if content:
-                        results.append({
-                            'url': site,
-                            'content': content[:500]
-                        })
-            
-            except:
+                result = future.result()
+            except Exception:
                 continue
+            if result:
+                results.append(result)
         
         return results
     
@@ -63,15 +74,11 @@ class WebScraper:
             # সরল রিকোয়েস্ট
             try:
                 url = f"https://bn.wikipedia.org/wiki/{query}"
-                response = requests.get(url, headers=self.headers, timeout=5)
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                content_div = soup.find('div', {'id': 'mw-content-text'})
-                if content_div:
-                    text = content_div.get_text(separator=' ', strip=True)
+                sentences = self._extract(url, timeout=5, max_sentences=10, min_length=10)
+                if sentences:
                     return {
                         'url': url,
-                        'content': text[:800]
+                        'content': ' '.join(sentences)[:800]
                     }
             
             except:
@@ -82,20 +89,13 @@ class WebScraper:
     def scrape_site(self, url, query):
         """সাধারণ সাইট স্ক্রেপ"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # বাংলা কন্টেন্ট ফিল্টার
-            all_text = soup.get_text()
-            bangla_sentences = []
-            
-            for sentence in all_text.split('.'):
-                if re.search(r'[\u0980-\u09FF]', sentence):
-                    clean_sent = re.sub(r'\s+', ' ', sentence.strip())
-                    if len(clean_sent) > 20:
-                        bangla_sentences.append(clean_sent)
-            
-            return '. '.join(bangla_sentences[:10])
+            # বাংলা কন্টেন্ট ফিল্টার (১০টি বাক্য পেলেই থামে)
+            sentences = self._extract(url, timeout=10, max_sentences=10, min_length=20)
+            return ' '.join(sentences)
         
         except:
             return None
+    
+    def _extract(self, url, timeout, max_sentences, min_length):
+        """পেজের বাংলা বাক্য (ডিস্ক ক্যাশ, দরকার হলে conditional GET)"""
+        return self.cache.sentences(url, timeout, max_sentences, min_length)
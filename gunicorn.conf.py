@@ -0,0 +1,39 @@
+# gunicorn কনফিগ (Procfile-এর `gunicorn app:app` বর্তমান ডিরেক্টরির এই ফাইল নিজেই পড়ে)
+import gc
+import os
+import sys
+
+# মাস্টারে একবার app লোড (জ্ঞান আর ফাজি ইনডেক্স), fork-এর পর ওয়ার্কাররা
+# একই মেমরি পেজ copy-on-write শেয়ার করে, আর প্রতিটি ওয়ার্কার আলাদা করে
+# JSON পার্স করে না
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true') == 'true'
+
+if preload_app:
+    # লোডের সময় GC বন্ধ, যাতে মুক্ত হওয়া জায়গা শেয়ার্ড পেজে ফাঁক না রাখে
+    gc.disable()
+
+
+def on_starting(server):
+    # আগের চালুর (বা মরে যাওয়া ওয়ার্কারের) মেট্রিক্স ফাইল এই চালুর সাথে যোগ না হয়
+    from chatbot import metrics
+    metrics.clear()
+
+
+def when_ready(server):
+    if preload_app:
+        # lazy ফাজি ইনডেক্স মাস্টারেই তৈরি: ওয়ার্কাররা তৈরি অবস্থায় পায় আর পেজ শেয়ার করে
+        module = sys.modules.get((getattr(server.app, 'app_uri', None) or 'app').split(':')[0])
+        chatbot = getattr(module, 'chatbot', None)
+        if chatbot is not None:
+            chatbot.index.warm()
+
+        # লোড শেষ (প্রথম ওয়ার্কার fork-এর আগে): লোড হওয়া অবজেক্ট GC-র বাইরে রেখে
+        # মাস্টারেও GC আবার চালু, ওয়ার্কাররা চালু অবস্থাই পায়
+        gc.freeze()
+        gc.enable()
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        # মাস্টারে এর মধ্যে তৈরি অবজেক্টও GC-র বাইরে, ওয়ার্কারের GC এগুলো ছুঁয়ে পেজ কপি করবে না
+        gc.freeze()